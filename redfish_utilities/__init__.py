@@ -8,10 +8,13 @@ from .accounts import print_users
 from .accounts import add_user
 from .accounts import delete_user
 from .accounts import modify_user
+from .action_info import clear_action_info_cache
 from .assembly import get_assembly
 from .assembly import print_assembly
 from .assembly import download_assembly
 from .assembly import upload_assembly
+from .assembly import download_assemblies
+from .assembly import upload_assemblies
 from .certificates import get_all_certificates
 from .certificates import print_certificates
 from .certificates import get_generate_csr_info
@@ -24,22 +27,36 @@ from .event_service import get_event_subscriptions
 from .event_service import print_event_subscriptions
 from .event_service import create_event_subscription
 from .event_service import delete_event_subscription
+from .fleet import login_hosts
+from .fleet import logout_hosts
+from .fleet import run_on_hosts
+from .fleet import run_in_waves
+from .image_cache import ImageCache
+from .image_server import ImageServer
 from .inventory import get_system_inventory
 from .inventory import print_system_inventory
 from .inventory import write_system_inventory
 from .licenses import get_licenses
 from .licenses import print_licenses
 from .licenses import install_license
+from .licenses import install_licenses
 from .licenses import delete_license
+from .log_store import collect_log_entries
+from .log_store import query_log_store
 from .logs import log_container
 from .logs import diagnostic_data_types
+from .logs import log_entry_detail_properties
 from .logs import get_log_service_ids
 from .logs import get_log_service
 from .logs import get_log_entries
+from .logs import iter_log_entries
 from .logs import print_log_entries
+from .logs import write_log_entries
 from .logs import clear_log_entries
 from .logs import collect_diagnostic_data
 from .logs import download_diagnostic_data
+from .logs import save_diagnostic_data
+from .logs import collect_all_diagnostic_data
 from .managers import get_manager_ids
 from .managers import get_manager
 from .managers import set_manager
@@ -67,26 +84,37 @@ from .power_equipment import print_power_equipment_summary
 from .power_equipment import get_power_equipment_electrical
 from .power_equipment import print_power_equipment_electrical
 from .power_equipment import print_power_equipment_electrical_summary
+from .quirks import clear_quirks
 from .resets import reset_types
 from .resets import reset_to_defaults_types
+from .resets import reset_power_states
+from .resets import reset_restart_types
 from .sensors import get_sensors
 from .sensors import print_sensors
 from .systems import get_system_ids
 from .systems import get_system
 from .systems import get_system_boot
 from .systems import set_system_boot
+from .systems import set_systems_boot
 from .systems import print_system_boot
 from .systems import get_system_reset_info
 from .systems import system_reset
+from .systems import wait_for_system_power_state
+from .systems import reset_systems
 from .systems import get_virtual_media
 from .systems import print_virtual_media
 from .systems import insert_virtual_media
 from .systems import eject_virtual_media
 from .systems import get_system_bios
 from .systems import set_system_bios
+from .systems import get_system_bios_changes
+from .systems import apply_system_bios
+from .systems import get_systems_bios_compliance
+from .systems import get_bios_compliance_report
 from .systems import print_system_bios
 from .systems import reset_system_bios
 from .tasks import poll_task_monitor
+from .tasks import TaskScheduler
 from .thermal_equipment import thermal_equipment_types
 from .thermal_equipment import thermal_equipment_component_types
 from .thermal_equipment import get_thermal_equipment_ids
@@ -103,8 +131,16 @@ from .update import get_update_service
 from .update import get_simple_update_info
 from .update import simple_update
 from .update import multipart_push_update
+from .update import update_hosts
 from .update import get_firmware_inventory
+from .update import get_firmware_versions
+from .update import is_update_needed
+from .update import get_firmware_matrix
+from .update import print_firmware_matrix
+from .update import FirmwareMatrixWriter
 from .update import print_software_inventory
+from .upload_stats import get_upload_stats
+from .upload_stats import clear_upload_stats
 from .misc import logout, print_password_change_required_and_logout
 
 from . import config
@@ -115,10 +151,13 @@ __all__ = [
     "add_user",
     "delete_user",
     "modify_user",
+    "clear_action_info_cache",
     "get_assembly",
     "print_assembly",
     "download_assembly",
     "upload_assembly",
+    "download_assemblies",
+    "upload_assemblies",
     "get_all_certificates",
     "print_certificates",
     "get_generate_csr_info",
@@ -131,22 +170,36 @@ __all__ = [
     "print_event_subscriptions",
     "create_event_subscription",
     "delete_event_subscription",
+    "login_hosts",
+    "logout_hosts",
+    "run_on_hosts",
+    "run_in_waves",
+    "ImageCache",
+    "ImageServer",
     "get_system_inventory",
     "print_system_inventory",
     "write_system_inventory",
     "get_licenses",
     "print_licenses",
     "install_license",
+    "install_licenses",
     "delete_license",
+    "collect_log_entries",
+    "query_log_store",
     "log_container",
     "diagnostic_data_types",
+    "log_entry_detail_properties",
     "get_log_service_ids",
     "get_log_service",
     "get_log_entries",
+    "iter_log_entries",
     "print_log_entries",
+    "write_log_entries",
     "clear_log_entries",
     "collect_diagnostic_data",
     "download_diagnostic_data",
+    "save_diagnostic_data",
+    "collect_all_diagnostic_data",
     "get_manager_ids",
     "get_manager",
     "set_manager",
@@ -174,26 +227,37 @@ __all__ = [
     "get_power_equipment_electrical",
     "print_power_equipment_electrical",
     "print_power_equipment_electrical_summary",
+    "clear_quirks",
     "reset_types",
     "reset_to_defaults_types",
+    "reset_power_states",
+    "reset_restart_types",
     "get_sensors",
     "print_sensors",
     "get_system_ids",
     "get_system",
     "get_system_boot",
     "set_system_boot",
+    "set_systems_boot",
     "print_system_boot",
     "get_system_reset_info",
     "system_reset",
+    "wait_for_system_power_state",
+    "reset_systems",
     "get_virtual_media",
     "print_virtual_media",
     "insert_virtual_media",
     "eject_virtual_media",
     "get_system_bios",
     "set_system_bios",
+    "get_system_bios_changes",
+    "apply_system_bios",
+    "get_systems_bios_compliance",
+    "get_bios_compliance_report",
     "print_system_bios",
     "reset_system_bios",
     "poll_task_monitor",
+    "TaskScheduler",
     "thermal_equipment_types",
     "thermal_equipment_component_types",
     "get_thermal_equipment_ids",
@@ -210,8 +274,16 @@ __all__ = [
     "get_simple_update_info",
     "simple_update",
     "multipart_push_update",
+    "update_hosts",
     "get_firmware_inventory",
+    "get_firmware_versions",
+    "is_update_needed",
+    "get_firmware_matrix",
+    "print_firmware_matrix",
+    "FirmwareMatrixWriter",
     "print_software_inventory",
+    "get_upload_stats",
+    "clear_upload_stats",
     "logout",
     "print_password_change_required_and_logout",
     "config",
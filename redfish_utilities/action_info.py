@@ -0,0 +1,92 @@
+#! /usr/bin/python
+# Copyright Notice:
+# Copyright 2019-2026 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tacklebox/blob/main/LICENSE.md
+
+"""
+Action Info Module
+
+File : action_info.py
+
+Brief : This file contains the definitions and functionalities for caching
+        the parameter requirements of actions for a given Redfish service
+"""
+
+import copy
+import threading
+import time
+import weakref
+from .messages import verify_response
+from . import config
+
+# Cached action information for each Redfish client object; each entry maps a key to its expiration time and value
+action_info_cache = weakref.WeakKeyDictionary()
+action_info_cache_lock = threading.Lock()
+
+
+def get_cached_action_info(context, key, read_info):
+    """
+    Gets information about an action from the cache of a session; if not cached or expired, it's read from the
+    service and cached for the time specified by config.__action_info_cache_ttl__
+
+    Args:
+        context: The Redfish client object with an open session
+        key: The key identifying the information in the cache
+        read_info: The function to call, without arguments, to read the information from the service
+
+    Returns:
+        The information about the action
+    """
+
+    ttl = config.__action_info_cache_ttl__
+    if not ttl:
+        return read_info()
+
+    now = time.monotonic()
+    with action_info_cache_lock:
+        entry = action_info_cache.get(context, {}).get(key)
+    if entry is not None and now < entry[0]:
+        # Callers are allowed to modify what they're given
+        return copy.deepcopy(entry[1])
+
+    info = read_info()
+    with action_info_cache_lock:
+        action_info_cache.setdefault(context, {})[key] = (now + ttl, copy.deepcopy(info))
+    return info
+
+
+def get_action_info(context, action_info_uri):
+    """
+    Gets an ActionInfo resource; the resource is cached for the session since it does not change at runtime
+
+    Args:
+        context: The Redfish client object with an open session
+        action_info_uri: The URI of the ActionInfo resource
+
+    Returns:
+        A dictionary containing the ActionInfo resource
+    """
+
+    def read_action_info():
+        # Check the response before it's cached so an error is not reused for the life of the cache entry
+        response = context.get(action_info_uri)
+        verify_response(response)
+        return response.dict
+
+    return get_cached_action_info(context, action_info_uri, read_action_info)
+
+
+def clear_action_info_cache(context=None):
+    """
+    Removes cached action information
+
+    Args:
+        context: The Redfish client object for which to remove the cached information; if None, the cached
+                 information of all sessions is removed
+    """
+
+    with action_info_cache_lock:
+        if context is None:
+            action_info_cache.clear()
+        else:
+            action_info_cache.pop(context, None)
@@ -0,0 +1,367 @@
+#! /usr/bin/python
+# Copyright Notice:
+# Copyright 2019-2026 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tacklebox/blob/main/LICENSE.md
+
+"""
+Asyncio Module
+
+File : aio.py
+
+Brief : This file contains the definitions and functionalities for running the
+        read helpers against Redfish services from an asyncio event loop
+"""
+
+import asyncio
+import functools
+import json
+import time
+from . import inventory
+from . import logs
+from . import sensors
+from . import update
+
+try:
+    from redfish.aio import AsyncRedfishClient
+except ImportError:
+    # The asynchronous client requires aiohttp
+    AsyncRedfishClient = None
+
+# Default number of services to process at the same time
+DEFAULT_MAX_HOSTS = 1024
+
+# Default number of requests to have outstanding with a single service at the same time
+DEFAULT_MAX_REQUESTS = 4
+
+
+class RedfishAsyncWriteError(Exception):
+    """
+    Raised when a helper run from an asyncio event loop attempts to modify the service
+    """
+
+    pass
+
+
+class RedfishPendingResponseError(Exception):
+    """
+    Raised when a helper run from an asyncio event loop uses the response of a request that has not been read yet
+    """
+
+    pass
+
+
+class ReplayContext:
+    """
+    Stands in for a Redfish client object when running a synchronous read helper; requests are answered from the
+    responses already read by an asynchronous client, and requests that cannot be answered are recorded so they can be
+    read before the helper is run again
+    """
+
+    def __init__(self):
+        self.responses = {}
+        self.misses = {}
+
+    def get(self, path, args=None, headers=None, **kwargs):
+        key = get_request_key(path, args)
+        if key in self.responses:
+            return self.responses[key]
+        self.misses[key] = (path, args, headers)
+        return PendingResponse(path)
+
+    def post(self, path, *args, **kwargs):
+        raise RedfishAsyncWriteError("POST {} is not allowed from a read helper".format(path))
+
+    def patch(self, path, *args, **kwargs):
+        raise RedfishAsyncWriteError("PATCH {} is not allowed from a read helper".format(path))
+
+    def put(self, path, *args, **kwargs):
+        raise RedfishAsyncWriteError("PUT {} is not allowed from a read helper".format(path))
+
+    def delete(self, path, *args, **kwargs):
+        raise RedfishAsyncWriteError("DELETE {} is not allowed from a read helper".format(path))
+
+
+class ReplayResponse:
+    """
+    A response read by an asynchronous client; the body is decoded once so the helper can be run many times
+    """
+
+    def __init__(self, response):
+        self.status = response.status
+        self.read = response.read
+        self.text = response.text
+        self._response = response
+        try:
+            self.dict = json.loads(self.text) if self.read else {}
+        except ValueError:
+            self.dict = {}
+
+    def getheader(self, name):
+        return self._response.getheader(name)
+
+    def getheaders(self):
+        return self._response.getheaders()
+
+
+class PendingResponse:
+    """
+    Given to a helper for a request that has not been read yet; using the response stops the helper so the request can
+    be read before the helper is run again
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __getattr__(self, name):
+        raise RedfishPendingResponseError("{} has not been read yet".format(self.path))
+
+
+def get_request_key(path, args):
+    """
+    Builds the key used to look up the response of a request
+
+    Args:
+        path: The URI of the request
+        args: The query parameters of the request
+
+    Returns:
+        A string identifying the request
+    """
+
+    if not args:
+        return path
+    return path + "?" + json.dumps(args, sort_keys=True)
+
+
+async def run_read_helper(context, helper, *args, max_requests=DEFAULT_MAX_REQUESTS, **kwargs):
+    """
+    Runs a synchronous read helper, such as get_sensors, against an asynchronous Redfish client
+
+    The helper is run against responses that were already read.  Each run records the requests it could not answer;
+    these are read concurrently and the helper is run again until it completes without needing more data, so the
+    result is the same as running the helper against a synchronous client.  Members of a collection that are only
+    links are read along with the collection so a helper reading each member does not need a run per member.  Each
+    run of the helper is done in the default executor of the event loop so it does not block other tasks.
+
+    Args:
+        context: The asynchronous Redfish client object with an open session, such as redfish.aio.AsyncRedfishClient
+        helper: The function to run; it's called with a client object followed by the given arguments
+        max_requests: The maximum number of requests to have outstanding with the service at the same time
+
+    Returns:
+        The return value of the helper
+    """
+
+    replay = ReplayContext()
+    semaphore = asyncio.Semaphore(max_requests)
+    loop = asyncio.get_running_loop()
+    run_helper = functools.partial(helper, replay, *args, **kwargs)
+
+    async def read(key, path, args, headers):
+        async with semaphore:
+            response = await context.get(path, args=args, headers=headers)
+        replay.responses[key] = ReplayResponse(response)
+
+        # Read the members of a collection that are only links since the helper is likely to read each of them next
+        members = replay.responses[key].dict.get("Members")
+        if not isinstance(members, list) or not members:
+            return
+        links = []
+        for member in members:
+            if not isinstance(member, dict) or set(member) != {"@odata.id"}:
+                return
+            links.append(member["@odata.id"])
+        await asyncio.gather(*[read(link, link, None, None) for link in links if link not in replay.responses])
+
+    while True:
+        replay.misses = {}
+        try:
+            result = await loop.run_in_executor(None, run_helper)
+            if not replay.misses:
+                return result
+        except Exception:
+            # Failures are expected while responses are still pending
+            if not replay.misses:
+                raise
+        await asyncio.gather(*[read(key, *miss) for key, miss in replay.misses.items()])
+
+
+async def get_sensors(context, use_id=False, max_requests=DEFAULT_MAX_REQUESTS):
+    """
+    Walks a Redfish service for sensor information
+
+    Args:
+        context: The asynchronous Redfish client object with an open session
+        use_id: Indicates whether to construct names from 'Id' property values
+        max_requests: The maximum number of requests to have outstanding with the service at the same time
+
+    Returns:
+        A list containing all sensor readings
+    """
+
+    return await run_read_helper(context, sensors.get_sensors, use_id=use_id, max_requests=max_requests)
+
+
+async def get_system_inventory(context, max_requests=DEFAULT_MAX_REQUESTS):
+    """
+    Walks a Redfish service for system component information, such as drives, processors, and memory
+
+    Args:
+        context: The asynchronous Redfish client object with an open session
+        max_requests: The maximum number of requests to have outstanding with the service at the same time
+
+    Returns:
+        A list containing all system component information
+    """
+
+    return await run_read_helper(context, inventory.get_system_inventory, max_requests=max_requests)
+
+
+async def get_firmware_inventory(context, max_requests=DEFAULT_MAX_REQUESTS):
+    """
+    Finds the firmware inventory and returns its contents
+
+    Args:
+        context: The asynchronous Redfish client object with an open session
+        max_requests: The maximum number of requests to have outstanding with the service at the same time
+
+    Returns:
+        An array of dictionaries of the firmware inventory members
+    """
+
+    return await run_read_helper(context, update.get_firmware_inventory, max_requests=max_requests)
+
+
+async def get_log_entries(
+    context,
+    container_type=logs.log_container.MANAGER,
+    container_id=None,
+    log_service_id=None,
+    first=None,
+    max_entries=None,
+    start_time=None,
+    end_time=None,
+    max_requests=DEFAULT_MAX_REQUESTS,
+):
+    """
+    Finds the log entries of a log service matching the given ID
+
+    Args:
+        context: The asynchronous Redfish client object with an open session
+        container_type: The type of resource containing the log service (manager, system, or chassis)
+        container_id: The container instance with the log service; if None, perform on the only container
+        log_service_id: The log service with the logs; if None, perform on the only log service
+        first: The index of the first log entry to collect
+        max_entries: The maximum number of entries to collect
+        start_time: The timestamp of the oldest log entry to collect in ISO8601 date-time format
+        end_time: The timestamp of the newest log entry to collect in ISO8601 date-time format
+        max_requests: The maximum number of requests to have outstanding with the service at the same time
+
+    Returns:
+        A list of the log entries
+    """
+
+    # Only finding the log service is done with the synchronous helpers; the pages of entries are read directly
+    def find_log_service(replay):
+        log_service = logs.get_log_service(replay, container_type, container_id, log_service_id)
+        if "Entries" not in log_service.dict:
+            raise logs.RedfishLogEntriesNotFoundError(
+                "Log service '{}' does not provide entries".format(log_service.dict["Id"])
+            )
+        query = logs.get_log_entries_query(replay, first=first, start_time=start_time, end_time=end_time)
+        return log_service, query
+
+    log_service, query = await run_read_helper(context, find_log_service, max_requests=max_requests)
+    entry_filter = logs.LogEntryFilter(log_service, max_entries=max_entries, start_time=start_time, end_time=end_time)
+
+    # Follow the next links one page at a time until the end of the log or the maximum is reached
+    entries = []
+    log_entry_col = ReplayResponse(await context.get(log_service.dict["Entries"]["@odata.id"], args=query))
+    while True:
+        entries.extend(entry_filter.filter_page(log_entry_col.dict))
+        if entry_filter.done:
+            return entries
+        log_entry_col = ReplayResponse(await context.get(log_entry_col.dict["Members@odata.nextLink"]))
+
+
+async def login_hosts(session, hosts, username, password, timeout=30, max_hosts=DEFAULT_MAX_HOSTS):
+    """
+    Opens a session with each Redfish service in a list of hosts
+
+    Args:
+        session: The aiohttp.ClientSession object to use for all requests; its connector limits the total number of
+                 connections
+        hosts: A list of addresses of Redfish services (with scheme)
+        username: The user name for authentication
+        password: The password for authentication
+        timeout: The timeout, in seconds, to apply to requests
+        max_hosts: The maximum number of services to log into at the same time
+
+    Returns:
+        A dictionary of asynchronous Redfish client objects with open sessions, keyed by host
+        A dictionary of exceptions for hosts that could not be logged into, keyed by host
+    """
+
+    if AsyncRedfishClient is None:
+        raise RuntimeError("The asynchronous Redfish client requires the aiohttp package")
+
+    async def login(host, context):
+        await context.login(auth="session")
+        return context
+
+    contexts = {}
+    for host in hosts:
+        contexts[host] = AsyncRedfishClient(host, username, password, session=session, timeout=timeout)
+    results = await run_on_hosts(contexts, login, max_hosts=max_hosts)
+    errors = {host: result["Error"] for host, result in results.items() if result["Error"] is not None}
+    contexts = {host: result["Result"] for host, result in results.items() if result["Error"] is None}
+    return contexts, errors
+
+
+async def logout_hosts(contexts, max_hosts=DEFAULT_MAX_HOSTS):
+    """
+    Closes the sessions with a set of Redfish services; errors are ignored
+
+    Args:
+        contexts: A dictionary of asynchronous Redfish client objects with open sessions, keyed by host
+        max_hosts: The maximum number of services to log out of at the same time
+    """
+
+    async def logout(host, context):
+        await context.logout()
+
+    await run_on_hosts(contexts, logout, max_hosts=max_hosts)
+
+
+async def run_on_hosts(contexts, operation, max_hosts=DEFAULT_MAX_HOSTS, on_result=None):
+    """
+    Performs an operation against a set of Redfish services concurrently from the event loop
+
+    Args:
+        contexts: A dictionary of asynchronous Redfish client objects with open sessions, keyed by host
+        operation: The coroutine function to perform for each host; it's called with the host and its client object
+        max_hosts: The maximum number of services to process at the same time
+        on_result: A function called as each host completes; it's called with the host and its result dictionary
+
+    Returns:
+        A dictionary of results keyed by host; each result is a dictionary containing the return value of the
+        operation in 'Result', the exception raised in 'Error' (or None), and the time taken in 'Duration'
+    """
+
+    semaphore = asyncio.Semaphore(max_hosts)
+
+    async def run(host, context):
+        result = {"Result": None, "Error": None, "Duration": None}
+        async with semaphore:
+            start = time.monotonic()
+            try:
+                result["Result"] = await operation(host, context)
+            except Exception as e:
+                result["Error"] = e
+            result["Duration"] = time.monotonic() - start
+        if on_result is not None:
+            on_result(host, result)
+        return result
+
+    results = await asyncio.gather(*[run(host, context) for host, context in contexts.items()])
+    return dict(zip(contexts, results))
@@ -12,7 +12,21 @@ Brief : This file contains the definitions and functionalities for managing
         assemblies on a Redfish service
 """
 
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from .fleet import get_host_file_name
 from .messages import verify_response
+from .streams import stream_download
+from .streams import stream_upload
+
+# Name of the file in a backup directory listing the assembly data saved in the directory
+MANIFEST_FILE = "assemblies.json"
+
+# Default number of transfers to perform with a single service at the same time
+DEFAULT_MAX_TRANSFER_WORKERS = 4
 
 
 class RedfishAssemblyNotFoundError(Exception):
@@ -31,6 +45,14 @@ class RedfishAssemblyNoBinaryDataError(Exception):
     pass
 
 
+class RedfishAssemblyManifestError(Exception):
+    """
+    Raised when a backup directory does not contain a valid list of assembly data
+    """
+
+    pass
+
+
 def get_assembly(context, uri):
     """
     Collects assembly information from a Redfish service
@@ -111,19 +133,19 @@ def download_assembly(context, assemblies, filepath, index=None):
         assemblies: An array of assembly information
         filepath: The filepath to download the binary data
         index: The index into the assemblies array to download; if None, perform on index 0 if there's only 1 assembly
+
+    Returns:
+        A dictionary containing the 'Size' of the file in bytes and its 'SHA256' checksum
     """
 
     # Get the binary data URI
     binary_data_uri = get_assembly_binary_data_uri(assemblies, index)
 
-    # Download the data and save it
-    response = context.get(binary_data_uri)
-    verify_response(response)
-    with open(filepath, "wb") as binary_file:
-        binary_file.write(response.read)
+    # Download the data directly to the file
+    return stream_download(context, binary_data_uri, filepath, resume=False)
 
 
-def upload_assembly(context, assemblies, filepath, index=None):
+def upload_assembly(context, assemblies, filepath, index=None, expected_sha256=None):
     """
     Uploads the binary data of a file to an assembly
 
@@ -132,16 +154,212 @@ def upload_assembly(context, assemblies, filepath, index=None):
         assemblies: An array of assembly information
         filepath: The filepath of the binary data to upload
         index: The index into the assemblies array to upload; if None, perform on index 0 if there's only 1 assembly
+        expected_sha256: The expected SHA-256 checksum of the file as a hex string; if given, the file is verified
+                         before any data is sent
+
+    Returns:
+        A dictionary containing the 'Size' of the data sent in bytes and its 'SHA256' checksum
     """
 
     # Get the binary data URI
     binary_data_uri = get_assembly_binary_data_uri(assemblies, index)
 
-    # Upload the binary data
-    with open(filepath, "rb") as binary_file:
-        data = binary_file.read()
-    response = context.put(binary_data_uri, body=data)
-    verify_response(response)
+    # Upload the binary data as it's read from the file
+    result = stream_upload(context, binary_data_uri, filepath, expected_sha256=expected_sha256)
+    verify_response(result["Response"])
+    return {"Size": result["Size"], "SHA256": result["SHA256"]}
+
+
+def download_assemblies(context, uris, directory=".", max_workers=DEFAULT_MAX_TRANSFER_WORKERS):
+    """
+    Downloads the binary data of every assembly at a set of URIs to a directory concurrently, and lists the data saved
+    along with its checksum in a manifest file in the directory
+
+    Args:
+        context: The Redfish client object with an open session
+        uris: A list of the URIs of the assemblies to download
+        directory: The directory to save the binary data
+        max_workers: The maximum number of downloads to perform at the same time
+
+    Returns:
+        A dictionary keyed by URI containing a list with the result of each assembly with binary data; each result is
+        a dictionary containing the 'Index' and 'MemberId' of the assembly, the 'Path', 'Size', and 'SHA256' of the
+        saved file, and the exception raised in 'Error' (or None); if the assemblies at a URI cannot be read, the list
+        contains one result with the 'Index' set to None
+    """
+
+    os.makedirs(directory, exist_ok=True)
+
+    def download(uri, assemblies, index, result):
+        # Different URIs can map to the same safe name; a hash of the URI keeps their files apart
+        name = "{}-{}".format(get_host_file_name(uri), hashlib.sha256(uri.encode("utf-8")).hexdigest()[:8])
+        path = os.path.join(directory, "{}-{}.bin".format(name, index))
+        result.update(download_assembly(context, assemblies, path, index))
+        result["Path"] = path
+
+    results = {uri: [] for uri in uris}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Read the assemblies at each URI, then download the binary data of each assembly as soon as it's found
+        assembly_futures = {executor.submit(get_assembly, context, uri): uri for uri in uris}
+        download_futures = {}
+        for future in as_completed(assembly_futures):
+            uri = assembly_futures[future]
+            try:
+                assemblies = future.result()
+            except Exception as e:
+                results[uri].append(new_assembly_result(None, None, e))
+                continue
+            for index, assembly in enumerate(assemblies):
+                if assembly.get("BinaryDataURI") is None:
+                    continue
+                result = new_assembly_result(index, assembly.get("MemberId"))
+                results[uri].append(result)
+                download_futures[executor.submit(download, uri, assemblies, index, result)] = result
+        for future in as_completed(download_futures):
+            try:
+                future.result()
+            except Exception as e:
+                download_futures[future]["Error"] = e
+
+    # Add the saved data to the manifest, replacing entries from earlier downloads of the same assemblies
+    saved = {}
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    if os.path.isfile(manifest_path):
+        for entry in read_assembly_manifest(directory):
+            saved[(entry["URI"], entry["Index"])] = entry
+    for uri, uri_results in results.items():
+        for result in uri_results:
+            if result["Error"] is None:
+                saved[(uri, result["Index"])] = {
+                    "URI": uri,
+                    "Index": result["Index"],
+                    "MemberId": result["MemberId"],
+                    "File": os.path.basename(result["Path"]),
+                    "Size": result["Size"],
+                    "SHA256": result["SHA256"],
+                }
+    temp_path = manifest_path + ".tmp"
+    with open(temp_path, "w") as manifest_file:
+        json.dump(
+            {"Assemblies": sorted(saved.values(), key=lambda entry: (entry["URI"], entry["Index"]))},
+            manifest_file,
+            indent=4,
+        )
+    os.replace(temp_path, manifest_path)
+    return results
+
+
+def upload_assemblies(context, directory=".", uris=None, max_workers=DEFAULT_MAX_TRANSFER_WORKERS):
+    """
+    Uploads the binary data listed in the manifest file of a directory saved by download_assemblies to the
+    assemblies concurrently; each file is verified against the checksum in the manifest before it's uploaded
+
+    Args:
+        context: The Redfish client object with an open session
+        directory: The directory containing the binary data and manifest file
+        uris: A list of the URIs of the assemblies to upload; if None, all assemblies in the manifest are uploaded
+        max_workers: The maximum number of uploads to perform at the same time
+
+    Returns:
+        A dictionary keyed by URI containing a list with the result of each assembly; each result is a dictionary
+        containing the 'Index' and 'MemberId' of the assembly, the 'Path', 'Size', and 'SHA256' of the uploaded file,
+        and the exception raised in 'Error' (or None); if the assemblies at a URI cannot be read or the manifest does
+        not list any data for a URI, the list contains one result with the 'Index' set to None
+    """
+
+    entries = read_assembly_manifest(directory)
+    results = {}
+    if uris is not None:
+        entries = [entry for entry in entries if entry["URI"] in uris]
+        for uri in uris:
+            if not any(entry["URI"] == uri for entry in entries):
+                error = RedfishAssemblyManifestError(
+                    "'{}' does not list any data for '{}'".format(os.path.join(directory, MANIFEST_FILE), uri)
+                )
+                results[uri] = [new_assembly_result(None, None, error)]
+
+    def upload(assemblies, entry, result):
+        # Make sure the assemblies were not reordered since the data was saved
+        index = entry["Index"]
+        if 0 <= index < len(assemblies) and assemblies[index].get("MemberId") != entry["MemberId"]:
+            raise RedfishAssemblyNotFoundError(
+                "Assembly index {} is member {}; the data was saved from member {}".format(
+                    index, assemblies[index].get("MemberId"), entry["MemberId"]
+                )
+            )
+        result.update(upload_assembly(context, assemblies, result["Path"], index, entry["SHA256"]))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Read the assemblies at each URI, then upload the binary data of each assembly as soon as it's found
+        uri_entries = {}
+        for entry in entries:
+            uri_entries.setdefault(entry["URI"], []).append(entry)
+            results.setdefault(entry["URI"], [])
+        assembly_futures = {executor.submit(get_assembly, context, uri): uri for uri in uri_entries}
+        upload_futures = {}
+        for future in as_completed(assembly_futures):
+            uri = assembly_futures[future]
+            try:
+                assemblies = future.result()
+            except Exception as e:
+                results[uri].append(new_assembly_result(None, None, e))
+                continue
+            for entry in uri_entries[uri]:
+                result = new_assembly_result(entry["Index"], entry["MemberId"])
+                result["Path"] = os.path.join(directory, entry["File"])
+                results[uri].append(result)
+                upload_futures[executor.submit(upload, assemblies, entry, result)] = result
+        for future in as_completed(upload_futures):
+            try:
+                future.result()
+            except Exception as e:
+                upload_futures[future]["Error"] = e
+    return results
+
+
+def read_assembly_manifest(directory):
+    """
+    Reads the manifest file of a directory saved by download_assemblies
+
+    Args:
+        directory: The directory containing the manifest file
+
+    Returns:
+        A list of dictionaries describing the saved data; each dictionary contains the 'URI', 'Index', and 'MemberId'
+        of the assembly, and the 'File', 'Size', and 'SHA256' of the saved data
+    """
+
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    try:
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+    except FileNotFoundError:
+        raise RedfishAssemblyManifestError("Directory '{}' does not contain '{}'".format(directory, MANIFEST_FILE))
+    except ValueError as e:
+        raise RedfishAssemblyManifestError("'{}' is not valid JSON: {}".format(manifest_path, e))
+    required = ["URI", "Index", "MemberId", "File", "SHA256"]
+    entries = manifest.get("Assemblies") if isinstance(manifest, dict) else None
+    if not isinstance(entries, list) or not all(
+        isinstance(entry, dict) and all(key in entry for key in required) for entry in entries
+    ):
+        raise RedfishAssemblyManifestError("'{}' does not contain a valid list of assembly data".format(manifest_path))
+    return entries
+
+
+def new_assembly_result(index, member_id, error=None):
+    """
+    Builds the result of transferring the binary data of an assembly
+
+    Args:
+        index: The index of the assembly
+        member_id: The MemberId of the assembly
+        error: The exception raised, if any
+
+    Returns:
+        A dictionary of the result
+    """
+
+    return {"Index": index, "MemberId": member_id, "Path": None, "Size": None, "SHA256": None, "Error": error}
 
 
 def get_assembly_binary_data_uri(assemblies, index=None):
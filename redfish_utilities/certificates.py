@@ -12,6 +12,7 @@ Brief : This file contains the definitions and functionalities for managing
         certificates on a Redfish service
 """
 
+from .action_info import get_action_info
 from .messages import verify_response
 
 
@@ -154,8 +155,8 @@ def get_generate_csr_info(context):
         generate_csr_parameters = None
     else:
         # Get the action info and its parameter listing
-        action_info = context.get(generate_csr_action["@Redfish.ActionInfo"])
-        generate_csr_parameters = action_info.dict["Parameters"]
+        action_info = get_action_info(context, generate_csr_action["@Redfish.ActionInfo"])
+        generate_csr_parameters = action_info["Parameters"]
 
     return generate_csr_uri, generate_csr_parameters
 
@@ -12,8 +12,18 @@ Brief : This file contains the definitions and functionalities for performing
         operations with resource collections
 """
 
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from .messages import verify_response
 
+# Default maximum number of members of a collection to read from a service at the same time
+DEFAULT_MAX_MEMBER_WORKERS = 8
+
+# Protocol features of each Redfish client object; they do not change for the life of a session
+protocol_features_cache = weakref.WeakKeyDictionary()
+protocol_features_cache_lock = threading.Lock()
+
 
 class RedfishCollectionNotFoundError(Exception):
     """
@@ -43,49 +53,136 @@ def get_collection_ids(context, collection_uri):
         A list of identifiers of the members of the collection
     """
 
-    # Get the collection and iterate through its collection
-    avail_members = []
-    collection = context.get(collection_uri)
-    if collection.status == 404:
-        raise RedfishCollectionNotFoundError("Service does not contain a collection at URI {}".format(collection_uri))
-    verify_response(collection)
-    while True:
-        for member in collection.dict["Members"]:
-            avail_members.append(member["@odata.id"].strip("/").split("/")[-1])
-        if "Members@odata.nextLink" not in collection.dict:
-            break
-        collection = context.get(collection.dict["Members@odata.nextLink"])
-        verify_response(collection)
+    return [member_uri.strip("/").split("/")[-1] for member_uri in get_collection_member_uris(context, collection_uri)]
+
+
+def get_collection_member_uris(context, collection_uri):
+    """
+    Iterates over a collection and returns the URIs of all members
+
+    Args:
+        context: The Redfish client object with an open session
+        collection_uri: The URI of the collection to process
 
-    return avail_members
+    Returns:
+        A list of the URIs of the members of the collection
+    """
+
+    return [member["@odata.id"] for member in walk_collection(context, collection_uri)]
 
 
-def get_collection_members(context, collection_uri):
+def get_collection_members(context, collection_uri, max_workers=1, expand=False):
     """
     Iterates over a collection and returns all members
 
     Args:
         context: The Redfish client object with an open session
         collection_uri: The URI of the collection to process
+        max_workers: The maximum number of members to read at the same time; callers already running in a pool of
+                     threads, such as for a set of hosts, are expected to leave this at 1
+        expand: Indicates if the members are to be read with the collection using the $expand query parameter, if
+                supported by the service
 
     Returns:
         A list of the members of the collection
     """
 
-    # Get the collection and iterate through its collection
+    # Get the collection and iterate through its collection; members are only read if they were not expanded
+    members = walk_collection(context, collection_uri, get_expand_query(context) if expand else None)
+    pending = [index for index, member in enumerate(members) if set(member) <= {"@odata.id"}]
+
+    def get_member(index):
+        member_response = context.get(members[index]["@odata.id"])
+        verify_response(member_response)
+        return member_response.dict
+
+    if len(pending) > 1 and max_workers > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+            for index, member in zip(pending, executor.map(get_member, pending)):
+                members[index] = member
+    else:
+        for index in pending:
+            members[index] = get_member(index)
+
+    return members
+
+
+def walk_collection(context, collection_uri, query=None):
+    """
+    Reads each page of a collection and returns the entries of its Members property
+
+    Args:
+        context: The Redfish client object with an open session
+        collection_uri: The URI of the collection to process
+        query: The query string to apply when reading the first page of the collection; if None, no query is applied
+
+    Returns:
+        A list of the entries of the Members property of the collection
+    """
+
+    uri = collection_uri
+    if query is not None:
+        uri = "{}{}{}".format(collection_uri, "&" if "?" in collection_uri else "?", query)
     members = []
-    collection = context.get(collection_uri)
+    collection = context.get(uri)
     if collection.status == 404:
         raise RedfishCollectionNotFoundError("Service does not contain a collection at URI {}".format(collection_uri))
+    if query is not None and collection.status >= 400:
+        # The service rejected the query; read the collection without it
+        return walk_collection(context, collection_uri)
     verify_response(collection)
     while True:
-        for member in collection.dict["Members"]:
-            member_response = context.get(member["@odata.id"])
-            verify_response(member_response)
-            members.append(member_response.dict)
+        members.extend(collection.dict["Members"])
         if "Members@odata.nextLink" not in collection.dict:
             break
         collection = context.get(collection.dict["Members@odata.nextLink"])
         verify_response(collection)
 
     return members
+
+
+def get_expand_query(context):
+    """
+    Builds the query string to expand the members of a collection, based on the features supported by the service
+
+    Args:
+        context: The Redfish client object with an open session
+
+    Returns:
+        The query string; None if the service does not support expanding the members of a collection
+    """
+
+    # The protocol features are cached for the session, so this does not read the service root again
+    expand = get_protocol_features(context).get("ExpandQuery", {})
+    for supported, expand_type in [("NoLinks", "."), ("ExpandAll", "*")]:
+        if expand.get(supported, False):
+            if expand.get("Levels", False):
+                return "$expand={}($levels=1)".format(expand_type)
+            return "$expand={}".format(expand_type)
+    return None
+
+
+def get_protocol_features(context):
+    """
+    Finds the protocol features, such as the query parameters, supported by the service; the features are read once
+    for each Redfish client object
+
+    Args:
+        context: The Redfish client object with an open session
+
+    Returns:
+        A dictionary of the protocol features from the service root; empty if the service does not report them
+    """
+
+    with protocol_features_cache_lock:
+        protocol_features = protocol_features_cache.get(context)
+    if protocol_features is not None:
+        return protocol_features
+
+    # Get the service root to find the supported protocol features
+    service_root = context.get("/redfish/v1/")
+    verify_response(service_root)
+    protocol_features = service_root.dict.get("ProtocolFeaturesSupported", {})
+    with protocol_features_cache_lock:
+        protocol_features_cache[context] = protocol_features
+    return protocol_features
@@ -20,3 +20,27 @@ __workarounds__ = False
 # Automate task handling for POST/PATCH/PUT/DELETE operations that should
 # always be "fast"
 __auto_task_handling__ = False
+
+# Time, in seconds, to reuse the parameter requirements of actions, such as
+# allowable reset types, found for a session; 0 disables caching
+__action_info_cache_ttl__ = 300
+
+# File in which to save the outcome of workarounds for non-conformant services
+# so they are reused across runs; if None, they are kept only in memory
+__quirks_file__ = None
+
+# Time, in seconds, after which a service recorded as not needing a workaround,
+# such as not having a settings resource, is probed again
+__quirks_negative_ttl__ = 86400
+
+# Time, in seconds, a write to the connection of an upload can be blocked
+# before the upload is considered stalled
+__upload_stall_timeout__ = 30
+
+# Multiplier applied to the throughput and response times observed for earlier
+# uploads to determine the timeouts of later uploads
+__upload_timeout_margin__ = 3
+
+# File in which to save upload measurements so timeouts are tuned across runs;
+# if None, they are kept only in memory
+__upload_stats_file__ = None
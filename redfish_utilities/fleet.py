@@ -0,0 +1,209 @@
+#! /usr/bin/python
+# Copyright Notice:
+# Copyright 2019-2026 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tacklebox/blob/main/LICENSE.md
+
+"""
+Fleet Module
+
+File : fleet.py
+
+Brief : This file contains the definitions and functionalities for performing
+        operations against many Redfish services concurrently
+"""
+
+import re
+import redfish
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from .misc import logout
+
+# Default number of services to process at the same time
+DEFAULT_MAX_WORKERS = 32
+
+
+class RedfishWaveAbortedError(Exception):
+    """
+    Raised for hosts that were skipped because earlier waves had too many failures
+    """
+
+    pass
+
+
+def login_hosts(hosts, username, password, timeout=30, max_retry=3, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Opens a session with each Redfish service in a list of hosts
+
+    Args:
+        hosts: A list of addresses of Redfish services (with scheme)
+        username: The user name for authentication
+        password: The password for authentication
+        timeout: The timeout, in seconds, to apply to requests
+        max_retry: The number of times to retry a request
+        max_workers: The maximum number of services to log into at the same time
+
+    Returns:
+        A dictionary of Redfish client objects with open sessions, keyed by host
+        A dictionary of exceptions for hosts that could not be logged into, keyed by host
+    """
+
+    def login(host):
+        context = redfish.redfish_client(
+            base_url=host, username=username, password=password, timeout=timeout, max_retry=max_retry
+        )
+        try:
+            context.login(auth="session")
+        except Exception:
+            logout(context, ignore_error=True)
+            raise
+        return context
+
+    contexts = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(login, host): host for host in hosts}
+        for future in as_completed(futures):
+            try:
+                contexts[futures[future]] = future.result()
+            except Exception as e:
+                errors[futures[future]] = e
+
+    # Keep the order of the hosts consistent with the order given by the caller
+    contexts = {host: contexts[host] for host in hosts if host in contexts}
+    return contexts, errors
+
+
+def logout_hosts(contexts, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Closes the sessions with a set of Redfish services; errors are ignored
+
+    Args:
+        contexts: A dictionary of Redfish client objects with open sessions, keyed by host
+        max_workers: The maximum number of services to log out of at the same time
+    """
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for context in contexts.values():
+            executor.submit(logout, context, True)
+
+
+def run_on_hosts(contexts, operation, max_workers=DEFAULT_MAX_WORKERS, on_result=None):
+    """
+    Performs an operation against a set of Redfish services concurrently
+
+    Args:
+        contexts: A dictionary of Redfish client objects with open sessions, keyed by host
+        operation: The function to perform for each host; it's called with the host and its client object
+        max_workers: The maximum number of services to process at the same time
+        on_result: A function called from the calling thread as each host completes; it's called with the host and
+                   its result dictionary
+
+    Returns:
+        A dictionary of results keyed by host; each result is a dictionary containing the return value of the
+        operation in 'Result', the exception raised in 'Error' (or None), and the time taken in 'Duration'
+    """
+
+    def run(host, context):
+        result = {"Result": None, "Error": None, "Duration": None}
+        start = time.monotonic()
+        try:
+            result["Result"] = operation(host, context)
+        except Exception as e:
+            result["Error"] = e
+        result["Duration"] = time.monotonic() - start
+        return result
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run, host, context): host for host, context in contexts.items()}
+        for future in as_completed(futures):
+            host = futures[future]
+            results[host] = future.result()
+            if on_result is not None:
+                on_result(host, results[host])
+
+    # Keep the order of the hosts consistent with the order given by the caller
+    return {host: results[host] for host in contexts}
+
+
+def run_in_waves(
+    contexts,
+    operation,
+    wave_size=None,
+    wave_delay=0,
+    max_workers=DEFAULT_MAX_WORKERS,
+    max_failures=None,
+    on_result=None,
+    canary_size=None,
+):
+    """
+    Performs an operation against a set of Redfish services in waves; each wave is finished before the next one starts
+
+    Args:
+        contexts: A dictionary of Redfish client objects with open sessions, keyed by host
+        operation: The function to perform for each host; it's called with the host and its client object
+        wave_size: The number of hosts in each wave; if None, all hosts are in a single wave
+        wave_delay: The time, in seconds, to wait between waves
+        max_workers: The maximum number of services to process at the same time within a wave
+        max_failures: The number of failed hosts allowed before the remaining waves are skipped; if None, the
+                      remaining waves are skipped if any host fails when canary_size is given, otherwise all waves are
+                      performed
+        on_result: A function called from the calling thread as each host completes; it's called with the host and
+                   its result dictionary
+        canary_size: The number of hosts in the first wave, so problems are found on a few hosts before the rest are
+                     processed; if None, the first wave is the same size as the others
+
+    Returns:
+        A dictionary of results keyed by host, as produced by run_on_hosts; hosts in skipped waves contain a
+        RedfishWaveAbortedError in 'Error'
+    """
+
+    hosts = list(contexts)
+    if not wave_size:
+        wave_size = max(len(hosts), 1)
+    waves = []
+    start = 0
+    if canary_size:
+        waves.append(hosts[:canary_size])
+        start = canary_size
+        if max_failures is None:
+            # A failing canary is meant to stop the rollout
+            max_failures = 0
+    waves += [hosts[index : index + wave_size] for index in range(start, len(hosts), wave_size)]
+
+    results = {}
+    failures = 0
+    for index, wave in enumerate(waves):
+        if max_failures is not None and failures > max_failures:
+            for host in wave:
+                results[host] = {
+                    "Result": None,
+                    "Error": RedfishWaveAbortedError("Skipped after {} hosts failed".format(failures)),
+                    "Duration": None,
+                }
+            continue
+        if index and wave_delay:
+            time.sleep(wave_delay)
+        wave_results = run_on_hosts(
+            {host: contexts[host] for host in wave}, operation, max_workers=max_workers, on_result=on_result
+        )
+        failures += sum(1 for result in wave_results.values() if result["Error"] is not None)
+        results.update(wave_results)
+
+    return results
+
+
+def get_host_file_name(host):
+    """
+    Builds a name for a host that is safe to use for files and directories
+
+    Args:
+        host: The address of the Redfish service
+
+    Returns:
+        A string containing the file name for the host
+    """
+
+    name = re.sub("^[A-Za-z]+://", "", host).strip("/")
+    return re.sub("[^A-Za-z0-9._-]", "_", name)
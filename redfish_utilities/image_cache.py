@@ -0,0 +1,258 @@
+#! /usr/bin/python
+# Copyright Notice:
+# Copyright 2019-2026 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tacklebox/blob/main/LICENSE.md
+
+"""
+Image Cache Module
+
+File : image_cache.py
+
+Brief : This file contains the definitions and functionalities for staging
+        image files in a persistent folder keyed by the hash of their contents
+        so they can be hosted for Redfish services across many runs
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import threading
+import time
+from urllib.parse import quote
+from .json_store import read_json_store
+from .json_store import update_json_store
+
+# Default disk budget of the image cache in bytes
+DEFAULT_IMAGE_CACHE_SIZE = 10 * 1024 * 1024 * 1024
+
+# Default time, in seconds, an image is kept after it was last used, even if the cache exceeds its budget
+DEFAULT_IMAGE_CACHE_MIN_AGE = 3600
+
+# Size of each block of data read when staging an image
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Name of the file recording the hashes of images already staged
+INDEX_FILE = "index.json"
+
+# Name of the folder for images being staged
+STAGING_FOLDER = "staging"
+
+
+class ImageCache:
+    """
+    Stages image files in a folder where each image is stored under the SHA-256 hash of its contents
+
+    The folder can be shared by many processes at the same time; images are written to a private file first and then
+    moved into place, so an image is never seen partially written, and two processes staging the same image store the
+    same contents under the same name.  The hash of each staged file is recorded along with its size and modification
+    time, so staging the same file again skips reading it.  When the images exceed the disk budget, the least recently
+    used images are removed.
+
+    Args:
+        directory: The folder of the cache; it's created if needed
+        max_size: The disk budget of the cache in bytes
+        min_age: The time, in seconds, an image is kept after it was last used, even if the cache exceeds its budget
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_IMAGE_CACHE_SIZE, min_age=DEFAULT_IMAGE_CACHE_MIN_AGE):
+        self.directory = os.path.realpath(directory)
+        self.max_size = max_size
+        self.min_age = min_age
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(self.directory, STAGING_FOLDER), exist_ok=True)
+
+        # Identifies the folder to other processes without revealing its path, such as to image servers sharing it
+        stat = os.stat(self.directory)
+        self.cache_id = hashlib.sha256(
+            "{}|{}|{}".format(self.directory, stat.st_dev, stat.st_ino).encode("utf-8")
+        ).hexdigest()
+
+    def add_image(self, file_path):
+        """
+        Stages a file in the cache if it's not already staged
+
+        Args:
+            file_path: The filepath of the image
+
+        Returns:
+            The path of the image on an image server hosting the cache
+        """
+
+        file_path = os.path.realpath(file_path)
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError("Image '{}' does not exist".format(file_path))
+        name = os.path.basename(file_path)
+        stat = os.stat(file_path)
+        source_key = "{}|{}|{}".format(file_path, stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            digest = read_index(self.directory).get(source_key)
+        if digest is None or not os.path.isfile(os.path.join(self.directory, digest, name)):
+            digest = self.stage_image(file_path, name)
+            with self._lock:
+                save_index(self.directory, {source_key: digest})
+        self.touch(digest)
+        self.evict(keep=digest)
+        return "/{}/{}".format(digest, quote(name))
+
+    def stage_image(self, file_path, name):
+        """
+        Copies a file into the cache while computing its hash
+
+        Args:
+            file_path: The filepath of the image
+            name: The name of the image in the cache
+
+        Returns:
+            The hash of the image
+        """
+
+        temp_file = os.path.join(
+            self.directory, STAGING_FOLDER, "{}.{}.{}.part".format(name, os.getpid(), threading.get_ident())
+        )
+        sha = hashlib.sha256()
+        try:
+            with open(file_path, "rb") as source, open(temp_file, "wb") as destination:
+                for chunk in iter(lambda: source.read(DEFAULT_CHUNK_SIZE), b""):
+                    sha.update(chunk)
+                    destination.write(chunk)
+            digest = sha.hexdigest()
+            image_directory = os.path.join(self.directory, digest)
+            os.makedirs(image_directory, exist_ok=True)
+            existing = os.listdir(image_directory)
+            if name in existing:
+                # Already staged by another process
+                return digest
+            if existing:
+                # Staged under another name; link to it rather than storing the contents twice
+                try:
+                    os.link(os.path.join(image_directory, existing[0]), os.path.join(image_directory, name))
+                    return digest
+                except OSError:
+                    pass
+            os.replace(temp_file, os.path.join(image_directory, name))
+        finally:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+        return digest
+
+    def get_image_path(self, path):
+        """
+        Finds the file of an image in the cache
+
+        Args:
+            path: The path of the image on an image server hosting the cache
+
+        Returns:
+            The filepath of the image; None if the path is not an image in the cache
+        """
+
+        match = re.match(r"^/([0-9a-f]{64})/([^/]+)$", path)
+        if match is None or match.group(2) in [".", ".."]:
+            return None
+        file_path = os.path.join(self.directory, match.group(1), match.group(2))
+        if not os.path.isfile(file_path):
+            return None
+        self.touch(match.group(1))
+        return file_path
+
+    def touch(self, digest):
+        """
+        Marks an image as used so it's the last to be removed
+
+        Args:
+            digest: The hash of the image
+        """
+
+        try:
+            os.utime(os.path.join(self.directory, digest))
+        except OSError:
+            # Removed by another process; it's staged again the next time it's added
+            pass
+
+    def evict(self, keep=None):
+        """
+        Removes the least recently used images until the cache is within its disk budget
+
+        Args:
+            keep: The hash of an image to keep regardless of when it was last used
+
+        Returns:
+            A list of the hashes of the removed images
+        """
+
+        images = get_cached_images(self.directory)
+        total = sum(image["Size"] for image in images)
+        removed = []
+        now = time.time()
+        for image in sorted(images, key=lambda image: image["LastUsed"]):
+            if total <= self.max_size:
+                break
+            if image["Digest"] == keep or now - image["LastUsed"] < self.min_age:
+                continue
+            shutil.rmtree(os.path.join(self.directory, image["Digest"]), ignore_errors=True)
+            total -= image["Size"]
+            removed.append(image["Digest"])
+        return removed
+
+
+def get_cached_images(directory):
+    """
+    Lists the images in a cache folder
+
+    Args:
+        directory: The folder of the cache
+
+    Returns:
+        A list of dictionaries containing the 'Digest' of each image, its 'Size' in bytes, and the time it was
+        'LastUsed'
+    """
+
+    images = []
+    for entry in os.scandir(directory):
+        if not entry.is_dir() or re.match(r"^[0-9a-f]{64}$", entry.name) is None:
+            continue
+        try:
+            last_used = entry.stat().st_mtime
+            # Files with the same contents but different names are hard links; count the contents once
+            inodes = {}
+            for file_entry in os.scandir(entry.path):
+                file_stat = file_entry.stat()
+                inodes[file_stat.st_ino] = file_stat.st_size
+        except OSError:
+            # Removed by another process
+            continue
+        images.append({"Digest": entry.name, "Size": sum(inodes.values()), "LastUsed": last_used})
+    return images
+
+
+def read_index(directory):
+    """
+    Reads the hashes of images already staged in a cache folder
+
+    Args:
+        directory: The folder of the cache
+
+    Returns:
+        A dictionary of hashes keyed by the filepath, size, and modification time of the staged file
+    """
+
+    return read_json_store(os.path.join(directory, INDEX_FILE))
+
+
+def save_index(directory, entries):
+    """
+    Adds hashes of staged images to the index of a cache folder, merging in entries saved by other processes
+
+    Args:
+        directory: The folder of the cache
+        entries: A dictionary of hashes keyed by the filepath, size, and modification time of the staged file
+    """
+
+    def merge(index):
+        index.update(entries)
+        # Forget entries of images that were removed
+        return {key: digest for key, digest in index.items() if os.path.isdir(os.path.join(directory, str(digest)))}
+
+    update_json_store(os.path.join(directory, INDEX_FILE), merge)
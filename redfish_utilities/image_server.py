@@ -0,0 +1,392 @@
+#! /usr/bin/python
+# Copyright Notice:
+# Copyright 2019-2026 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tacklebox/blob/main/LICENSE.md
+
+"""
+Image Server Module
+
+File : image_server.py
+
+Brief : This file contains the definitions and functionalities for hosting
+        image files over HTTP so Redfish services can pull them, such as with
+        the SimpleUpdate action
+"""
+
+import errno
+import http.client
+import http.server
+import json
+import os
+import re
+import socket
+import socketserver
+import threading
+from urllib.parse import quote
+from urllib.parse import unquote
+
+# Default port of the image server
+DEFAULT_IMAGE_SERVER_PORT = 8888
+
+# Size of each block of data sent when the file cannot be sent directly from the kernel
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Path on the server describing the image cache it hosts, if any
+CACHE_INFO_PATH = "/.image-cache"
+
+
+class ImageServer:
+    """
+    Hosts image files over HTTP from their original location
+
+    Files are sent directly from the kernel with os.sendfile where available, each connection is handled in its own
+    thread so many services can pull images at the same time, and range requests are supported so services can resume
+    or split transfers.  The server accepts connections as soon as start returns.
+
+    If an ImageCache is given, images are staged in the cache and hosted from there instead.  If another process is
+    already hosting the same cache on the port, start shares that server rather than failing, so concurrent runs can
+    use one long-lived server.
+
+    Args:
+        address: The local address to listen on; if empty, listen on all addresses
+        port: The port to listen on; if 0, a free port is chosen
+        cache: The ImageCache to stage images in; if None, images are hosted from their original location
+    """
+
+    def __init__(self, address="", port=DEFAULT_IMAGE_SERVER_PORT, cache=None):
+        self.address = address
+        self.port = port
+        self.cache = cache
+        self.images = {}
+        self.shared = False
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    def add_image(self, file_path):
+        """
+        Makes a file available from the server
+
+        Args:
+            file_path: The filepath of the image
+
+        Returns:
+            The path of the image on the server
+        """
+
+        if self.cache is not None:
+            return self.cache.add_image(file_path)
+        file_path = os.path.realpath(file_path)
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError("Image '{}' does not exist".format(file_path))
+        name = os.path.basename(file_path)
+        with self._lock:
+            for path, image_path in self.images.items():
+                if image_path == file_path:
+                    return path
+            path = "/" + quote(name)
+            count = 1
+            while path in self.images:
+                # Another file with the same name is hosted; keep the name for services that check it
+                count += 1
+                path = "/{}/{}".format(count, quote(name))
+            self.images[path] = file_path
+        return path
+
+    def get_image_uri(self, file_path, rhost):
+        """
+        Builds the URI a Redfish service uses to pull a file from the server
+
+        Args:
+            file_path: The filepath of the image; the image is added to the server if needed
+            rhost: The address of the Redfish service (with scheme) that will pull the image
+
+        Returns:
+            The URI of the image
+        """
+
+        address = self.address or get_local_address(rhost)
+        if ":" in address:
+            address = "[{}]".format(address)
+        return "http://{}:{}{}".format(address, self.port, self.add_image(file_path))
+
+    def start(self):
+        """
+        Starts the server in a background thread; the server is listening when this returns
+        """
+
+        if self._httpd is not None or self.shared:
+            return
+        images = self.images
+        lock = self._lock
+        cache = self.cache
+
+        class ImageRequestHandler(ImageHandler):
+            def get_image_path(self, path):
+                if cache is not None:
+                    return cache.get_image_path(path)
+                with lock:
+                    return images.get(path)
+
+            def get_cache_id(self):
+                if cache is None:
+                    return None
+                return cache.cache_id
+
+        # Binding the socket before starting the thread means connections are queued until the thread accepts them
+        try:
+            self._httpd = ImageHTTPServer((self.address, self.port), ImageRequestHandler)
+        except OSError as e:
+            if e.errno != errno.EADDRINUSE or cache is None or not self.port:
+                raise
+            if get_hosted_cache_id(self.address, self.port) != cache.cache_id:
+                raise
+            # Another process is hosting the same cache; images staged in the cache are hosted by it
+            self.shared = True
+            return
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the server
+        """
+
+        self.shared = False
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+        self._httpd = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+class ImageHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """
+    An HTTP server that handles each connection in its own thread
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class):
+        # The socket needs to match the family of the address, such as for IPv6 addresses used to reach IPv6 services;
+        # an empty address listens on both IPv4 and IPv6 when the system allows it
+        self.dual_stack = False
+        if server_address[0]:
+            self.address_family = socket.getaddrinfo(
+                server_address[0], server_address[1], 0, socket.SOCK_STREAM, 0, socket.AI_PASSIVE
+            )[0][0]
+        elif socket.has_dualstack_ipv6():
+            self.address_family = socket.AF_INET6
+            self.dual_stack = True
+        super().__init__(server_address, handler_class)
+
+    def server_bind(self):
+        if self.dual_stack:
+            self.socket.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 0)
+        super().server_bind()
+
+
+class ImageHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves image files with support for HEAD and range requests
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def get_image_path(self, path):
+        return None
+
+    def get_cache_id(self):
+        return None
+
+    def do_GET(self):
+        if self.path == CACHE_INFO_PATH and self.get_cache_id() is not None:
+            body = json.dumps({"Id": self.get_cache_id()}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self.send_image(True)
+
+    def do_HEAD(self):
+        self.send_image(False)
+
+    def send_image(self, send_body):
+        file_path = self.get_image_path(unquote(self.path.split("?", 1)[0]))
+        if file_path is None:
+            self.send_error(404)
+            return
+        try:
+            image_file = open(file_path, "rb")
+        except OSError:
+            self.send_error(404)
+            return
+        with image_file:
+            size = os.fstat(image_file.fileno()).st_size
+            byte_range = get_byte_range(self.headers.get("Range"), size)
+            if byte_range is False:
+                self.send_response(416)
+                self.send_header("Content-Range", "bytes */{}".format(size))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            start, end = byte_range or (0, size - 1)
+            if byte_range is None:
+                self.send_response(200)
+            else:
+                self.send_response(206)
+                self.send_header("Content-Range", "bytes {}-{}/{}".format(start, end, size))
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("Accept-Ranges", "bytes")
+            self.end_headers()
+            if send_body:
+                try:
+                    send_file(self.connection, self.wfile, image_file, start, end - start + 1)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client closed the connection; this is normal when a service stops a transfer
+                    self.close_connection = True
+
+    def log_message(self, format, *args):
+        # Requests are not logged; many services pulling images at the same time would flood the console
+        pass
+
+
+def get_byte_range(range_header, size):
+    """
+    Parses the 'Range' header of a request
+
+    Args:
+        range_header: The value of the 'Range' header; None if not given
+        size: The size of the file in bytes
+
+    Returns:
+        A tuple of the first and last byte positions; None if the whole file is to be sent; False if the range cannot
+        be satisfied
+    """
+
+    if range_header is None:
+        return None
+    match = re.match(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$", range_header)
+    if match is None or match.group(1) + match.group(2) == "":
+        # Multiple ranges or an unknown unit; ignoring the header and sending the whole file is allowed
+        return None
+    if match.group(1) == "":
+        # Suffix range; the last N bytes of the file
+        length = int(match.group(2))
+        if length == 0 or size == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(match.group(1))
+    end = size - 1
+    if match.group(2) != "":
+        end = min(int(match.group(2)), size - 1)
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def send_file(connection, wfile, image_file, offset, count):
+    """
+    Sends part of a file to a connection
+
+    Args:
+        connection: The socket of the connection
+        wfile: The file object for writing to the connection
+        image_file: The file to send
+        offset: The position of the first byte to send
+        count: The number of bytes to send
+    """
+
+    wfile.flush()
+    if hasattr(os, "sendfile"):
+        total_sent = 0
+        try:
+            while count > 0:
+                sent = os.sendfile(connection.fileno(), image_file.fileno(), offset, count)
+                if sent == 0:
+                    break
+                total_sent += sent
+                offset += sent
+                count -= sent
+            return
+        except OSError as e:
+            if isinstance(e, (BrokenPipeError, ConnectionResetError)) or total_sent:
+                raise
+            # The platform cannot send this file from the kernel; fall back on copying it
+
+    image_file.seek(offset)
+    while count > 0:
+        chunk = image_file.read(min(count, DEFAULT_CHUNK_SIZE))
+        if not chunk:
+            break
+        wfile.write(chunk)
+        count -= len(chunk)
+
+
+def get_hosted_cache_id(address, port):
+    """
+    Finds the identifier of the image cache hosted by an image server running on this system
+
+    Args:
+        address: The local address the server listens on; if empty, the loopback address is used
+        port: The port the server listens on
+
+    Returns:
+        The identifier of the image cache; None if the port is not used by an image server hosting a cache
+    """
+
+    connection = http.client.HTTPConnection(address or "localhost", port, timeout=5)
+    try:
+        connection.request("GET", CACHE_INFO_PATH)
+        response = connection.getresponse()
+        if response.status != 200:
+            return None
+        return json.loads(response.read().decode("utf-8")).get("Id")
+    except (OSError, ValueError, http.client.HTTPException, AttributeError):
+        return None
+    finally:
+        connection.close()
+
+
+def get_local_address(rhost):
+    """
+    Finds the local address used to reach a Redfish service
+
+    Args:
+        rhost: The address of the Redfish service (with scheme)
+
+    Returns:
+        The local IP address as a string
+    """
+
+    # socket.gethostbyname(socket.gethostname()) returns 127.0.0.1 on many systems
+    # This opens a socket with the target, and pulls the address of the socket; no packets are sent
+    groups = re.search("^(https?)://(\\[[^\\]]+\\]|[^:/]+)(:(\\d+))?", rhost)
+    host = groups.group(2).strip("[]")
+    remote_port = groups.group(4)
+    if remote_port is None:
+        remote_port = "80"
+        if groups.group(1) == "https":
+            remote_port = "443"
+    address_info = socket.getaddrinfo(host, int(remote_port), 0, socket.SOCK_DGRAM)[0]
+    s = socket.socket(address_info[0], socket.SOCK_DGRAM)
+    try:
+        s.connect(address_info[4])
+        return s.getsockname()[0]
+    finally:
+        s.close()
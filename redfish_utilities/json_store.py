@@ -0,0 +1,119 @@
+#! /usr/bin/python
+# Copyright Notice:
+# Copyright 2019-2026 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tacklebox/blob/main/LICENSE.md
+
+"""
+JSON Store Module
+
+File : json_store.py
+
+Brief : This file contains the definitions and functionalities for saving
+        dictionaries to JSON files that are shared by many processes
+"""
+
+import contextlib
+import json
+import os
+import stat
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+
+def read_json_store(file_path):
+    """
+    Reads a dictionary saved to a JSON file
+
+    Args:
+        file_path: The filepath of the saved dictionary
+
+    Returns:
+        The saved dictionary; empty if the file does not exist or does not contain a JSON object
+    """
+
+    try:
+        with open(file_path) as file:
+            saved = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(saved, dict):
+        return {}
+    return saved
+
+
+def update_json_store(file_path, merge):
+    """
+    Updates a dictionary saved to a JSON file; the new contents are built from what is saved at the time of the update
+    so entries saved by other processes are kept
+
+    Args:
+        file_path: The filepath of the saved dictionary
+        merge: The function to build the new contents; it's called with the saved dictionary and returns the
+               dictionary to save
+
+    Returns:
+        The dictionary that was saved
+    """
+
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+
+    # Hold the lock from reading the file until it's replaced so updates from other processes are not lost
+    with lock_json_store(file_path):
+        data = merge(read_json_store(file_path))
+
+        # Write to a private temporary file first so readers never see a partial file
+        handle, temp_file = tempfile.mkstemp(dir=directory, prefix=os.path.basename(file_path) + ".", suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w") as file:
+                json.dump(data, file, indent=4, sort_keys=True)
+            # Temporary files are only readable by the owner; keep the permissions of the file being replaced
+            try:
+                os.chmod(temp_file, stat.S_IMODE(os.stat(file_path).st_mode))
+            except FileNotFoundError:
+                os.chmod(temp_file, 0o644)
+            os.replace(temp_file, file_path)
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+    return data
+
+
+@contextlib.contextmanager
+def lock_json_store(file_path):
+    """
+    Holds an exclusive lock for updating a JSON file, shared by all processes and threads on the system; the lock is
+    held on a separate file next to the JSON file since the JSON file itself is replaced by updates
+
+    Args:
+        file_path: The filepath of the saved dictionary
+    """
+
+    with open(file_path + ".lock", "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            # Lock the first byte of the file; msvcrt gives up after about 10 seconds, so keep trying
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
@@ -14,8 +14,14 @@ Brief : This file contains the definitions and functionalities for managing
 
 import base64
 import os
-from .collections import get_collection_ids
+import re
+from .collections import DEFAULT_MAX_MEMBER_WORKERS
+from .collections import get_collection_member_uris
+from .collections import get_collection_members
+from .fleet import DEFAULT_MAX_WORKERS
+from .fleet import run_on_hosts
 from .messages import verify_response
+from .tasks import TaskScheduler
 
 
 class RedfishLicenseServiceNotFoundError(Exception):
@@ -50,30 +56,23 @@ class RedfishInstallLicenseNotFoundError(Exception):
     pass
 
 
-def get_licenses(context):
+def get_licenses(context, max_workers=DEFAULT_MAX_MEMBER_WORKERS, expand=False):
     """
     Collects license information from a Redfish service
 
     Args:
         context: The Redfish client object with an open session
+        max_workers: The maximum number of licenses to read at the same time
+        expand: Indicates if the licenses are to be read with the license collection using the $expand query
+                parameter, if supported by the service
 
     Returns:
         A list containing all licenses
     """
 
-    license_list = []
+    # Get each member of the collection
     license_collection = get_license_collection(context)
-
-    # Get the identifiers of the collection
-    license_col = get_collection_ids(context, license_collection)
-
-    # Get each member and add it to the response list
-    for license_id in license_col:
-        license = context.get(license_collection + "/" + license_id)
-        verify_response(license)
-        license_list.append(license.dict)
-
-    return license_list
+    return get_collection_members(context, license_collection, max_workers=max_workers, expand=expand)
 
 
 def print_licenses(license_list, details=False):
@@ -134,32 +133,37 @@ def print_licenses(license_list, details=False):
     print("")
 
 
-def install_license(context, license_path):
+def install_license(context, license_path, license_service=None, license_string=None):
     """
     Installs a new license
 
     Args:
         context: The Redfish client object with an open session
         license_path: The filepath or URI of the license to install
+        license_service: The license service information, as returned by get_license_service; if None, it's read from
+                         the service
+        license_string: The Base64-encoded contents of the license file, as returned by read_license_file; if None,
+                        the file is read when needed
 
     Returns:
         The response of the operation
     """
 
     # Get the license service
-    license_service = get_license_service(context)
+    if license_service is None:
+        license_service = get_license_service(context)
 
     # Determine which installation method to use based on the provided license path
-    if os.path.isfile(license_path):
+    if license_string is not None or os.path.isfile(license_path):
         # Local file; perform via a POST to the license collection
         if "Licenses" not in license_service:
             raise RedfishLicenseCollectionNotFoundError("The license service does not contain a license collection")
         install_uri = license_service["Licenses"]["@odata.id"]
 
-        # Read in the file and convert it to a Base64-encoded string
-        with open(license_path, "rb") as file:
-            license_file = file.read()
-        payload = {"LicenseString": base64.b64encode(license_file).decode("utf-8")}
+        # Send the file as a Base64-encoded string
+        if license_string is None:
+            license_string = read_license_file(license_path)
+        payload = {"LicenseString": license_string}
     else:
         # Remote file; perform via a POST to the Install action
         if "Actions" not in license_service:
@@ -176,6 +180,112 @@ def install_license(context, license_path):
     return response
 
 
+def install_licenses(contexts, licenses, max_workers=DEFAULT_MAX_WORKERS, on_result=None):
+    """
+    Installs licenses on a set of Redfish services concurrently and confirms each license was installed
+
+    Each license file is read once and shared by all services it's installed on, and the license service of each
+    service is found once for all of its licenses.  Each install is confirmed by reading the license from the location
+    given by the service, rather than listing all licenses again.
+
+    Args:
+        contexts: A dictionary of Redfish client objects with open sessions, keyed by host
+        licenses: A dictionary keyed by host containing the filepath or URI of the license to install, or a list of
+                  them; hosts not in the dictionary are skipped
+        max_workers: The maximum number of services to process at the same time
+        on_result: A function called from the calling thread as each host completes; it's called with the host and
+                   its result dictionary
+
+    Returns:
+        A dictionary of results keyed by host, as described by run_on_hosts; the 'Result' of each host is a list with
+        the result of each license; each result is a dictionary containing the filepath or URI of the 'License', the
+        'Location' of the installed license, the contents of the installed license in 'Installed' (or None if the
+        service did not report where the license was installed), and the exception raised in 'Error' (or None)
+    """
+
+    host_licenses = {}
+    for host, license_paths in licenses.items():
+        if host in contexts:
+            host_licenses[host] = [license_paths] if isinstance(license_paths, str) else list(license_paths)
+
+    # Read each license file once for all services
+    license_strings = {}
+    for license_paths in host_licenses.values():
+        for license_path in license_paths:
+            if license_path not in license_strings and os.path.isfile(license_path):
+                license_strings[license_path] = read_license_file(license_path)
+
+    with TaskScheduler() as scheduler:
+
+        def install_host(host, context):
+            license_service = get_license_service(context)
+            results = []
+            for license_path in host_licenses[host]:
+                result = {"License": license_path, "Location": None, "Installed": None, "Error": None}
+                results.append(result)
+                try:
+                    response = install_license(
+                        context, license_path, license_service, license_string=license_strings.get(license_path)
+                    )
+                    response = scheduler.add(context, response).result()
+                    verify_response(response)
+                    result["Location"], result["Installed"] = get_installed_license(context, response)
+                except Exception as e:
+                    result["Error"] = e
+            return results
+
+        return run_on_hosts(
+            {host: context for host, context in contexts.items() if host in host_licenses},
+            install_host,
+            max_workers=max_workers,
+            on_result=on_result,
+        )
+
+
+def get_installed_license(context, response):
+    """
+    Reads a license installed by an operation
+
+    Args:
+        context: The Redfish client object with an open session
+        response: The final response of the install operation
+
+    Returns:
+        A tuple containing the URI of the installed license and its contents; both are None if the response does not
+        identify the license
+    """
+
+    # A created license is identified by the Location header, or the response contains the license
+    location = response.getheader("Location")
+    if location:
+        location = re.sub("^https?://[^/]+", "", location, flags=re.IGNORECASE)
+        license = context.get(location)
+        verify_response(license)
+        return location, license.dict
+    try:
+        body = response.dict
+    except Exception:
+        body = None
+    if isinstance(body, dict) and "#License." in body.get("@odata.type", ""):
+        return body.get("@odata.id"), body
+    return None, None
+
+
+def read_license_file(license_path):
+    """
+    Reads a license file for installing it
+
+    Args:
+        license_path: The filepath of the license
+
+    Returns:
+        The contents of the file as a Base64-encoded string
+    """
+
+    with open(license_path, "rb") as file:
+        return base64.b64encode(file.read()).decode("utf-8")
+
+
 def delete_license(context, license_id):
     """
     Deletes a license
@@ -190,7 +300,10 @@ def delete_license(context, license_id):
 
     # Get the identifiers of the collection
     license_collection = get_license_collection(context)
-    avail_licenses = get_collection_ids(context, license_collection)
+    avail_licenses = {
+        member_uri.strip("/").split("/")[-1]: member_uri
+        for member_uri in get_collection_member_uris(context, license_collection)
+    }
     if license_id not in avail_licenses:
         raise RedfishLicenseNotFoundError(
             "License service does not contain the license '{}'; available licenses: {}".format(
@@ -199,7 +312,7 @@ def delete_license(context, license_id):
         )
 
     # Delete the requested license
-    response = context.delete(license_collection + "/" + license_id)
+    response = context.delete(avail_licenses[license_id])
     verify_response(response)
     return response
 
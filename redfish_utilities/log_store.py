@@ -0,0 +1,269 @@
+#! /usr/bin/python
+# Copyright Notice:
+# Copyright 2019-2026 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tacklebox/blob/main/LICENSE.md
+
+"""
+Log Store Module
+
+File : log_store.py
+
+Brief : This file contains the definitions and functionalities for collecting
+        log entries from many Redfish services into a local indexed store
+"""
+
+import datetime
+import json
+import sqlite3
+from .fleet import DEFAULT_MAX_WORKERS
+from .fleet import run_on_hosts
+from .logs import log_container
+from .logs import get_log_entries
+from .logs import get_log_service
+from .logs import parse_timestamp
+
+LOG_STORE_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS log_entries (
+        host TEXT NOT NULL,
+        log_service TEXT NOT NULL,
+        entry_id TEXT NOT NULL,
+        created TEXT NOT NULL,
+        severity TEXT,
+        message_id TEXT,
+        message TEXT,
+        entry TEXT NOT NULL,
+        PRIMARY KEY (host, log_service, entry_id, created)
+    )""",
+    "CREATE INDEX IF NOT EXISTS log_entries_host ON log_entries (host)",
+    "CREATE INDEX IF NOT EXISTS log_entries_created ON log_entries (created)",
+    "CREATE INDEX IF NOT EXISTS log_entries_severity ON log_entries (severity, created)",
+    "CREATE INDEX IF NOT EXISTS log_entries_message_id ON log_entries (message_id, created)",
+    """CREATE TABLE IF NOT EXISTS ingest_state (
+        host TEXT NOT NULL,
+        log_service TEXT NOT NULL,
+        last_created TEXT,
+        last_ingest TEXT NOT NULL,
+        PRIMARY KEY (host, log_service)
+    )""",
+]
+
+
+def open_log_store(database):
+    """
+    Opens a log store, creating it if needed
+
+    Args:
+        database: The filepath of the SQLite database for the log store
+
+    Returns:
+        The SQLite connection object for the log store
+    """
+
+    connection = sqlite3.connect(database)
+    connection.row_factory = sqlite3.Row
+    with connection:
+        for statement in LOG_STORE_SCHEMA:
+            connection.execute(statement)
+    return connection
+
+
+def collect_log_entries(
+    contexts,
+    database,
+    container_type=log_container.MANAGER,
+    container_id=None,
+    log_service_id=None,
+    incremental=True,
+    max_workers=DEFAULT_MAX_WORKERS,
+):
+    """
+    Collects the log entries of a log service from a set of Redfish services concurrently and adds them to a log store
+
+    Args:
+        contexts: A dictionary of Redfish client objects with open sessions, keyed by host
+        database: The filepath of the SQLite database for the log store
+        container_type: The type of resource containing the log service (manager, system, or chassis)
+        container_id: The container instance with the log service; if None, perform on the only container
+        log_service_id: The log service with the logs; if None, perform on the only log service
+        incremental: Indicates if only entries newer than the last collection for each host are to be read
+        max_workers: The maximum number of services to read at the same time
+
+    Returns:
+        A dictionary of results keyed by host, as produced by run_on_hosts; the 'Result' of each host is the number of
+        entries added to the log store
+    """
+
+    connection = open_log_store(database)
+    last_created = {}
+    if incremental:
+        for row in connection.execute("SELECT host, log_service, last_created FROM ingest_state"):
+            last_created[(row["host"], row["log_service"])] = row["last_created"]
+
+    def read_log(host, context):
+        # Locate the log service and read the entries created since the last collection
+        log_service = get_log_service(context, container_type, container_id, log_service_id)
+        log_service_uri = log_service.dict["@odata.id"]
+        log_entries = get_log_entries(
+            context, log_service=log_service, start_time=last_created.get((host, log_service_uri))
+        )
+        return log_service_uri, log_entries
+
+    def store_log(host, result):
+        # Writes are performed from the calling thread as each host completes
+        if result["Error"] is not None:
+            return
+        log_service_uri, log_entries = result["Result"]
+        result["Result"] = add_log_entries(connection, host, log_service_uri, log_entries)
+
+    try:
+        return run_on_hosts(contexts, read_log, max_workers=max_workers, on_result=store_log)
+    finally:
+        connection.close()
+
+
+def add_log_entries(connection, host, log_service_uri, log_entries):
+    """
+    Adds log entries to a log store; entries already in the store are skipped
+
+    Args:
+        connection: The SQLite connection object for the log store
+        host: The host from which the entries were read
+        log_service_uri: The URI of the log service from which the entries were read
+        log_entries: The log entries to add
+
+    Returns:
+        The number of entries added to the log store
+    """
+
+    rows = []
+    newest = None
+    for entry in log_entries:
+        created = normalize_timestamp(entry.get("Created", entry.get("EventTimestamp")))
+        if created is None:
+            # Sort entries without a valid timestamp before all others
+            created = ""
+        elif newest is None or created > newest:
+            newest = created
+        rows.append(
+            (
+                host,
+                log_service_uri,
+                str(entry.get("Id")),
+                created,
+                entry.get("Severity"),
+                entry.get("MessageId"),
+                entry.get("Message"),
+                json.dumps(entry, separators=(",", ":")),
+            )
+        )
+
+    with connection:
+        cursor = connection.executemany("INSERT OR IGNORE INTO log_entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        added = cursor.rowcount
+        state = connection.execute(
+            "SELECT last_created FROM ingest_state WHERE host = ? AND log_service = ?", (host, log_service_uri)
+        ).fetchone()
+        if state is not None and state["last_created"] is not None:
+            if newest is None or state["last_created"] > newest:
+                newest = state["last_created"]
+        connection.execute(
+            "INSERT OR REPLACE INTO ingest_state VALUES (?, ?, ?, ?)",
+            (host, log_service_uri, newest, normalize_timestamp(datetime.datetime.now(datetime.timezone.utc))),
+        )
+
+    return added
+
+
+def query_log_store(
+    database,
+    hosts=None,
+    start_time=None,
+    end_time=None,
+    severity=None,
+    message_id=None,
+    message=None,
+    max_entries=None,
+):
+    """
+    Finds log entries in a log store
+
+    Args:
+        database: The filepath of the SQLite database for the log store
+        hosts: A list of hosts to which to limit the search; if None, all hosts are searched
+        start_time: The oldest entry to find; either an ISO8601 date-time string, a datetime object, or a timedelta
+                    object for a time relative to now
+        end_time: The newest entry to find; either an ISO8601 date-time string or a datetime object
+        severity: The severity, or a list of severities, of the entries to find
+        message_id: The message identifier of the entries to find; '*' and '?' wildcards are allowed
+        message: Text to find in the message of the entries; matching is not case sensitive
+        max_entries: The maximum number of entries to return
+
+    Returns:
+        A list of dictionaries, from oldest to newest, containing the 'Host', 'LogService', and 'Entry' of each match
+    """
+
+    # Build the query from the given filters; each filter is backed by an index
+    conditions = []
+    params = []
+    if hosts is not None:
+        conditions.append("host IN ({})".format(", ".join(["?"] * len(hosts))))
+        params.extend(hosts)
+    if start_time is not None:
+        if isinstance(start_time, datetime.timedelta):
+            start_time = datetime.datetime.now(datetime.timezone.utc) - start_time
+        conditions.append("created >= ?")
+        params.append(normalize_timestamp(start_time))
+    if end_time is not None:
+        conditions.append("created <= ?")
+        params.append(normalize_timestamp(end_time))
+    if None in params:
+        raise ValueError("Start and end times must be in ISO8601 date-time format")
+    if severity is not None:
+        if isinstance(severity, str):
+            severity = [severity]
+        conditions.append("severity IN ({})".format(", ".join(["?"] * len(severity))))
+        params.extend(severity)
+    if message_id is not None:
+        conditions.append("message_id GLOB ?")
+        params.append(message_id)
+    if message is not None:
+        conditions.append("message LIKE ?")
+        params.append("%" + message + "%")
+    query = "SELECT host, log_service, entry FROM log_entries"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY created"
+    if max_entries is not None:
+        query += " LIMIT ?"
+        params.append(max_entries)
+
+    connection = open_log_store(database)
+    try:
+        return [
+            {"Host": row["host"], "LogService": row["log_service"], "Entry": json.loads(row["entry"])}
+            for row in connection.execute(query, params)
+        ]
+    finally:
+        connection.close()
+
+
+def normalize_timestamp(timestamp):
+    """
+    Converts a timestamp into the UTC form used for ordering entries in a log store
+
+    Args:
+        timestamp: An ISO8601 date-time string or a datetime object
+
+    Returns:
+        A string containing the UTC date-time; None if the timestamp is not valid
+    """
+
+    if isinstance(timestamp, datetime.datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+        timestamp = timestamp.astimezone(datetime.timezone.utc)
+    else:
+        timestamp = parse_timestamp(timestamp)
+        if timestamp is None:
+            return None
+    return timestamp.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
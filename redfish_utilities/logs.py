@@ -12,10 +12,32 @@ Brief : This file contains the definitions and functionalities for interacting
         with the log service for a given Redfish service
 """
 
+import datetime
+import gzip
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from .collections import get_collection_ids
+from .collections import get_protocol_features
+from .fleet import DEFAULT_MAX_WORKERS
+from .fleet import get_host_file_name
 from .messages import verify_response
+from .streams import DEFAULT_CHUNK_SIZE
+from .streams import stream_download
+from .tasks import TaskScheduler
 from enum import Enum
 
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        from backports import zstd
+    except ImportError:
+        zstd = None
+
 
 class RedfishLogServiceNotFoundError(Exception):
     """
@@ -57,6 +79,14 @@ class RedfishDiagnosticDataNotFoundError(Exception):
     pass
 
 
+class RedfishLogExportError(Exception):
+    """
+    Raised when log entries cannot be written in the requested format
+    """
+
+    pass
+
+
 class log_container(Enum):
     """
     Types of resources that contain log services
@@ -81,6 +111,25 @@ class diagnostic_data_types(Enum):
         return self.value
 
 
+# Properties of a log entry shown in detailed output and kept when exporting a projection of the entries
+log_entry_detail_properties = [
+    "Severity",
+    "EntryType",
+    "OemRecordFormat",
+    "EntryCode",
+    "OemLogEntryCode",
+    "SensorType",
+    "OemSensorType",
+    "GeneratorId",
+    "SensorNumber",
+    "EventType",
+    "EventId",
+    "EventGroupId",
+    "MessageId",
+    "MessageArgs",
+]
+
+
 def get_log_service_ids(context, container_type=log_container.MANAGER, container_id=None):
     """
     Finds the log service collection and returns all of the member's identifiers
@@ -222,38 +271,218 @@ def get_log_entries(
         An array of log entries
     """
 
+    return list(
+        iter_log_entries(
+            context,
+            container_type=container_type,
+            container_id=container_id,
+            log_service_id=log_service_id,
+            log_service=log_service,
+            first=first,
+            max_entries=max_entries,
+            start_time=start_time,
+            end_time=end_time,
+        )
+    )
+
+
+def iter_log_entries(
+    context,
+    container_type=log_container.MANAGER,
+    container_id=None,
+    log_service_id=None,
+    log_service=None,
+    first=None,
+    max_entries=None,
+    start_time=None,
+    end_time=None,
+):
+    """
+    Finds the log entries of a log service matching the given ID and yields
+    them as each page of the log entry collection is read
+
+    Args:
+        context: The Redfish client object with an open session
+        container_type: The type of resource containing the log service (manager, system, or chassis)
+        container_id: The container instance with the log service; if None, perform on the only container
+        log_service_id: The log service with the logs; if None, perform on the only log service
+        log_service: Existing log service resource from which to get log entries
+        first: The index of the first log entry to collect
+        max_entries: The maximum number of entries to collect
+        start_time: The timestamp of the oldest log entry to collect in ISO8601 date-time format
+        end_time: The timestamp of the latest log entry to collect in ISO8601 date-time format; if the log service
+                  never overwrites entries and its entries are in order of their timestamps, reading stops once past
+                  the time range, otherwise every page is read
+
+    Returns:
+        A generator of log entries
+    """
+
     if log_service is None:
         log_service = get_log_service(context, container_type, container_id, log_service_id)
     if "Entries" not in log_service.dict:
         raise RedfishLogEntriesNotFoundError("Log service '{}' does not provide entries".format(log_service.dict["Id"]))
 
-    # Read in the log entries
-    log_entries = []
+    # Entries are always checked against the time range since many services ignore the filter query
+    entry_filter = LogEntryFilter(log_service, max_entries=max_entries, start_time=start_time, end_time=end_time)
+    query = get_log_entries_query(context, first=first, start_time=start_time, end_time=end_time)
+
+    # Read in the log entries one page at a time
+    # If a next link is provided, iterate over it until the end of the log or the maximum is reached
+    log_entry_col = context.get(log_service.dict["Entries"]["@odata.id"], args=query)
+    while True:
+        yield from entry_filter.filter_page(log_entry_col.dict)
+        if entry_filter.done:
+            break
+        log_entry_col = context.get(log_entry_col.dict["Members@odata.nextLink"])
+
+
+def get_log_entries_query(context, first=None, start_time=None, end_time=None):
+    """
+    Builds the query for the first page of a log entry collection; filtering is only requested from services that
+    support it
+
+    Args:
+        context: The Redfish client object with an open session
+        first: The index of the first log entry to collect
+        start_time: The timestamp of the oldest log entry to collect in ISO8601 date-time format
+        end_time: The timestamp of the latest log entry to collect in ISO8601 date-time format
+
+    Returns:
+        A dictionary of query parameters, or None if no query parameters are needed
+    """
+
     query = {}
     if first is not None:
         query["$skip"] = str(first)
-    if start_time is not None and end_time is not None:
-        query["$filter"] = "Created ge '{}' and Created le '{}'".format(start_time, end_time)
-    elif start_time is not None:
-        query["$filter"] = "Created ge '{}'".format(start_time)
-    elif end_time is not None:
-        query["$filter"] = "Created le '{}'".format(end_time)
+    if (start_time is not None or end_time is not None) and get_protocol_features(context).get("FilterQuery", False):
+        if start_time is not None and end_time is not None:
+            query["$filter"] = "Created ge '{}' and Created le '{}'".format(start_time, end_time)
+        elif start_time is not None:
+            query["$filter"] = "Created ge '{}'".format(start_time)
+        elif end_time is not None:
+            query["$filter"] = "Created le '{}'".format(end_time)
     if not query:
-        query = None
-    log_entry_col = context.get(log_service.dict["Entries"]["@odata.id"], args=query)
-    log_entries.extend(log_entry_col.dict["Members"])
+        return None
+    return query
 
-    # If a next link is provided, iterate over it and add to the log entry list
-    while "Members@odata.nextLink" in log_entry_col.dict:
-        if max_entries is not None and len(log_entries) >= max_entries:
-            break
-        log_entry_col = context.get(log_entry_col.dict["Members@odata.nextLink"])
-        log_entries.extend(log_entry_col.dict["Members"])
 
-    if max_entries is not None:
-        del log_entries[max_entries:]
+class LogEntryFilter:
+    """
+    Selects the log entries to collect from each page of a log entry collection as the pages are read
+
+    Logs that wrap or have clock changes might not be in order of their timestamps, so reading only stops once past
+    the time range if the log never overwrites entries and the first page is in order; the order is checked for every
+    entry after that, and every page is read once an entry is out of order
+    """
 
-    return log_entries
+    def __init__(self, log_service, max_entries=None, start_time=None, end_time=None):
+        """
+        Constructor for the filter
+
+        Args:
+            log_service: The log service resource containing the log entries
+            max_entries: The maximum number of entries to collect
+            start_time: The timestamp of the oldest log entry to collect in ISO8601 date-time format
+            end_time: The timestamp of the latest log entry to collect in ISO8601 date-time format
+        """
+
+        self.start_datetime = None
+        self.end_datetime = None
+        if start_time is not None:
+            self.start_datetime = parse_timestamp(start_time)
+            if self.start_datetime is None:
+                raise ValueError("Start time '{}' is not in ISO8601 date-time format".format(start_time))
+        if end_time is not None:
+            self.end_datetime = parse_timestamp(end_time)
+            if self.end_datetime is None:
+                raise ValueError("End time '{}' is not in ISO8601 date-time format".format(end_time))
+        self.time_filter = self.start_datetime is not None or self.end_datetime is not None
+        self.never_overwrites = log_service.dict.get("OverWritePolicy") == "NeverOverWrites"
+        self.max_entries = max_entries
+        self.entry_count = 0
+        self.ordering = None
+        self.previous_datetime = None
+        self.first_page = True
+        self.done = False
+
+    def filter_page(self, log_entry_col):
+        """
+        Selects the log entries to collect from a page of a log entry collection; 'done' is set once no more pages
+        need to be read
+
+        Args:
+            log_entry_col: The page of the log entry collection
+
+        Returns:
+            A list of the log entries to collect from the page
+        """
+
+        if self.first_page:
+            self.first_page = False
+            if self.time_filter and self.never_overwrites:
+                self.ordering = get_log_entry_order(log_entry_col["Members"])
+
+        entries = []
+        for entry in log_entry_col["Members"]:
+            if self.max_entries is not None and self.entry_count >= self.max_entries:
+                self.done = True
+                return entries
+            if self.time_filter:
+                entry_datetime = parse_timestamp(entry.get("Created", entry.get("EventTimestamp")))
+                if entry_datetime is None:
+                    # No timestamp to compare; the service would not match this entry against the filter either
+                    self.ordering = None
+                    continue
+                if self.previous_datetime is not None and self.ordering is not None:
+                    if (self.ordering == "Ascending" and entry_datetime < self.previous_datetime) or (
+                        self.ordering == "Descending" and entry_datetime > self.previous_datetime
+                    ):
+                        self.ordering = None
+                self.previous_datetime = entry_datetime
+
+                # Skip entries outside of the time range
+                if self.start_datetime is not None and entry_datetime < self.start_datetime:
+                    if self.ordering == "Descending":
+                        self.done = True
+                        return entries
+                    continue
+                if self.end_datetime is not None and entry_datetime > self.end_datetime:
+                    if self.ordering == "Ascending":
+                        self.done = True
+                        return entries
+                    continue
+            self.entry_count += 1
+            entries.append(entry)
+
+        if "Members@odata.nextLink" not in log_entry_col:
+            self.done = True
+        if self.max_entries is not None and self.entry_count >= self.max_entries:
+            self.done = True
+        return entries
+
+
+def get_log_entry_order(log_entries):
+    """
+    Determines if a set of log entries is in order of their timestamps
+
+    Args:
+        log_entries: The log entries to check
+
+    Returns:
+        'Ascending' or 'Descending' if the entries are in order of their timestamps; None if the entries are not in
+        order, are missing timestamps, or do not have enough distinct timestamps to tell
+    """
+
+    timestamps = [parse_timestamp(entry.get("Created", entry.get("EventTimestamp"))) for entry in log_entries]
+    if None in timestamps or len(set(timestamps)) < 2:
+        return None
+    pairs = list(zip(timestamps, timestamps[1:]))
+    if all(earlier <= later for earlier, later in pairs):
+        return "Ascending"
+    if all(earlier >= later for earlier, later in pairs):
+        return "Descending"
+    return None
 
 
 def print_log_entries(log_entries, details=False):
@@ -268,22 +497,6 @@ def print_log_entries(log_entries, details=False):
     # Set up templates
     entry_line_format = "  {:5s} | {:25s} | {}"
     detail_line_format = "  {:33s} | {}: {}"
-    detail_list = [
-        "Severity",
-        "EntryType",
-        "OemRecordFormat",
-        "EntryCode",
-        "OemLogEntryCode",
-        "SensorType",
-        "OemSensorType",
-        "GeneratorId",
-        "SensorNumber",
-        "EventType",
-        "EventId",
-        "EventGroupId",
-        "MessageId",
-        "MessageArgs",
-    ]
     print(entry_line_format.format("Id", "Timestamp", "Message"))
 
     # Go through each entry and print the info
@@ -299,11 +512,102 @@ def print_log_entries(log_entries, details=False):
             )
         )
         if details:
-            for detail in detail_list:
+            for detail in log_entry_detail_properties:
                 if detail in entry:
                     print(detail_line_format.format("", detail, entry[detail]))
 
 
+def parse_timestamp(timestamp):
+    """
+    Converts an ISO8601 date-time string, such as the 'Created' property of a log entry, into a datetime object
+
+    Args:
+        timestamp: The ISO8601 date-time string to convert
+
+    Returns:
+        A timezone-aware datetime object; None if the string is not a valid date-time
+    """
+
+    if not isinstance(timestamp, str):
+        return None
+    match = re.match(
+        r"^(\d{4}-\d{2}-\d{2})[Tt ](\d{2}:\d{2}(:\d{2})?)(\.\d+)?([Zz]|[+-]\d{2}:?\d{2})?$", timestamp.strip()
+    )
+    if match is None:
+        return None
+
+    # Normalize the fractional seconds and offset to forms accepted by all versions of Python
+    fraction = ""
+    if match.group(4) is not None:
+        fraction = (match.group(4) + "000000")[:7]
+    offset = match.group(5)
+    if offset is None or offset in ["Z", "z"]:
+        offset = "+00:00"
+    elif ":" not in offset:
+        offset = offset[:3] + ":" + offset[3:]
+    try:
+        return datetime.datetime.fromisoformat(
+            "{}T{}{}{}".format(match.group(1), match.group(2), fraction, offset)
+        ).astimezone(datetime.timezone.utc)
+    except ValueError:
+        return None
+
+
+def write_log_entries(log_entries, file_name, properties=None, compression=None, chunk_size=500):
+    """
+    Writes a set of log entries to a JSON Lines file, optionally compressed
+
+    Args:
+        log_entries: The log entries to write; this can be a list or a generator, such as from iter_log_entries
+        file_name: The name of the file to write
+        properties: A list of properties to keep for each entry; if None, entries are written as-is
+        compression: The compression to apply ('gzip' or 'zstd'); if None, it's determined from the file extension
+        chunk_size: The number of entries to buffer before writing to the file
+
+    Returns:
+        The number of entries written
+    """
+
+    # Determine the compression from the file extension if not specified
+    if compression is None:
+        extension = os.path.splitext(file_name)[1].lower()
+        if extension in [".gz", ".gzip"]:
+            compression = "gzip"
+        elif extension in [".zst", ".zstd"]:
+            compression = "zstd"
+
+    # Open the file based on the compression format
+    if compression is None:
+        log_file = open(file_name, "w", encoding="utf-8", newline="\n")
+    elif compression == "gzip":
+        log_file = gzip.open(file_name, "wt", encoding="utf-8", newline="\n")
+    elif compression == "zstd":
+        if zstd is None:
+            raise RedfishLogExportError(
+                "Writing zstd-compressed logs requires Python 3.14 or the 'backports.zstd' package"
+            )
+        log_file = zstd.open(file_name, "wt", encoding="utf-8", newline="\n")
+    else:
+        raise RedfishLogExportError("Unsupported compression '{}'; must be 'gzip' or 'zstd'".format(compression))
+
+    # Write the entries as they're produced; only a chunk of lines is held at a time
+    entry_count = 0
+    with log_file:
+        lines = []
+        for entry in log_entries:
+            if properties is not None:
+                entry = {prop: entry[prop] for prop in properties if prop in entry}
+            lines.append(json.dumps(entry, separators=(",", ":")))
+            entry_count += 1
+            if len(lines) >= chunk_size:
+                log_file.write("\n".join(lines) + "\n")
+                lines = []
+        if lines:
+            log_file.write("\n".join(lines) + "\n")
+
+    return entry_count
+
+
 def clear_log_entries(
     context, container_type=log_container.MANAGER, container_id=None, log_service_id=None, log_service=None
 ):
@@ -426,3 +730,160 @@ def download_diagnostic_data(context, collect_response):
         filename,
         response._http_response.content,
     )  # TODO: May need to push support in python-redfish-library to have a proper method of getting raw content
+
+
+def save_diagnostic_data(context, collect_response, directory=".", chunk_size=DEFAULT_CHUNK_SIZE, max_attempts=5):
+    """
+    Downloads the diagnostic data based on the response from the collect action and streams it to a file; if the
+    connection drops, the download resumes from where it stopped
+
+    Args:
+        context: The Redfish client object with an open session
+        collect_response: The response object from the collect diagnostic data action
+        directory: The directory to save the diagnostic data
+        chunk_size: The size of each block of data to write to the file
+        max_attempts: The maximum number of connection attempts before failing the download
+
+    Returns:
+        The path of the file containing the diagnostic data
+        The SHA-256 checksum of the file
+    """
+
+    # Follow the Location header to the log entry
+    entry_uri = collect_response.getheader("Location")
+    if entry_uri is None:
+        raise RedfishDiagnosticDataNotFoundError(
+            "The response to collecting diagnostic data does not contain a location for the data"
+        )
+
+    # Get the log entry
+    response = context.get(entry_uri)
+    if "AdditionalDataURI" not in response.dict:
+        raise RedfishDiagnosticDataNotFoundError(
+            "The log entry for the collected data does not contain an additional data link"
+        )
+
+    # Build a file name that does not conflict with existing files
+    # The file is created right away to reserve the name from other downloads to the same directory
+    os.makedirs(directory, exist_ok=True)
+    filename = response.dict["AdditionalDataURI"].split("/")[-1]
+    path = os.path.join(directory, filename)
+    name_parts = filename.split(".", 1)
+    file_check = 0
+    if len(name_parts) == 1:
+        name_parts.append("")
+    while True:
+        try:
+            open(path, "xb").close()
+            break
+        except FileExistsError:
+            # If the file already exists, build a new file name with a counter
+            file_check = file_check + 1
+            filename = "{}({}).{}".format(name_parts[0], file_check, name_parts[1])
+            path = os.path.join(directory, filename)
+
+    # Download the file; the size reported in the log entry is used to verify the data
+    try:
+        result = stream_download(
+            context,
+            response.dict["AdditionalDataURI"],
+            path,
+            expected_size=response.dict.get("AdditionalDataSizeBytes"),
+            chunk_size=chunk_size,
+            max_attempts=max_attempts,
+            resume=False,
+        )
+    except Exception:
+        os.remove(path)
+        raise
+    return path, result["SHA256"]
+
+
+def collect_all_diagnostic_data(contexts, targets, directory=".", max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Performs diagnostic data collection for a set of log services on a set of Redfish services concurrently and saves
+    the data from each collection as soon as it's complete
+
+    Args:
+        contexts: A dictionary of Redfish client objects with open sessions, keyed by host
+        targets: A list of dictionaries describing the collections to perform on each host; each dictionary can contain
+                 'ContainerType', 'ContainerId', 'LogServiceId', 'DiagnosticDataType', and 'OEMDiagnosticDataType' with
+                 the same meaning as the arguments of collect_diagnostic_data
+        directory: The directory to save the diagnostic data; data for each host is saved in a directory for the host
+        max_workers: The maximum number of collections to perform at the same time
+
+    Returns:
+        A dictionary keyed by host containing a list with the result of each target; each result is a dictionary
+        containing the 'Target', the 'Path' and 'SHA256' of the saved file, the exception raised in 'Error' (or None),
+        and the time from the start of all collections until it finished in 'Duration'
+    """
+
+    def start_collection(context, target):
+        return collect_diagnostic_data(
+            context,
+            container_type=target.get("ContainerType", log_container.MANAGER),
+            container_id=target.get("ContainerId"),
+            log_service_id=target.get("LogServiceId"),
+            diagnostic_data_type=target.get("DiagnosticDataType"),
+            oem_data_type=target.get("OEMDiagnosticDataType"),
+        )
+
+    def save_collection(host, context, response):
+        verify_response(response)
+        return save_diagnostic_data(context, response, os.path.join(directory, get_host_file_name(host)))
+
+    results = {}
+    start = time.monotonic()
+    pending = {"Count": sum(len(targets) for host in contexts)}
+    pending_lock = threading.Lock()
+    done = threading.Event()
+
+    def finish(result, error=None):
+        # Stamped by the thread that completed the collection so the time isn't skewed by other collections
+        result["Error"] = error
+        result["Duration"] = time.monotonic() - start
+        with pending_lock:
+            pending["Count"] -= 1
+            if pending["Count"] == 0:
+                done.set()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor, TaskScheduler() as scheduler:
+        # Each stage hands a collection to the next stage as soon as it completes, so a slow service only holds up
+        # its own collections
+        def save(host, context, result, task_future):
+            try:
+                result["Path"], result["SHA256"] = save_collection(host, context, task_future.result())
+            except Exception as e:
+                finish(result, e)
+                return
+            finish(result)
+
+        def on_task_complete(host, context, result, task_future):
+            try:
+                executor.submit(save, host, context, result, task_future)
+            except Exception as e:
+                finish(result, e)
+
+        def on_collection_started(host, context, result, collect_future):
+            try:
+                task_future = scheduler.add(context, collect_future.result())
+                task_future.add_done_callback(lambda future: on_task_complete(host, context, result, future))
+            except Exception as e:
+                finish(result, e)
+
+        for host, context in contexts.items():
+            results[host] = []
+            for target in targets:
+                result = {"Target": target, "Path": None, "SHA256": None, "Error": None, "Duration": None}
+                results[host].append(result)
+                collect_future = executor.submit(start_collection, context, target)
+                collect_future.add_done_callback(
+                    lambda future, host=host, context=context, result=result: on_collection_started(
+                        host, context, result, future
+                    )
+                )
+
+        if pending["Count"]:
+            done.wait()
+
+    return results
@@ -13,6 +13,8 @@ Brief : This file contains the definitions and functionalities for interacting
 """
 
 import sys
+from .action_info import get_action_info
+from .action_info import get_cached_action_info
 from .collections import get_collection_ids
 from .messages import verify_response
 from .resets import reset_types
@@ -213,7 +215,12 @@ def get_manager_reset_info(context, manager_id=None, manager=None):
     """
 
     if manager is None:
-        manager = get_manager(context, manager_id)
+        # The reset info does not change at runtime; reuse it if it was found recently
+        return get_cached_action_info(
+            context,
+            ("#Manager.Reset", manager_id),
+            lambda: get_manager_reset_info(context, manager_id, get_manager(context, manager_id)),
+        )
 
     # Check that there is a Reset action
     if "Actions" not in manager.dict:
@@ -243,8 +250,8 @@ def get_manager_reset_info(context, manager_id=None, manager=None):
                 param["AllowableValues"] = reset_action[param["Name"] + "@Redfish.AllowableValues"]
     else:
         # Get the action info and its parameter listing
-        action_info = context.get(reset_action["@Redfish.ActionInfo"])
-        reset_parameters = action_info.dict["Parameters"]
+        action_info = get_action_info(context, reset_action["@Redfish.ActionInfo"])
+        reset_parameters = action_info["Parameters"]
 
     return reset_uri, reset_parameters
 
@@ -317,7 +324,12 @@ def get_manager_reset_to_defaults_info(context, manager_id=None, manager=None):
     """
 
     if manager is None:
-        manager = get_manager(context, manager_id)
+        # The reset-to-defaults info does not change at runtime; reuse it if it was found recently
+        return get_cached_action_info(
+            context,
+            ("#Manager.ResetToDefaults", manager_id),
+            lambda: get_manager_reset_to_defaults_info(context, manager_id, get_manager(context, manager_id)),
+        )
 
     # Check that there is a Reset action
     if "Actions" not in manager.dict:
@@ -347,8 +359,8 @@ def get_manager_reset_to_defaults_info(context, manager_id=None, manager=None):
                 param["AllowableValues"] = reset_action[param["Name"] + "@Redfish.AllowableValues"]
     else:
         # Get the action info and its parameter listing
-        action_info = context.get(reset_action["@Redfish.ActionInfo"])
-        reset_parameters = action_info.dict["Parameters"]
+        action_info = get_action_info(context, reset_action["@Redfish.ActionInfo"])
+        reset_parameters = action_info["Parameters"]
 
     return reset_uri, reset_parameters
 
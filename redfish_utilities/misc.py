@@ -11,6 +11,8 @@ File : misc.py
 Brief : Miscellaneous functions with common script logic
 """
 
+from .tasks import close_task_event_listener
+
 
 def logout(context, ignore_error=False):
     """
@@ -22,6 +24,8 @@ def logout(context, ignore_error=False):
     """
 
     if context is not None:
+        # Task events are received over the session
+        close_task_event_listener(context)
         try:
             context.logout()
         except Exception:
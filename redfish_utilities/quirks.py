@@ -0,0 +1,228 @@
+#! /usr/bin/python
+# Copyright Notice:
+# Copyright 2019-2026 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tacklebox/blob/main/LICENSE.md
+
+"""
+Quirks Module
+
+File : quirks.py
+
+Brief : This file contains the definitions and functionalities for recording
+        the outcome of workarounds for non-conformant services so they can
+        be reused for other services with the same vendor, model, and
+        firmware
+"""
+
+import os
+import threading
+import time
+from .json_store import read_json_store
+from .json_store import update_json_store
+from . import config
+
+# Paths, relative to a resource, where non-conformant services are known to place its settings resource
+settings_paths = ["Settings", "SD"]
+
+# Workaround outcomes keyed by service fingerprint, and then by the name of the quirk
+quirks = {}
+quirks_lock = threading.Lock()
+quirks_state = {"File": None, "Version": None}
+
+
+def get_system_fingerprint(system):
+    """
+    Builds the fingerprint for a system used to look up its quirks
+
+    Args:
+        system: The system resource
+
+    Returns:
+        A string containing the manufacturer, model, and BIOS version of the system; None if the system does not
+        report its manufacturer or model
+    """
+
+    manufacturer = system.dict.get("Manufacturer")
+    model = system.dict.get("Model")
+    if not manufacturer or not model:
+        return None
+    return "{}|{}|{}".format(manufacturer, model, system.dict.get("BiosVersion", ""))
+
+
+def get_quirk(fingerprint, name):
+    """
+    Gets the recorded outcome of a workaround
+
+    Args:
+        fingerprint: The fingerprint of the service
+        name: The name of the quirk
+
+    Returns:
+        The recorded value; None if nothing is recorded or the recorded value expired
+    """
+
+    if fingerprint is None:
+        return None
+    with quirks_lock:
+        load_quirks()
+        values = quirks.get(fingerprint, {})
+        expires = values.get(name + "@Expires")
+        if expires is not None and expires <= time.time():
+            return None
+        return values.get(name)
+
+
+def set_quirk(fingerprint, name, value, ttl=None):
+    """
+    Records the outcome of a workaround; if config.__quirks_file__ is set, the registry is saved to the file
+
+    Args:
+        fingerprint: The fingerprint of the service
+        name: The name of the quirk
+        value: The value to record
+        ttl: The time, in seconds, to keep the value; if None, the value is kept until it's replaced
+    """
+
+    if fingerprint is None:
+        return
+    expires = None
+    if ttl is not None:
+        expires = time.time() + ttl
+    with quirks_lock:
+        load_quirks()
+        values = quirks.get(fingerprint, {})
+        if expires is None and values.get(name) == value and values.get(name + "@Expires") is None:
+            return
+        values = quirks.setdefault(fingerprint, {})
+        values[name] = value
+        if expires is None:
+            # Keep the key so the expiration saved by earlier runs is replaced when merging with the file
+            if name + "@Expires" in values:
+                values[name + "@Expires"] = None
+        else:
+            values[name + "@Expires"] = expires
+        save_quirks()
+
+
+def clear_quirks():
+    """
+    Removes all recorded quirks, including those saved to config.__quirks_file__
+    """
+
+    with quirks_lock:
+        load_quirks()
+        quirks.clear()
+        if quirks_state["File"] is not None and os.path.isfile(quirks_state["File"]):
+            os.remove(quirks_state["File"])
+        quirks_state["Version"] = None
+
+
+def get_settings_paths(fingerprint, name):
+    """
+    Gets the paths to probe for a settings resource, limited to the path recorded for the service if known; services
+    recorded as not having a settings resource are probed again after config.__quirks_negative_ttl__ seconds
+
+    Args:
+        fingerprint: The fingerprint of the service
+        name: The name of the quirk containing the path
+
+    Returns:
+        A list of paths relative to the resource; empty if the service is known to not have a settings resource
+    """
+
+    settings_path = get_quirk(fingerprint, name)
+    if settings_path is None:
+        return settings_paths
+    if settings_path == "":
+        return []
+    return [settings_path]
+
+
+def set_settings_path(fingerprint, name, setting_ext, statuses):
+    """
+    Records the outcome of probing for a settings resource; a service is only recorded as not having a settings
+    resource when every path probed was not found, and that outcome expires after config.__quirks_negative_ttl__
+    seconds
+
+    Args:
+        fingerprint: The fingerprint of the service
+        name: The name of the quirk containing the path
+        setting_ext: The path where the settings resource was found; None if it was not found
+        statuses: The HTTP status codes of the responses for each path probed
+    """
+
+    if setting_ext is not None:
+        set_quirk(fingerprint, name, setting_ext)
+    elif statuses and all(status == 404 for status in statuses):
+        set_quirk(fingerprint, name, "", ttl=config.__quirks_negative_ttl__)
+
+
+def load_quirks():
+    """
+    Loads the registry from config.__quirks_file__ if the setting or the file changed since the last load, such as
+    when another process saved to the file; the caller is expected to hold the lock
+    """
+
+    quirks_file = config.__quirks_file__
+    version = get_quirks_file_version(quirks_file)
+    if quirks_file == quirks_state["File"] and version == quirks_state["Version"]:
+        return
+    quirks_state["File"] = quirks_file
+    quirks_state["Version"] = version
+    quirks.clear()
+    if quirks_file is not None:
+        quirks.update(read_quirks(read_json_store(quirks_file)))
+
+
+def get_quirks_file_version(quirks_file):
+    """
+    Identifies the current contents of the registry file
+
+    Args:
+        quirks_file: The filepath of the registry
+
+    Returns:
+        A tuple of the inode, size, and modification time of the file; None if there is no file
+    """
+
+    if quirks_file is None:
+        return None
+    try:
+        file_stat = os.stat(quirks_file)
+    except OSError:
+        return None
+    return (file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns)
+
+
+def save_quirks():
+    """
+    Saves the registry to config.__quirks_file__, merging in entries saved by other processes; the caller is expected
+    to hold the lock
+    """
+
+    quirks_file = quirks_state["File"]
+    if quirks_file is None:
+        return
+
+    def merge(saved):
+        merged = read_quirks(saved)
+        for fingerprint, values in quirks.items():
+            merged.setdefault(fingerprint, {}).update(values)
+        return merged
+
+    quirks.update(update_json_store(quirks_file, merge))
+    quirks_state["Version"] = get_quirks_file_version(quirks_file)
+
+
+def read_quirks(saved):
+    """
+    Extracts the quirks from a saved registry
+
+    Args:
+        saved: The dictionary read from the registry file
+
+    Returns:
+        A dictionary of quirks keyed by fingerprint
+    """
+
+    return {fingerprint: values for fingerprint, values in saved.items() if isinstance(values, dict)}
@@ -29,3 +29,22 @@ reset_types = [
 ]
 
 reset_to_defaults_types = ["ResetAll", "PreserveNetworkAndUsers", "PreserveNetwork"]
+
+# The power state expected after a system completes each type of reset; types not listed leave the power state
+# unknown
+reset_power_states = {
+    "On": "On",
+    "ForceOff": "Off",
+    "GracefulShutdown": "Off",
+    "GracefulRestart": "On",
+    "ForceRestart": "On",
+    "ForceOn": "On",
+    "PowerCycle": "On",
+    "Pause": "Paused",
+    "Resume": "On",
+    "FullPowerCycle": "On",
+}
+
+# Reset types that return a system to the power state it was in; a new LastResetTime is the only sign the system was
+# reset, so these are not verified for systems that do not report LastResetTime
+reset_restart_types = ["GracefulRestart", "ForceRestart", "PowerCycle", "FullPowerCycle"]
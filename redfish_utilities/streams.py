@@ -0,0 +1,515 @@
+#! /usr/bin/python
+# Copyright Notice:
+# Copyright 2019-2026 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tacklebox/blob/main/LICENSE.md
+
+"""
+Streams Module
+
+File : streams.py
+
+Brief : This file contains the definitions and functionalities for streaming
+        binary data to and from a Redfish service without holding the data
+        in memory
+"""
+
+import base64
+import contextlib
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from redfish.rest.v1 import RestRequest
+from redfish.rest.v1 import RestResponse
+from .upload_stats import record_upload
+
+# Size of each block of data read from or written to a stream
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class RedfishTransferError(Exception):
+    """
+    Raised when a binary transfer with the service fails or the data received cannot be verified
+    """
+
+    pass
+
+
+def send_request(context, method, uri, headers=None, data=None, stream=False, timeout=None):
+    """
+    Sends a request through the session of a Redfish client object without buffering the request or response body
+
+    Args:
+        context: The Redfish client object with an open session
+        method: The HTTP method of the request
+        uri: The URI of the request; this can be a path on the service or an absolute URL
+        headers: Additional HTTP headers to provide in the request
+        data: The request body; this can be bytes or a file-like object, which is read as the request is sent
+        stream: Indicates if the response body is to be read incrementally by the caller
+        timeout: The timeout, in seconds, to apply to the request, or a tuple of the connect and read timeouts; if None,
+                 the timeout of the client object is used
+
+    Returns:
+        The requests.Response object of the request
+    """
+
+    url = uri
+    if not re.match("^https?://", uri, re.IGNORECASE):
+        url = context.get_base_url() + uri
+    if timeout is None:
+        timeout = context._timeout
+    verify = False
+    if context.cafile:
+        verify = context.cafile
+    return context._session.request(
+        method,
+        url,
+        headers=context._get_req_headers(headers),
+        data=data,
+        stream=stream,
+        timeout=timeout,
+        verify=verify,
+        proxies=context._proxies,
+    )
+
+
+class MultipartStream:
+    """
+    A multipart/form-data request body that reads the content of file parts as the body is sent, so the memory used
+    does not depend on the size of the files
+
+    Args:
+        parts: A dictionary of the parts of the body keyed by part name; each part is a tuple of the file name (None
+               if not a file), the content, and the content type; the content is a string, bytes, or a binary file
+               object, which is read from its current position
+        progress_callback: A function called as the body is read; it's called with the number of bytes read and the
+                           total size of the body
+        send_timeout: The time, in seconds, allowed to read the whole body once reading starts; if None, there is no
+                      limit; stalls are caught separately by the timeout of the connection
+    """
+
+    def __init__(self, parts, progress_callback=None, send_timeout=None):
+        self.send_timeout = send_timeout
+        self.boundary = uuid.uuid4().hex
+        self.content_type = "multipart/form-data; boundary={}".format(self.boundary)
+        self.progress_callback = progress_callback
+        self.segments = []
+        for name, (file_name, content, content_type) in parts.items():
+            header = '--{}\r\nContent-Disposition: form-data; name="{}"'.format(self.boundary, name)
+            if file_name is not None:
+                header += '; filename="{}"'.format(file_name)
+            if content_type is not None:
+                header += "\r\nContent-Type: {}".format(content_type)
+            self.segments.append(header.encode("utf-8") + b"\r\n\r\n")
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            if isinstance(content, bytes):
+                self.segments.append(content)
+            else:
+                size = os.fstat(content.fileno()).st_size - content.tell()
+                self.segments.append((content, content.tell(), size))
+            self.segments.append(b"\r\n")
+        self.segments.append("--{}--\r\n".format(self.boundary).encode("utf-8"))
+        self.length = sum(len(segment) if isinstance(segment, bytes) else segment[2] for segment in self.segments)
+        self.rewind()
+
+    def rewind(self):
+        """
+        Moves back to the start of the body so it can be sent again
+        """
+
+        self.position = 0
+        self.segment_index = 0
+        self.segment_offset = 0
+        self.first_read_time = None
+        self.last_read_time = None
+
+    def read(self, size=-1):
+        """
+        Reads the next block of the body
+
+        Args:
+            size: The maximum number of bytes to read; if negative, the rest of the body is read
+
+        Returns:
+            The bytes read; empty when the whole body has been read
+        """
+
+        if size is None or size < 0:
+            size = self.length - self.position
+        now = time.monotonic()
+        if self.first_read_time is None:
+            self.first_read_time = now
+        elif self.send_timeout is not None and now - self.first_read_time > self.send_timeout:
+            raise RedfishTransferError(
+                "Upload too slow: sent {} of {} bytes in {:.0f} seconds, exceeding the send timeout of {:.0f} "
+                "seconds".format(self.position, self.length, now - self.first_read_time, self.send_timeout)
+            )
+        data = []
+        remaining = size
+        while remaining > 0 and self.segment_index < len(self.segments):
+            segment = self.segments[self.segment_index]
+            if isinstance(segment, bytes):
+                chunk = segment[self.segment_offset : self.segment_offset + remaining]
+                segment_size = len(segment)
+            else:
+                content, start, segment_size = segment
+                content.seek(start + self.segment_offset)
+                chunk = content.read(min(remaining, segment_size - self.segment_offset))
+                if not chunk:
+                    raise RedfishTransferError("File ended before its expected size of {} bytes".format(segment_size))
+            data.append(chunk)
+            remaining -= len(chunk)
+            self.segment_offset += len(chunk)
+            if self.segment_offset >= segment_size:
+                self.segment_index += 1
+                self.segment_offset = 0
+        data = b"".join(data)
+        self.position += len(data)
+        if self.position >= self.length and self.last_read_time is None:
+            self.last_read_time = time.monotonic()
+        if self.progress_callback is not None and data:
+            self.progress_callback(self.position, self.length)
+        return data
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return iter(lambda: self.read(DEFAULT_CHUNK_SIZE), b"")
+
+
+class TransferRateLimiter:
+    """
+    Limits the combined rate of the transfers that share it
+
+    Args:
+        max_rate: The maximum rate, in bytes per second
+    """
+
+    def __init__(self, max_rate):
+        self.max_rate = max_rate
+        self.next_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    def consume(self, size):
+        """
+        Waits until a block of data can be transferred without exceeding the rate
+
+        Args:
+            size: The size of the block in bytes
+        """
+
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_time)
+            self.next_time = start + size / self.max_rate
+        if start > now:
+            time.sleep(start - now)
+
+
+def send_multipart_request(
+    context,
+    uri,
+    parts,
+    timeout=None,
+    max_retry=3,
+    progress_callback=None,
+    send_timeout=None,
+    stats_key=None,
+    throttled=False,
+):
+    """
+    Sends a multipart/form-data POST request without holding the content of file parts in memory; the throughput of
+    the request is recorded with the upload stats
+
+    Args:
+        context: The Redfish client object with an open session
+        uri: The URI of the request
+        parts: A dictionary of the parts of the body, as given to MultipartStream; file objects are left open
+        timeout: The timeout, in seconds, to apply to the request, or a tuple of the timeout to connect and send the
+                 body and the timeout to wait for the response; if None, the timeout of the client object is used
+        max_retry: The number of times to retry the request if it cannot be sent
+        progress_callback: A function called as the body is sent; it's called with the number of bytes sent and the
+                           total size of the body
+        send_timeout: The time, in seconds, allowed to send the whole body; if None, there is no limit
+        stats_key: The key to record the upload stats under; if None, the address of the service is used
+        throttled: Indicates if the body is held back by a rate limit, such as from the progress callback; the
+                   throughput of the upload is not recorded
+
+    Returns:
+        The response of the request; its 'upload_stats' attribute contains the measurements of this upload, as
+        produced by record_upload, or None if no data was sent
+    """
+
+    body = MultipartStream(parts, progress_callback=progress_callback, send_timeout=send_timeout)
+    attempt = 0
+    while True:
+        attempt += 1
+        body.rewind()
+        start = time.monotonic()
+        try:
+            response = send_request(
+                context, "POST", uri, headers={"Content-Type": body.content_type}, data=body, timeout=timeout
+            )
+            break
+        except RedfishTransferError:
+            raise
+        except Exception:
+            if attempt > max_retry:
+                raise
+            time.sleep(1)
+
+    # Record the throughput of the upload so later uploads can be tuned
+    end = time.monotonic()
+    upload_stats = None
+    if body.last_read_time is not None:
+        if stats_key is None:
+            stats_key = context.get_base_url()
+        upload_stats = record_upload(
+            stats_key,
+            body.length,
+            body.first_read_time - start,
+            body.last_read_time - body.first_read_time,
+            end - body.last_read_time,
+            throttled=throttled,
+        )
+
+    # Present the response the same way as other requests made with the client object
+    response = RestResponse(RestRequest(uri, method="POST"), response)
+    response.upload_stats = upload_stats
+    return response
+
+
+def stream_download(
+    context,
+    uri,
+    file_path,
+    expected_size=None,
+    expected_sha256=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    max_attempts=5,
+    resume=True,
+):
+    """
+    Downloads a binary resource directly to a file; if the connection drops, the download resumes with a range request
+
+    Args:
+        context: The Redfish client object with an open session
+        uri: The URI of the binary resource to download
+        file_path: The filepath to save the data
+        expected_size: The expected size of the data in bytes; if None, the size reported by the service is used
+        expected_sha256: The expected SHA-256 checksum of the data as a hex string; if None, the checksum reported by
+                         the service in a 'Repr-Digest' or 'Digest' header is used, if any
+        chunk_size: The size of each block of data to write to the file
+        max_attempts: The maximum number of connection attempts before failing the download
+        resume: Indicates if data left in the partial download file from an earlier attempt is to be kept
+
+    Returns:
+        A dictionary containing the 'Size' of the file in bytes and its 'SHA256' checksum
+    """
+
+    # Data is written to a partial file until the download is verified
+    partial_path = file_path + ".part"
+    if not resume or not os.path.isfile(partial_path):
+        open(partial_path, "wb").close()
+
+    try:
+        total_size = expected_size
+        attempt = 0
+        while True:
+            attempt += 1
+            received = os.path.getsize(partial_path)
+            # Compressed transfers would make the received size differ from the size reported by the service
+            headers = {"Accept": "*/*", "Accept-Encoding": "identity"}
+            if received:
+                headers["Range"] = "bytes={}-".format(received)
+            try:
+                response = send_request(context, "GET", uri, headers=headers, stream=True)
+                with response:
+                    if response.status_code == 416 and received and received == total_size:
+                        # The partial file already contains all of the data
+                        break
+                    if response.status_code >= 400:
+                        raise RedfishTransferError("Download of '{}' failed: HTTP {}".format(uri, response.status_code))
+                    if response.status_code != 206:
+                        # Either a new download or the service ignored the range; start from the beginning
+                        received = 0
+                        if total_size is None and response.headers.get("Content-Length") is not None:
+                            total_size = int(response.headers["Content-Length"])
+                    else:
+                        content_range = re.match(
+                            r"^bytes (\d+)-\d+/(\d+|\*)$", response.headers.get("Content-Range", "")
+                        )
+                        if content_range is None or int(content_range.group(1)) != received:
+                            raise RedfishTransferError(
+                                "Download of '{}' failed: service responded with an invalid range".format(uri)
+                            )
+                        if total_size is None and content_range.group(2) != "*":
+                            total_size = int(content_range.group(2))
+                    if expected_sha256 is None:
+                        expected_sha256 = get_digest_sha256(response.headers)
+
+                    # Append the data to the partial file as it arrives
+                    with open(partial_path, "r+b") as partial_file:
+                        partial_file.truncate(received)
+                        partial_file.seek(received)
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            partial_file.write(chunk)
+                received = os.path.getsize(partial_path)
+                if total_size is None or received >= total_size:
+                    break
+            except RedfishTransferError:
+                raise
+            except Exception as e:
+                if attempt >= max_attempts:
+                    raise RedfishTransferError(
+                        "Download of '{}' failed after {} attempts: {}".format(uri, attempt, e)
+                    ) from e
+            if attempt >= max_attempts:
+                raise RedfishTransferError(
+                    "Download of '{}' failed after {} attempts: received {} of {} bytes".format(
+                        uri, attempt, received, total_size
+                    )
+                )
+            time.sleep(1)
+
+        # Verify the data against the expected size and checksum
+        received = os.path.getsize(partial_path)
+        checksum = hashlib.sha256()
+        with open(partial_path, "rb") as partial_file:
+            for chunk in iter(lambda: partial_file.read(chunk_size), b""):
+                checksum.update(chunk)
+        if total_size is not None and received != total_size:
+            raise RedfishTransferError(
+                "Download of '{}' failed: received {} bytes, expected {} bytes".format(uri, received, total_size)
+            )
+        if expected_sha256 is not None and checksum.hexdigest() != expected_sha256.lower():
+            raise RedfishTransferError(
+                "Download of '{}' failed: SHA-256 checksum {} does not match the expected checksum {}".format(
+                    uri, checksum.hexdigest(), expected_sha256.lower()
+                )
+            )
+    except Exception:
+        # Without resume, a later attempt starts over, so the partial data is of no use
+        if not resume and os.path.isfile(partial_path):
+            os.remove(partial_path)
+        raise
+    os.replace(partial_path, file_path)
+    return {"Size": received, "SHA256": checksum.hexdigest()}
+
+
+class FileUploadStream:
+    """
+    A request body that reads a file as the body is sent and computes the SHA-256 checksum of the data sent
+
+    Args:
+        upload_file: The file object to send, opened in binary mode
+        chunk_size: The size of each block of data to read from the file
+    """
+
+    def __init__(self, upload_file, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.upload_file = upload_file
+        self.chunk_size = chunk_size
+        self.size = os.fstat(upload_file.fileno()).st_size
+        self.sent = 0
+        self.checksum = hashlib.sha256()
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.chunk_size
+        data = self.upload_file.read(size)
+        self.checksum.update(data)
+        self.sent += len(data)
+        return data
+
+    def __len__(self):
+        # Allows the length of the body to be given in the 'Content-Length' header
+        return self.size
+
+
+def stream_upload(
+    context, uri, file_path, method="PUT", headers=None, expected_sha256=None, chunk_size=DEFAULT_CHUNK_SIZE
+):
+    """
+    Uploads a file to a binary resource without holding the data in memory
+
+    Args:
+        context: The Redfish client object with an open session
+        uri: The URI of the binary resource to upload
+        file_path: The filepath of the data to upload
+        method: The HTTP method of the request
+        headers: Additional HTTP headers to provide in the request
+        expected_sha256: The expected SHA-256 checksum of the file as a hex string; if given, the file is copied to
+                         a private temporary file as it's verified, and the copy is sent so changes to the file after
+                         it's verified are not sent
+        chunk_size: The size of each block of data to read from the file
+
+    Returns:
+        A dictionary containing the 'Response' of the service, the 'Size' of the data sent in bytes, and its 'SHA256'
+        checksum
+    """
+
+    with contextlib.ExitStack() as stack:
+        upload_file = stack.enter_context(open(file_path, "rb"))
+
+        # Verify the file first so data that does not match is never written to the service; the data is sent from a
+        # private copy so the file cannot change between the check and the upload
+        if expected_sha256 is not None:
+            checksum = hashlib.sha256()
+            verified_file = stack.enter_context(tempfile.TemporaryFile())
+            for chunk in iter(lambda: upload_file.read(chunk_size), b""):
+                checksum.update(chunk)
+                verified_file.write(chunk)
+            if checksum.hexdigest() != expected_sha256.lower():
+                raise RedfishTransferError(
+                    "Upload of '{}' failed: SHA-256 checksum {} does not match the expected checksum {}".format(
+                        file_path, checksum.hexdigest(), expected_sha256.lower()
+                    )
+                )
+            verified_file.flush()
+            verified_file.seek(0)
+            upload_file = verified_file
+
+        body = FileUploadStream(upload_file, chunk_size=chunk_size)
+        request_headers = {"Content-Type": "application/octet-stream"}
+        request_headers.update(headers or {})
+        try:
+            response = send_request(context, method, uri, headers=request_headers, data=body)
+        except Exception as e:
+            raise RedfishTransferError("Upload of '{}' failed: {}".format(file_path, e)) from e
+
+    # Present the response the same way as other requests made with the client object
+    return {
+        "Response": RestResponse(RestRequest(uri, method=method), response),
+        "Size": body.sent,
+        "SHA256": body.checksum.hexdigest(),
+    }
+
+
+def get_digest_sha256(headers):
+    """
+    Finds the SHA-256 digest reported in the 'Repr-Digest' or 'Digest' header of a response
+
+    Args:
+        headers: The headers of the response
+
+    Returns:
+        The SHA-256 checksum as a hex string; None if not reported
+    """
+
+    for header, pattern in [("Repr-Digest", r"sha-256=:([^:]+):"), ("Digest", r"SHA-256=([^,\s]+)")]:
+        value = headers.get(header)
+        if value is None:
+            continue
+        match = re.search(pattern, value, re.IGNORECASE)
+        if match is None:
+            continue
+        try:
+            return base64.b64decode(match.group(1)).hex()
+        except Exception:
+            continue
+    return None
@@ -14,9 +14,23 @@ Brief : This file contains the definitions and functionalities for interacting
 
 import warnings
 import sys
+import time
+from .action_info import get_action_info
+from .action_info import get_cached_action_info
 from .collections import get_collection_ids
+from .fleet import DEFAULT_MAX_WORKERS
+from .fleet import run_in_waves
+from .fleet import run_on_hosts
 from .messages import verify_response
+from .quirks import get_quirk
+from .quirks import get_settings_paths
+from .quirks import get_system_fingerprint
+from .quirks import set_quirk
+from .quirks import set_settings_path
 from .resets import reset_types
+from .resets import reset_power_states
+from .resets import reset_restart_types
+from .tasks import poll_task_monitor
 from . import config
 
 
@@ -36,6 +50,14 @@ class RedfishSystemResetNotFoundError(Exception):
     pass
 
 
+class RedfishSystemPowerStateError(Exception):
+    """
+    Raised when a system does not reach the expected power state
+    """
+
+    pass
+
+
 class RedfishSystemBootNotFoundError(Exception):
     """
     Raised when the boot object cannot be found
@@ -162,11 +184,16 @@ def get_system_boot(context, system_id=None):
     boot_obj = system.dict.get("Boot")
 
     if config.__workarounds__:
-        # Try getting boot information from the settings resource
-        settings_uris = ["Settings", "SD"]
+        # Try getting boot information from the settings resource; only probe where the service is known to keep it
+        fingerprint = get_system_fingerprint(system)
+        settings_uris = get_settings_paths(fingerprint, "SystemSettingsPath")
+        statuses = []
+        found_ext = None
         for setting_ext in settings_uris:
             system_settings = context.get(system.dict["@odata.id"] + "/" + setting_ext)
+            statuses.append(system_settings.status)
             if system_settings.status == 200:
+                found_ext = setting_ext
                 if "Boot" in system_settings.dict:
                     if boot_obj is None:
                         # Boot property only exists in settings, which is not expected
@@ -202,6 +229,7 @@ def get_system_boot(context, system_id=None):
                                 )
                             )
                 break
+        set_settings_path(fingerprint, "SystemSettingsPath", found_ext, statuses)
 
     if boot_obj is None:
         raise RedfishSystemBootNotFoundError("System '{}' does not contain the boot object".format(system.dict["Id"]))
@@ -277,34 +305,34 @@ def set_system_boot(
     if ov_boot_next is not None:
         payload["Boot"]["BootNext"] = ov_boot_next
 
-    # Update the system
-    headers = None
-    etag = system.getheader("ETag")
-    if etag is not None:
-        headers = {"If-Match": etag}
-    response = context.patch(system.dict["@odata.id"], body=payload, headers=headers)
+    # Systems of the same vendor, model, and firmware are expected to need the same workaround
+    fingerprint = get_system_fingerprint(system)
+    response = None
+    if config.__workarounds__ and get_quirk(fingerprint, "BootOverrideSettingsPath"):
+        # Go straight to the settings resource found for another system
+        response = patch_system_settings(context, system, get_quirk(fingerprint, "BootOverrideSettingsPath"), payload)
 
-    # Attempt workarounds if needed
-    if config.__workarounds__ and response.status >= 400:
-        # Try directing the request to the settings resource
-        settings_uris = ["Settings", "SD"]
-        for setting_ext in settings_uris:
-            system_settings = context.get(system.dict["@odata.id"] + "/" + setting_ext)
-            if system_settings.status == 200:
-                headers = None
-                etag = system_settings.getheader("ETag")
-                if etag is not None:
-                    headers = {"If-Match": etag}
-                settings_response = context.patch(
-                    system.dict["@odata.id"] + "/" + setting_ext, body=payload, headers=headers
-                )
-                if settings_response.status < 400:
+    # Update the system
+    if response is None or response.status >= 400:
+        headers = None
+        etag = system.getheader("ETag")
+        if etag is not None:
+            headers = {"If-Match": etag}
+        response = context.patch(system.dict["@odata.id"], body=payload, headers=headers)
+
+        # Attempt workarounds if needed
+        if config.__workarounds__ and response.status >= 400:
+            # Try directing the request to the settings resource
+            for setting_ext in get_settings_paths(fingerprint, "SystemSettingsPath"):
+                settings_response = patch_system_settings(context, system, setting_ext, payload)
+                if settings_response is not None and settings_response.status < 400:
                     # Workaround successful; swap out the response object to return
                     warnings.warn(
                         "System '{}' incorrectly required applying the boot override configuration to the settings resource.  Contact your vendor.".format(
                             system_id
                         )
                     )
+                    set_quirk(fingerprint, "BootOverrideSettingsPath", setting_ext)
                     response = settings_response
                     break
 
@@ -312,6 +340,94 @@ def set_system_boot(
     return response
 
 
+def patch_system_settings(context, system, setting_ext, payload):
+    """
+    Applies an update to the settings resource of a system
+
+    Args:
+        context: The Redfish client object with an open session
+        system: The system resource
+        setting_ext: The path of the settings resource relative to the system, such as 'Settings'
+        payload: The body of the PATCH
+
+    Returns:
+        The response of the PATCH; None if the system does not have the settings resource
+    """
+
+    system_settings = context.get(system.dict["@odata.id"] + "/" + setting_ext)
+    if system_settings.status != 200:
+        return None
+    headers = None
+    etag = system_settings.getheader("ETag")
+    if etag is not None:
+        headers = {"If-Match": etag}
+    return context.patch(system.dict["@odata.id"] + "/" + setting_ext, body=payload, headers=headers)
+
+
+def set_systems_boot(
+    contexts,
+    ov_target,
+    ov_enabled="Once",
+    ov_mode=None,
+    ov_uefi_target=None,
+    ov_boot_next=None,
+    system_ids=None,
+    reset=False,
+    reset_type=None,
+    wave_size=None,
+    wave_delay=0,
+    max_workers=DEFAULT_MAX_WORKERS,
+    max_failures=None,
+    on_result=None,
+):
+    """
+    Updates the Boot object of the systems of a set of Redfish services, and optionally resets the systems
+
+    Args:
+        contexts: A dictionary of Redfish client objects with open sessions, keyed by host
+        ov_target: The override target (BootSourceOverrideTarget)
+        ov_enabled: The override enabled setting (BootSourceOverrideEnabled)
+        ov_mode: The override mode setting (BootSourceOverrideMode)
+        ov_uefi_target: The UEFI target for override (UefiTargetBootSourceOverride)
+        ov_boot_next: The UEFI boot next for override (BootNext)
+        system_ids: The systems to update on each host; if None, all systems of each host are updated
+        reset: Indicates if each system is to be reset after its Boot object is updated
+        reset_type: The type of reset to perform; if None, perform one of the common resets
+        wave_size: The number of hosts in each wave; if None, all hosts are in a single wave
+        wave_delay: The time, in seconds, to wait between waves
+        max_workers: The maximum number of hosts to update at the same time within a wave
+        max_failures: The number of failed hosts allowed before the remaining waves are skipped; if None, all waves
+                      are performed
+        on_result: A function called from the calling thread as each host completes; it's called with the host and
+                   its result dictionary
+
+    Returns:
+        A dictionary of results keyed by host, as produced by run_on_hosts; the 'Result' of each host is the list of
+        identifiers of the systems updated
+    """
+
+    def set_host_boot(host, context):
+        updated_systems = []
+        for system_id in system_ids or get_system_ids(context):
+            set_system_boot(context, system_id, ov_target, ov_enabled, ov_mode, ov_uefi_target, ov_boot_next)
+            if reset:
+                response = system_reset(context, system_id, reset_type)
+                response = poll_task_monitor(context, response, silent=True)
+                verify_response(response)
+            updated_systems.append(system_id)
+        return updated_systems
+
+    return run_in_waves(
+        contexts,
+        set_host_boot,
+        wave_size=wave_size,
+        wave_delay=wave_delay,
+        max_workers=max_workers,
+        max_failures=max_failures,
+        on_result=on_result,
+    )
+
+
 def print_system_boot(boot):
     """
     Prints the contents of a Boot object
@@ -359,7 +475,12 @@ def get_system_reset_info(context, system_id=None, system=None):
     """
 
     if system is None:
-        system = get_system(context, system_id)
+        # The reset info does not change at runtime; reuse it if it was found recently
+        return get_cached_action_info(
+            context,
+            ("#ComputerSystem.Reset", system_id),
+            lambda: get_system_reset_info(context, system_id, get_system(context, system_id)),
+        )
 
     # Check that there is a Reset action
     if "Actions" not in system.dict:
@@ -385,8 +506,8 @@ def get_system_reset_info(context, system_id=None, system=None):
                 param["AllowableValues"] = reset_action[param["Name"] + "@Redfish.AllowableValues"]
     else:
         # Get the action info and its parameter listing
-        action_info = context.get(reset_action["@Redfish.ActionInfo"])
-        reset_parameters = action_info.dict["Parameters"]
+        action_info = get_action_info(context, reset_action["@Redfish.ActionInfo"])
+        reset_parameters = action_info["Parameters"]
 
     return reset_uri, reset_parameters
 
@@ -444,6 +565,121 @@ def system_reset(context, system_id=None, reset_type=None):
     return response
 
 
+def wait_for_system_power_state(context, power_state, system_id=None, timeout=300, interval=5, last_reset_time=None):
+    """
+    Polls the power state of a system until it reaches the given power state
+
+    Args:
+        context: The Redfish client object with an open session
+        power_state: The power state to wait for
+        system_id: The system to locate; if None, perform on the only system
+        timeout: The maximum time, in seconds, to wait
+        interval: The time, in seconds, between polls
+        last_reset_time: The LastResetTime of the system before a reset; if provided, the system also needs to report
+                         a different LastResetTime, which shows the reset took place
+
+    Returns:
+        The system resource
+    """
+
+    deadline = time.monotonic() + timeout
+    while True:
+        system = get_system(context, system_id)
+        current_state = system.dict.get("PowerState")
+        reset = last_reset_time is None or system.dict.get("LastResetTime", last_reset_time) != last_reset_time
+        if current_state == power_state and reset:
+            return system
+        if current_state is None:
+            raise RedfishSystemPowerStateError("System '{}' does not report its power state".format(system.dict["Id"]))
+        if time.monotonic() >= deadline:
+            if not reset:
+                raise RedfishSystemPowerStateError(
+                    "System '{}' did not report a new reset time within {} seconds; current power state: {}".format(
+                        system.dict["Id"], timeout, current_state
+                    )
+                )
+            raise RedfishSystemPowerStateError(
+                "System '{}' did not reach power state {} within {} seconds; current power state: {}".format(
+                    system.dict["Id"], power_state, timeout, current_state
+                )
+            )
+        time.sleep(interval)
+
+
+def reset_systems(
+    contexts,
+    reset_type,
+    system_ids=None,
+    wave_size=None,
+    wave_delay=0,
+    max_workers=DEFAULT_MAX_WORKERS,
+    max_failures=None,
+    verify=True,
+    verify_timeout=300,
+    on_result=None,
+):
+    """
+    Performs a reset of the systems of a set of Redfish services in waves; this allows for staggering power
+    operations so a large number of systems do not draw inrush current at the same time
+
+    Args:
+        contexts: A dictionary of Redfish client objects with open sessions, keyed by host
+        reset_type: The type of reset to perform
+        system_ids: The systems to reset on each host; if None, all systems of each host are reset
+        wave_size: The number of hosts in each wave; if None, all hosts are in a single wave
+        wave_delay: The time, in seconds, to wait between waves
+        max_workers: The maximum number of hosts to reset at the same time within a wave
+        max_failures: The number of failed hosts allowed before the remaining waves are skipped; if None, all waves
+                      are performed
+        verify: Indicates if the power state of each system is to be polled until it reaches the state expected for
+                the reset type before the host is considered complete; for reset types that return the system to the
+                same power state, the system also needs to report a new LastResetTime
+        verify_timeout: The maximum time, in seconds, to wait for each system to reach the expected power state
+        on_result: A function called from the calling thread as each host completes; it's called with the host and
+                   its result dictionary
+
+    Returns:
+        A dictionary of results keyed by host, as produced by run_on_hosts; the 'Result' of each host is a dictionary
+        of the power state of each system reset, keyed by system identifier; the power state is None if it was not
+        verified, such as when the system does not report LastResetTime for a reset type that restarts the system
+    """
+
+    if reset_type not in reset_types:
+        raise ValueError("{} is not an allowable reset type ({})".format(reset_type, ", ".join(reset_types)))
+    expected_power_state = None
+    if verify:
+        expected_power_state = reset_power_states.get(reset_type)
+
+    def reset_host(host, context):
+        power_states = {}
+        for system_id in system_ids or get_system_ids(context):
+            last_reset_time = None
+            if expected_power_state is not None and reset_type in reset_restart_types:
+                # The system ends in the power state it's already in; only a new reset time shows it restarted
+                last_reset_time = get_system(context, system_id).dict.get("LastResetTime")
+            response = system_reset(context, system_id, reset_type)
+            response = poll_task_monitor(context, response, silent=True)
+            verify_response(response)
+            power_states[system_id] = None
+            if expected_power_state is None or (reset_type in reset_restart_types and last_reset_time is None):
+                continue
+            system = wait_for_system_power_state(
+                context, expected_power_state, system_id, verify_timeout, last_reset_time=last_reset_time
+            )
+            power_states[system_id] = system.dict["PowerState"]
+        return power_states
+
+    return run_in_waves(
+        contexts,
+        reset_host,
+        wave_size=wave_size,
+        wave_delay=wave_delay,
+        max_workers=max_workers,
+        max_failures=max_failures,
+        on_result=on_result,
+    )
+
+
 def get_virtual_media(context, system_id=None):
     """
     Finds the system matching the given ID and gets its virtual media
@@ -650,13 +886,14 @@ def get_virtual_media_collection(context, system_id=None):
     return context.get(virtual_media_uri)
 
 
-def get_system_bios(context, system_id=None):
+def get_system_bios(context, system_id=None, system=None):
     """
     Finds a system matching the given ID and gets the BIOS settings
 
     Args:
         context: The Redfish client object with an open session
         system_id: The system to locate; if None, perform on the only system
+        system: Existing system resource to inspect for BIOS settings
 
     Returns:
         A dictionary of the current BIOS attributes
@@ -664,7 +901,8 @@ def get_system_bios(context, system_id=None):
     """
 
     # Locate the system
-    system = get_system(context, system_id)
+    if system is None:
+        system = get_system(context, system_id)
 
     # Get the Bios resource
     if "Bios" not in system.dict:
@@ -676,7 +914,7 @@ def get_system_bios(context, system_id=None):
     # Get the Settings object if present
     if "@Redfish.Settings" in bios.dict:
         try:
-            bios_settings = get_system_bios_settings(context, bios, system.dict["Id"])
+            bios_settings = get_system_bios_settings(context, bios, system.dict["Id"], system)
             future_settings = bios_settings.dict["Attributes"]
         except Exception:
             if config.__workarounds__:
@@ -714,7 +952,7 @@ def set_system_bios(context, settings, system_id=None):
     bios = context.get(bios_uri)
     etag = bios.getheader("ETag")
     if "@Redfish.Settings" in bios.dict:
-        bios_settings = get_system_bios_settings(context, bios, system.dict["Id"])
+        bios_settings = get_system_bios_settings(context, bios, system.dict["Id"], system)
         bios_uri = bios_settings.dict["@odata.id"]
         etag = bios_settings.getheader("ETag")
 
@@ -728,7 +966,184 @@ def set_system_bios(context, settings, system_id=None):
     return response
 
 
-def get_system_bios_settings(context, bios, system_id):
+def bios_value_differs(value, new_value):
+    """
+    Checks if two BIOS attribute values differ
+
+    Args:
+        value: The value of the attribute
+        new_value: The value to compare against
+
+    Returns:
+        True if the values differ, False otherwise
+    """
+
+    # Booleans compare equal to 0 and 1; these are different values for BIOS attributes
+    return isinstance(value, bool) != isinstance(new_value, bool) or value != new_value
+
+
+def get_system_bios_changes(current_settings, future_settings, settings):
+    """
+    Compares a desired set of BIOS attributes against the settings of a system
+
+    Args:
+        current_settings: A dictionary of the current BIOS attributes
+        future_settings: A dictionary of the BIOS attributes on the next reset
+        settings: A dictionary of the desired BIOS attributes
+
+    Returns:
+        A dictionary of the desired attributes that differ from the attributes on the next reset
+        A boolean indicating if the system needs to be reset for the desired attributes to take effect
+    """
+
+    missing = object()
+    changes = {}
+    reset_required = False
+    for name, new_value in settings.items():
+        # Services may only list the attributes being changed in the future settings
+        current_value = current_settings.get(name, missing)
+        if bios_value_differs(future_settings.get(name, current_value), new_value):
+            changes[name] = new_value
+        if bios_value_differs(current_value, new_value):
+            reset_required = True
+    return changes, reset_required
+
+
+def apply_system_bios(context, settings, system_id=None, current_settings=None, future_settings=None):
+    """
+    Finds a system matching the given ID and sets only the BIOS attributes that differ from the desired settings
+
+    Args:
+        context: The Redfish client object with an open session
+        settings: A dictionary of the desired BIOS attributes
+        system_id: The system to locate; if None, perform on the only system
+        current_settings: A dictionary of the current BIOS attributes; if None, the attributes are read from the system
+        future_settings: A dictionary of the BIOS attributes on the next reset; if None, the attributes are read from
+                         the system
+
+    Returns:
+        A dictionary containing the attributes that were set in 'Changes', the response of the PATCH in 'Response'
+        (None if no attributes needed to be set), and whether the system needs to be reset for the desired attributes
+        to take effect in 'ResetRequired'
+    """
+
+    if current_settings is None or future_settings is None:
+        current_settings, future_settings = get_system_bios(context, system_id)
+
+    changes, reset_required = get_system_bios_changes(current_settings, future_settings, settings)
+    response = None
+    if changes:
+        response = set_system_bios(context, changes, system_id)
+    return {"Changes": changes, "Response": response, "ResetRequired": reset_required}
+
+
+def get_systems_bios_compliance(contexts, baselines, system_ids=None, max_workers=DEFAULT_MAX_WORKERS, on_result=None):
+    """
+    Compares the BIOS settings of the systems of a set of Redfish services against baselines for each system model
+
+    Args:
+        contexts: A dictionary of Redfish client objects with open sessions, keyed by host
+        baselines: A dictionary of the desired BIOS attributes keyed by system model; the '*' entry, if present, is
+                   used for models without a baseline
+        system_ids: The systems to check on each host; if None, all systems of each host are checked
+        max_workers: The maximum number of hosts to check at the same time
+        on_result: A function called from the calling thread as each host completes; it's called with the host and
+                   its result dictionary
+
+    Returns:
+        A dictionary of results keyed by host, as produced by run_on_hosts; the 'Result' of each host is a dictionary
+        keyed by system identifier; each system contains its 'Model', the 'Baseline' used, and the 'Deviations' from
+        the baseline; the baseline and deviations are None if there is no baseline for the model
+    """
+
+    def check_host(host, context):
+        systems = {}
+        for system_id in system_ids or get_system_ids(context):
+            system = get_system(context, system_id)
+            model = system.dict.get("Model")
+            baseline = model if model in baselines else "*" if "*" in baselines else None
+            systems[system_id] = {"Model": model, "Baseline": baseline, "Deviations": None}
+            if baseline is None:
+                continue
+            current_settings, future_settings = get_system_bios(context, system_id, system)
+            systems[system_id]["Deviations"] = get_system_bios_deviations(
+                current_settings, future_settings, baselines[baseline]
+            )
+        return systems
+
+    return run_on_hosts(contexts, check_host, max_workers=max_workers, on_result=on_result)
+
+
+def get_system_bios_deviations(current_settings, future_settings, baseline):
+    """
+    Compares the BIOS settings of a system against a baseline
+
+    Args:
+        current_settings: A dictionary of the current BIOS attributes
+        future_settings: A dictionary of the BIOS attributes on the next reset
+        baseline: A dictionary of the desired BIOS attributes
+
+    Returns:
+        A dictionary of the attributes where the current value differs from the baseline; each attribute contains the
+        'Expected' value, the 'Current' value (None if not present), and the 'Pending' value on the next reset
+    """
+
+    missing = object()
+    deviations = {}
+    for name, expected in baseline.items():
+        current = current_settings.get(name, missing)
+        if bios_value_differs(current, expected):
+            # Services may only list the attributes being changed in the future settings
+            current = None if current is missing else current
+            deviations[name] = {"Expected": expected, "Current": current, "Pending": future_settings.get(name, current)}
+    return deviations
+
+
+def get_bios_compliance_report(results):
+    """
+    Builds a report from the results of a BIOS compliance scan
+
+    Args:
+        results: The results of get_systems_bios_compliance
+
+    Returns:
+        A dictionary containing the 'Summary' of the scan, with counts of hosts and systems and the number of systems
+        deviating for each attribute, and the 'Hosts' with the systems of each host that failed or deviate from their
+        baseline
+    """
+
+    summary = {
+        "Hosts": len(results),
+        "FailedHosts": 0,
+        "Systems": 0,
+        "CompliantSystems": 0,
+        "NonCompliantSystems": 0,
+        "SystemsWithoutBaseline": 0,
+        "Attributes": {},
+    }
+    hosts = {}
+    for host, result in results.items():
+        if result["Error"] is not None:
+            summary["FailedHosts"] += 1
+            hosts[host] = {"Error": str(result["Error"])}
+            continue
+        for system_id, system in result["Result"].items():
+            summary["Systems"] += 1
+            if system["Deviations"] is None:
+                summary["SystemsWithoutBaseline"] += 1
+            elif system["Deviations"]:
+                summary["NonCompliantSystems"] += 1
+                for name in system["Deviations"]:
+                    summary["Attributes"][name] = summary["Attributes"].get(name, 0) + 1
+            else:
+                summary["CompliantSystems"] += 1
+                continue
+            hosts.setdefault(host, {"Systems": {}})["Systems"][system_id] = system
+    summary["Attributes"] = dict(sorted(summary["Attributes"].items(), key=lambda item: (-item[1], item[0])))
+    return {"Summary": summary, "Hosts": hosts}
+
+
+def get_system_bios_settings(context, bios, system_id, system=None):
     """
     Gets the settings resource for BIOS
 
@@ -736,6 +1151,8 @@ def get_system_bios_settings(context, bios, system_id):
         context: The Redfish client object with an open session
         bios: The BIOS resource
         system_id: The system identifier
+        system: The system resource; used to reuse the outcome of workarounds for other systems of the same vendor,
+                model, and firmware
 
     Returns:
         The Settings resource for BIOS
@@ -750,11 +1167,19 @@ def get_system_bios_settings(context, bios, system_id):
                     system_id
                 )
             )
-            settings_uris = ["Settings", "SD"]
-            for setting_ext in settings_uris:
+            fingerprint = None
+            if system is not None:
+                fingerprint = get_system_fingerprint(system)
+            bios_settings = None
+            statuses = []
+            found_ext = None
+            for setting_ext in get_settings_paths(fingerprint, "BiosSettingsPath"):
                 bios_settings = context.get(bios.dict["@odata.id"] + "/" + setting_ext)
+                statuses.append(bios_settings.status)
                 if bios_settings.status == 200:
+                    found_ext = setting_ext
                     break
+            set_settings_path(fingerprint, "BiosSettingsPath", found_ext, statuses)
             try:
                 verify_response(bios_settings)
             except Exception:
@@ -12,11 +12,37 @@ Brief : This file contains the definitions and functionalities for interacting
         with Tasks for a given Redfish service
 """
 
+import heapq
+import itertools
+import json
+import socket
 import sys
+import threading
 import time
+import weakref
+from concurrent.futures import Future
+from .event_service import get_event_service
+from .streams import send_request
 
+# Longest time, in seconds, to wait between polls of a task monitor
+DEFAULT_MAX_POLL_INTERVAL = 30
 
-def poll_task_monitor(context, response, silent=False):
+# Time, in seconds, between polls of a task monitor while task events are being received from the service; polling
+# continues at this rate in case an event is lost
+DEFAULT_EVENT_POLL_INTERVAL = 60
+
+# Messages from the Task Event message registry that indicate a task is no longer running
+TASK_COMPLETION_MESSAGES = ["TaskCompletedOK", "TaskCompletedWarning", "TaskAborted", "TaskCancelled", "TaskRemoved"]
+
+# Number of consecutive failures to connect to an SSE stream before falling back to polling
+SSE_MAX_CONNECT_FAILURES = 5
+
+# Task event listeners for each Redfish client object; None is stored for services without SSE support
+task_event_listeners = weakref.WeakKeyDictionary()
+task_event_listeners_lock = threading.Lock()
+
+
+def poll_task_monitor(context, response, silent=False, max_interval=DEFAULT_MAX_POLL_INTERVAL, use_events=False):
     """
     Monitors a task monitor until it's complete and prints out progress
     NOTE: This call will block until the task is complete
@@ -25,6 +51,10 @@ def poll_task_monitor(context, response, silent=False):
         context: The Redfish client object with an open session
         response: The initial response from the operation that produced the task
         silent: Indicates if the task progress is to be hidden
+        max_interval: The longest time, in seconds, to wait between polls; a longer Retry-After time requested by the
+                      service is still honored
+        use_events: Indicates if task completion events are to be received from the service's SSE stream so the
+                    task monitor is polled as soon as the task finishes; polling is used if SSE is not supported
 
     Returns:
         The final response of the request
@@ -34,39 +64,665 @@ def poll_task_monitor(context, response, silent=False):
     if not response.is_processing:
         return response
 
+    # Listen for the completion of the task if requested
+    task = {"Response": response, "Monitor": response}
+    woken = threading.Event()
+    listener = None
+    if use_events:
+        listener = get_task_event_listener(context)
+    if listener is not None:
+        listener_handle = listener.register(get_task_uris(response), woken.set)
+
     # Poll the task until completion
-    task_monitor = response
-    while task_monitor.is_processing:
-        # Print the progress
-        if silent is False:
-            task_state = None
-            task_percent = None
-            try:
-                task_state = task_monitor.dict.get("TaskState", None)
-                task_percent = task_monitor.dict.get("PercentComplete", None)
-            except Exception:
-                # 202 responses are allowed to not have a response body
-                pass
-            if task_state is None:
-                task_state = "Running"
-            if task_percent is None:
-                progress_str = "Task is {}\r".format(task_state)
+    try:
+        while task["Monitor"].is_processing:
+            retry_time = update_task_timing(task, max_interval, listener is not None and listener.connected)
+
+            # Print the progress
+            if silent is False:
+                task_state, task_percent = get_task_progress(task["Monitor"])
+                if task_percent is None:
+                    progress_str = "Task is {}".format(task_state)
+                else:
+                    progress_str = "Task is {}: {}% complete".format(task_state, task_percent)
+                if task["Remaining"] is not None:
+                    progress_str += " (about {} remaining)".format(format_duration(task["Remaining"]))
+                sys.stdout.write("\x1b[2K")
+                sys.stdout.write(progress_str + "\r")
+                sys.stdout.flush()
+
+            # Sleep for the requested time or until a task event arrives
+            if listener is None:
+                time.sleep(retry_time)
             else:
-                progress_str = "Task is {}: {}% complete\r".format(task_state, task_percent)
-            sys.stdout.write("\x1b[2K")
-            sys.stdout.write(progress_str)
-            sys.stdout.flush()
-
-        # Sleep for the requested time
-        retry_time = response.retry_after
-        if retry_time is None:
-            retry_time = 1
-        time.sleep(retry_time)
-
-        # Check the monitor for an update
-        task_monitor = response.monitor(context)
+                woken.wait(retry_time)
+                woken.clear()
+
+            # Check the monitor for an update
+            task["Monitor"] = response.monitor(context)
+    finally:
+        if listener is not None:
+            listener.unregister(listener_handle)
     if silent is False:
         sys.stdout.write("\x1b[2K")
         print("Task is Done!")
 
-    return task_monitor
+    return task["Monitor"]
+
+
+def get_task_progress(task_monitor):
+    """
+    Gets the state and progress of a task from a task monitor response
+
+    Args:
+        task_monitor: The response from the task monitor
+
+    Returns:
+        The state of the task; 'Running' if not reported
+        The percentage of the task that is complete; None if not reported
+    """
+
+    task_state = None
+    task_percent = None
+    try:
+        task_state = task_monitor.dict.get("TaskState", None)
+        task_percent = task_monitor.dict.get("PercentComplete", None)
+    except Exception:
+        # 202 responses are allowed to not have a response body
+        pass
+    if task_state is None:
+        task_state = "Running"
+    return task_state, task_percent
+
+
+class TaskScheduler:
+    """
+    Monitors many task monitors from a single thread; each task monitor is polled again once the time requested by
+    its latest Retry-After header has elapsed
+    """
+
+    def __init__(self, progress_callback=None, max_interval=DEFAULT_MAX_POLL_INTERVAL, use_events=False):
+        """
+        Constructor for the task scheduler
+
+        Args:
+            progress_callback: A function called each time a task monitor is polled; it's called with the URI of the
+                               task monitor, the state of the task, and the percentage of the task that is complete
+            max_interval: The longest time, in seconds, to wait between polls of a task monitor; a longer Retry-After
+                          time requested by the service is still honored
+            use_events: Indicates if task completion events are to be received from the SSE stream of each service so
+                        task monitors are polled as soon as their tasks finish; polling is used for services without
+                        SSE support
+        """
+
+        self._progress_callback = progress_callback
+        self._max_interval = max_interval
+        self._use_events = use_events
+        self._queue = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def add(self, context, response, progress_callback=None):
+        """
+        Adds a task monitor to the scheduler
+
+        Args:
+            context: The Redfish client object with an open session
+            response: The initial response from the operation that produced the task
+            progress_callback: A function to call for this task in place of the scheduler's progress callback
+
+        Returns:
+            A concurrent.futures.Future object that is resolved with the final response of the request
+        """
+
+        future = Future()
+
+        # No task was produced; the existing response is the final response
+        if not response.is_processing:
+            future.set_result(response)
+            return future
+
+        task = {
+            "Context": context,
+            "Response": response,
+            "Monitor": response,
+            "Future": future,
+            "ProgressCallback": progress_callback or self._progress_callback,
+            "Listener": None,
+            "Woken": False,
+            "Entry": None,
+        }
+        if self._use_events:
+            task["Listener"] = get_task_event_listener(context)
+        if task["Listener"] is not None:
+            task["ListenerHandle"] = task["Listener"].register(get_task_uris(response), lambda: self._wake(task))
+        with self._condition:
+            self._push(task, time.monotonic() + update_task_timing(task, self._max_interval))
+        return future
+
+    def run(self):
+        """
+        Polls task monitors from the calling thread until all tasks are complete or the scheduler is stopped
+        """
+
+        while True:
+            with self._condition:
+                # Wait for the next task monitor to be due
+                task = None
+                while not self._stopped and task is None:
+                    if not self._queue:
+                        if self._thread is not threading.current_thread():
+                            # Called directly; nothing left to monitor
+                            return
+                        self._condition.wait()
+                        continue
+                    delay = self._queue[0][0] - time.monotonic()
+                    if delay > 0:
+                        self._condition.wait(delay)
+                        continue
+                    due, sequence, task = heapq.heappop(self._queue)
+                    if task["Entry"] != sequence:
+                        # Replaced by a newer entry when the task was woken
+                        task = None
+                if self._stopped:
+                    return
+                task["Entry"] = None
+                task["Woken"] = False
+            if task["Future"].cancelled():
+                # The caller is no longer interested in the task
+                release_task(task)
+                continue
+
+            # Check the monitor for an update outside of the lock so other threads can add tasks
+            try:
+                task["Monitor"] = task["Response"].monitor(task["Context"])
+            except Exception as e:
+                release_task(task)
+                set_future(task["Future"], exception=e)
+                continue
+            if not task["Monitor"].is_processing:
+                release_task(task)
+                set_future(task["Future"], result=task["Monitor"])
+                continue
+            retry_time = update_task_timing(
+                task, self._max_interval, task["Listener"] is not None and task["Listener"].connected
+            )
+            if task["ProgressCallback"] is not None:
+                task_state, task_percent = get_task_progress(task["Monitor"])
+                try:
+                    task["ProgressCallback"](task["Response"].task_location, task_state, task_percent)
+                except Exception:
+                    # Problems with reporting progress do not stop the monitoring
+                    pass
+            with self._condition:
+                if task["Woken"]:
+                    # A task event arrived while the task monitor was being polled
+                    retry_time = 0
+                self._push(task, time.monotonic() + retry_time)
+
+    def start(self):
+        """
+        Starts a background thread that polls task monitors as they're added until the scheduler is stopped
+        """
+
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self.run, name="TaskScheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stops monitoring tasks; tasks not yet complete are cancelled
+        """
+
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+            tasks = [entry[2] for entry in self._queue if entry[2]["Entry"] == entry[1]]
+            self._queue = []
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        for task in tasks:
+            release_task(task)
+            task["Future"].cancel()
+
+    def _wake(self, task):
+        """
+        Schedules a task monitor to be polled immediately; this is called when a task event is received
+
+        Args:
+            task: The task information tracked by the scheduler
+        """
+
+        with self._condition:
+            if task["Entry"] is None:
+                # The task monitor is being polled; it's scheduled again as soon as the poll completes
+                task["Woken"] = True
+            else:
+                # Queue a new entry that's due now; the existing entry is skipped when it comes up
+                self._push(task, time.monotonic())
+
+    def _push(self, task, due):
+        """
+        Queues a task monitor to be polled; the caller is expected to hold the condition
+
+        Args:
+            task: The task information tracked by the scheduler
+            due: The time, from time.monotonic, the task monitor is to be polled
+        """
+
+        task["Entry"] = next(self._sequence)
+        heapq.heappush(self._queue, (due, task["Entry"], task))
+        self._condition.notify()
+
+    def __len__(self):
+        with self._condition:
+            return sum(1 for entry in self._queue if entry[2]["Entry"] == entry[1])
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.stop()
+
+
+class TaskEventListener:
+    """
+    Receives task events from the SSE stream of a Redfish service and wakes the callers waiting on the tasks; one
+    listener is shared by all of the tasks of a session
+    """
+
+    def __init__(self, context, sse_uri):
+        """
+        Constructor for the task event listener; the SSE stream is read from a background thread
+
+        Args:
+            context: The Redfish client object with an open session
+            sse_uri: The URI of the SSE stream of the service
+        """
+
+        self.connected = False
+        # The listener closes itself once the client object is no longer used, rather than keeping it alive
+        self._context = weakref.ref(context, lambda ref: self.close())
+        self._sse_uri = sse_uri
+        self._lock = threading.Lock()
+        self._waiters = {}
+        self._handles = itertools.count()
+        self._closed = False
+        self._response = None
+        self._thread = threading.Thread(target=self._run, name="TaskEventListener", daemon=True)
+        self._thread.start()
+
+    def register(self, task_uris, callback):
+        """
+        Registers a callback for the completion of a task
+
+        Args:
+            task_uris: The URIs of the task and its task monitor
+            callback: The function to call, without arguments, when a completion event for the task is received or
+                      when events may have been missed
+
+        Returns:
+            A handle for unregistering the callback
+        """
+
+        task_ids = set(uri.rstrip("/").split("/")[-1] for uri in task_uris)
+        with self._lock:
+            handle = next(self._handles)
+            self._waiters[handle] = (task_uris, task_ids, callback)
+        return handle
+
+    def unregister(self, handle):
+        """
+        Unregisters a callback
+
+        Args:
+            handle: The handle returned when the callback was registered
+        """
+
+        with self._lock:
+            self._waiters.pop(handle, None)
+
+    def close(self):
+        """
+        Stops the listener and closes its SSE stream
+        """
+
+        with self._lock:
+            self._closed = True
+            response = self._response
+            self._response = None
+        if response is not None:
+            # Shutting down the connection ends the read in the background thread, which then closes the stream; the
+            # stream itself can't be closed here while the background thread is reading it
+            try:
+                response.raw.connection.sock.shutdown(socket.SHUT_RDWR)
+            except Exception:
+                pass
+
+        # Forget the listener so the next task for the session creates a new one
+        context = self._context()
+        if context is not None:
+            with task_event_listeners_lock:
+                if task_event_listeners.get(context) is self:
+                    del task_event_listeners[context]
+
+    def _notify(self, task_uri=None, task_id=None):
+        """
+        Calls the callbacks for a task, or all callbacks if no task is given
+
+        Args:
+            task_uri: The URI of the task that finished
+            task_id: The identifier of the task that finished
+        """
+
+        with self._lock:
+            callbacks = [
+                callback
+                for task_uris, task_ids, callback in self._waiters.values()
+                if (task_uri is None and task_id is None) or task_uri in task_uris or task_id in task_ids
+            ]
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def _run(self):
+        """
+        Reads the SSE stream until the listener is closed; the stream is reopened if it drops
+        """
+
+        # Limit the stream to task events; not all services support filtering
+        sse_filter = "?$filter=RegistryPrefix%20eq%20TaskEvent"
+        failures = 0
+        while not self._closed and failures < SSE_MAX_CONNECT_FAILURES:
+            context = self._context()
+            if context is None:
+                break
+            try:
+                # The stream stays open indefinitely between events; only the connection itself is timed
+                response = send_request(
+                    context,
+                    "GET",
+                    self._sse_uri + sse_filter,
+                    headers={"Accept": "text/event-stream"},
+                    stream=True,
+                    timeout=(30, None),
+                )
+                context = None
+                with self._lock:
+                    if self._closed:
+                        response.close()
+                        break
+                    self._response = response
+                with response:
+                    if response.status_code in [400, 501] and sse_filter:
+                        sse_filter = ""
+                        continue
+                    if response.status_code in [401, 403, 404, 405]:
+                        # The session is no longer valid or the service does not allow the stream
+                        break
+                    if response.status_code >= 400:
+                        failures += 1
+                    else:
+                        failures = 0
+                        self.connected = True
+                        # Events sent while the stream was not open are lost; have every waiter poll
+                        self._notify()
+                        for event in read_sse_events(response):
+                            if self._closed:
+                                break
+                            self._handle_event(event)
+            except Exception:
+                failures += 1
+            finally:
+                self.connected = False
+                context = None
+                with self._lock:
+                    self._response = None
+            if not self._closed:
+                time.sleep(min(2**failures, DEFAULT_MAX_POLL_INTERVAL))
+
+        # Waiters go back to polling
+        self.connected = False
+        self._notify()
+
+    def _handle_event(self, event):
+        """
+        Wakes the callers waiting on the tasks that finished according to an event
+
+        Args:
+            event: The payload of the event
+        """
+
+        for record in event.get("Events", []):
+            message_id = record.get("MessageId", "").split(".")
+            if message_id[0] != "TaskEvent" or message_id[-1] not in TASK_COMPLETION_MESSAGES:
+                continue
+            task_uri = record.get("OriginOfCondition")
+            if isinstance(task_uri, dict):
+                task_uri = task_uri.get("@odata.id")
+            if task_uri is not None:
+                task_uri = task_uri.rstrip("/")
+            task_id = None
+            if record.get("MessageArgs"):
+                task_id = str(record["MessageArgs"][0])
+            if task_uri is not None or task_id is not None:
+                self._notify(task_uri, task_id)
+
+
+def get_task_event_listener(context):
+    """
+    Gets the task event listener for a session; the listener is created the first time it's requested
+
+    Args:
+        context: The Redfish client object with an open session
+
+    Returns:
+        The TaskEventListener object for the session; None if the service does not support SSE
+    """
+
+    with task_event_listeners_lock:
+        if context in task_event_listeners:
+            return task_event_listeners[context]
+
+    # Find the SSE stream of the service
+    listener = None
+    try:
+        event_service = get_event_service(context)
+        if event_service.get("ServiceEnabled", True) and event_service.get("ServerSentEventUri"):
+            listener = TaskEventListener(context, event_service["ServerSentEventUri"])
+    except Exception:
+        pass
+
+    # Another thread may have created a listener for the session in the meantime
+    with task_event_listeners_lock:
+        existing = task_event_listeners.setdefault(context, listener)
+    if listener is not None and existing is not listener:
+        listener.close()
+    return existing
+
+
+def close_task_event_listener(context):
+    """
+    Closes the task event listener for a session, if any
+
+    Args:
+        context: The Redfish client object with an open session
+    """
+
+    with task_event_listeners_lock:
+        listener = task_event_listeners.pop(context, None)
+    if listener is not None:
+        listener.close()
+
+
+def get_task_uris(response):
+    """
+    Finds the URIs that identify the task that was produced by an operation
+
+    Args:
+        response: The initial response from the operation that produced the task
+
+    Returns:
+        A set of URIs for the task and its task monitor
+    """
+
+    task_uris = set()
+    task_location = response.task_location
+    if task_location:
+        task_location = task_location.rstrip("/")
+        task_uris.add(task_location)
+        if task_location.endswith("/Monitor"):
+            task_uris.add(task_location[: -len("/Monitor")])
+    try:
+        # The response may contain the task resource
+        task_uris.add(response.dict["@odata.id"].rstrip("/"))
+    except Exception:
+        pass
+    return task_uris
+
+
+def read_sse_events(response):
+    """
+    Reads the events from an SSE stream
+
+    Args:
+        response: The requests.Response object of the stream
+
+    Returns:
+        A generator of the payloads of the events
+    """
+
+    data = []
+    # Lines are read as they arrive; buffering larger blocks would delay events
+    for line in response.iter_lines(chunk_size=1):
+        line = line.decode("utf-8", errors="replace")
+        if line == "":
+            # A blank line ends an event
+            if data:
+                try:
+                    yield json.loads("\n".join(data))
+                except ValueError:
+                    pass
+            data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip(" "))
+
+
+def update_task_timing(task, max_interval=DEFAULT_MAX_POLL_INTERVAL, event_driven=False):
+    """
+    Determines how long to wait before polling a task monitor again and estimates the time remaining for the task
+    NOTE: This is to be called each time the task monitor is polled
+
+    Args:
+        task: A dictionary containing the initial 'Response' of the operation and the latest 'Monitor' response; the
+              polling state of the task is also kept in the dictionary, and 'Remaining' is set to the estimated
+              number of seconds remaining for the task, or None if it cannot be estimated
+        max_interval: The longest time, in seconds, to wait between polls
+        event_driven: Indicates if task events from the service will signal the completion of the task
+
+    Returns:
+        The number of seconds to wait
+    """
+
+    now = time.monotonic()
+    first_poll = task.get("Interval") is None
+    task_state, task_percent = get_task_progress(task["Monitor"])
+
+    # Prefer the latest Retry-After header from the service
+    retry_time = None
+    for response in [task["Monitor"], task["Response"]]:
+        try:
+            retry_time = response.retry_after
+        except Exception:
+            retry_time = None
+        if retry_time is not None:
+            break
+    # Wait at least a second so a Retry-After of 0 doesn't poll without pause and the back off can grow
+    if retry_time is None or retry_time < 1:
+        retry_time = 1
+
+    # Back off exponentially for as long as the task runs; progress only shortens the wait near the expected finish
+    interval = task.get("Interval")
+    if interval is None:
+        interval = retry_time
+    else:
+        interval = max(retry_time, min(interval * 2, max_interval))
+
+    # Estimate the time remaining from the rate of progress since the first progress report
+    remaining = None
+    if task_percent is not None:
+        if task.get("ProgressStart") is None or task_percent < task["ProgressStart"][1]:
+            task["ProgressStart"] = (now, task_percent)
+        start_time, start_percent = task["ProgressStart"]
+        if task_percent > start_percent and now > start_time:
+            rate = (task_percent - start_percent) / (now - start_time)
+            remaining = max(100 - task_percent, 0) / rate
+            # Avoid backing off past the time the task is expected to finish
+            interval = max(retry_time, min(interval, remaining))
+
+    task["Interval"] = interval
+    task["Percent"] = task_percent
+    task["Remaining"] = remaining
+    if event_driven and not first_poll:
+        # The task is polled once in case it finished before events were received; after that events wake the poll
+        return max(interval, DEFAULT_EVENT_POLL_INTERVAL)
+    return interval
+
+
+def format_duration(seconds):
+    """
+    Formats a number of seconds for display
+
+    Args:
+        seconds: The number of seconds
+
+    Returns:
+        A string containing the duration, such as '1h 2m', '5m 30s', or '45s'
+    """
+
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return "{}h {}m".format(seconds // 3600, (seconds % 3600) // 60)
+    if seconds >= 60:
+        return "{}m {}s".format(seconds // 60, seconds % 60)
+    return "{}s".format(seconds)
+
+
+def release_task(task):
+    """
+    Stops listening for events for a task tracked by a task scheduler
+
+    Args:
+        task: The task information tracked by the task scheduler
+    """
+
+    if task["Listener"] is not None:
+        task["Listener"].unregister(task["ListenerHandle"])
+        task["Listener"] = None
+
+
+def set_future(future, result=None, exception=None):
+    """
+    Resolves a future unless the caller already cancelled it
+
+    Args:
+        future: The concurrent.futures.Future object to resolve
+        result: The result to apply if no exception is given
+        exception: The exception to apply
+    """
+
+    if future.set_running_or_notify_cancel():
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
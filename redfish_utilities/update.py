@@ -12,11 +12,27 @@ Brief : This file contains the definitions and functionalities for interacting
         with the UpdateService for a given Redfish service
 """
 
+import csv
 import json
 import os
 import errno
+import threading
+import time
+from .action_info import get_action_info
 from .collections import get_collection_members
+from .collections import get_expand_query
+from .collections import get_protocol_features
+from .collections import walk_collection
+from .fleet import DEFAULT_MAX_WORKERS
+from .fleet import run_in_waves
+from .fleet import run_on_hosts
+from .image_server import ImageServer
 from .messages import verify_response
+from .streams import TransferRateLimiter
+from .streams import send_multipart_request
+from .tasks import TaskScheduler
+from .tasks import get_task_progress
+from .upload_stats import get_upload_timeouts
 from enum import Enum
 
 
@@ -36,6 +52,14 @@ class RedfishFirmwareInventoryNotFoundError(Exception):
     pass
 
 
+class RedfishUpdateFailedError(Exception):
+    """
+    Raised when the task of an update does not complete successfully
+    """
+
+    pass
+
+
 class operation_apply_times(Enum):
     """
     Values for operation apply time settings
@@ -99,8 +123,8 @@ def get_simple_update_info(context):
                 param["AllowableValues"] = simple_update_action[param["Name"] + "@Redfish.AllowableValues"]
     else:
         # Get the action info and its parameter listing
-        action_info = context.get(simple_update_action["@Redfish.ActionInfo"])
-        simple_update_parameters = action_info.dict["Parameters"]
+        action_info = get_action_info(context, simple_update_action["@Redfish.ActionInfo"])
+        simple_update_parameters = action_info["Parameters"]
 
     return simple_update_uri, simple_update_parameters
 
@@ -164,39 +188,60 @@ def get_size(file_path, unit="bytes"):
         return round(size, 3)
 
 
-def multipart_push_update(context, image_path, targets=None, timeout=None, apply_time=None):
+def multipart_push_update(
+    context,
+    image_path,
+    targets=None,
+    timeout=None,
+    apply_time=None,
+    progress_callback=None,
+    stats_key=None,
+    throttled=False,
+):
     """
-    Performs an HTTP Multipart push update request
+    Performs an HTTP Multipart push update request; the image is read from the file as it's sent
 
     Args:
         context: The Redfish client object with an open session
         image_path: The filepath to the image for the update
         targets: The targets receiving the update
-        timeout: The timeout to apply to the update
+        timeout: The timeout to apply to the update; if None, the timeouts are determined from the throughput of
+                 earlier uploads, and a stalled upload is stopped once a write is blocked for
+                 config.__upload_stall_timeout__ seconds
         apply_time: The apply time for the update
+        progress_callback: A function called as the image is sent; it's called with the number of bytes sent and the
+                           total size of the request
+        stats_key: The key to record the upload stats under and to tune the timeouts from, such as a model of BMC;
+                   if None, the address of the service is used
+        throttled: Indicates if the upload is held back by a rate limit, such as from the progress callback; the time
+                   allowed to send the image is not limited by the throughput of earlier uploads, and the throughput
+                   of this upload is not recorded
 
     Returns:
-        The response from the request
+        The response from the request; its 'upload_stats' attribute contains the measurements of the upload, as
+        produced by record_upload
     """
 
     # Ensure the file exists
     if os.path.isfile(image_path) is False:
         raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), image_path)
 
-    # If no update is specified, determine an appropriate timeout to apply
+    # If no timeout is specified, determine appropriate timeouts from earlier uploads
+    send_timeout = None
+    if stats_key is None:
+        stats_key = context.get_base_url()
     if timeout is None:
-        """TODO: See what a 'reasonable' timeout is when accounting for slow networks
-        for now, keeping the timeout conservative (2 seconds per MB)
-        timeout = 5
-        file_size = get_size( image_path, "mb" )
-
-        if file_size >= 16:
-            timeout = math.ceil( ( 5 / 16 ) * file_size )
-        """
-        timeout = 120
-        file_size = get_size(image_path, "mb")
-        if file_size >= 60:
-            timeout = 2 * file_size
+        timeouts = get_upload_timeouts(stats_key, get_size(image_path))
+        if not throttled:
+            send_timeout = timeouts["Send"]
+        response_timeout = timeouts["Response"]
+        if response_timeout is None:
+            # No earlier uploads; keep the response timeout conservative (2 seconds per MB)
+            response_timeout = 120
+            file_size = get_size(image_path, "mb")
+            if file_size >= 60:
+                response_timeout = 2 * file_size
+        timeout = (timeouts["Stall"], response_timeout)
 
     # Get the update service
     update_service = get_update_service(context)
@@ -209,22 +254,173 @@ def multipart_push_update(context, image_path, targets=None, timeout=None, apply
         update_parameters["Targets"] = targets
     if apply_time is not None:
         update_parameters["@Redfish.OperationApplyTime"] = apply_time.value
-    body = {
-        "UpdateParameters": (None, json.dumps(update_parameters), "application/json"),
-        "UpdateFile": (image_path.split(os.path.sep)[-1], open(image_path, "rb"), "application/octet-stream"),
-    }
-
-    response = context.post(
-        update_service.dict["MultipartHttpPushUri"],
-        body=body,
-        headers={"Content-Type": "multipart/form-data"},
-        timeout=timeout,
-        max_retry=3,
-    )
+    with open(image_path, "rb") as image_file:
+        body = {
+            "UpdateParameters": (None, json.dumps(update_parameters), "application/json"),
+            "UpdateFile": (image_path.split(os.path.sep)[-1], image_file, "application/octet-stream"),
+        }
+        response = send_multipart_request(
+            context,
+            update_service.dict["MultipartHttpPushUri"],
+            body,
+            timeout=timeout,
+            max_retry=3,
+            progress_callback=progress_callback,
+            send_timeout=send_timeout,
+            stats_key=stats_key,
+            throttled=throttled,
+        )
     verify_response(response)
     return response
 
 
+def update_hosts(
+    contexts,
+    image,
+    targets=None,
+    apply_time=None,
+    timeout=None,
+    canary_size=None,
+    wave_size=None,
+    wave_delay=0,
+    max_workers=DEFAULT_MAX_WORKERS,
+    max_failures=None,
+    max_uploads=None,
+    max_bandwidth=None,
+    image_server=None,
+    on_result=None,
+    version=None,
+    software_id=None,
+):
+    """
+    Updates a set of Redfish services with an image in waves; each service is given the image with an HTTP Multipart
+    push update if it's supported and the image is a local file, otherwise with a SimpleUpdate, and the tasks of all
+    of the updates in progress are monitored from one scheduler
+
+    Args:
+        contexts: A dictionary of Redfish client objects with open sessions, keyed by host
+        image: The URI or filepath of the image
+        targets: The targets receiving the update
+        apply_time: The apply time for the update
+        timeout: The timeout to apply to pushing the image
+        canary_size: The number of hosts in the first wave; if None, the first wave is the same size as the others
+        wave_size: The number of hosts in each wave; if None, all hosts are in a single wave
+        wave_delay: The time, in seconds, to wait between waves
+        max_workers: The maximum number of hosts to update at the same time within a wave
+        max_failures: The number of failed hosts allowed before the remaining waves are skipped; if None, the
+                      remaining waves are skipped if any host fails when canary_size is given, otherwise all waves are
+                      performed
+        max_uploads: The maximum number of images to push at the same time; if None, there is no limit
+        max_bandwidth: The maximum combined rate, in bytes per second, of the images being pushed; if None, there is
+                       no limit
+        image_server: The ImageServer to host a local image for services that pull it; it's started if needed and
+                      left running for the caller to stop; if None, one is started on the default port when needed
+                      and stopped when the updates are complete
+        on_result: A function called from the calling thread as each host completes; it's called with the host and
+                   its result dictionary
+        version: The version of the image; if given, hosts where the components the image applies to are already at
+                 this version are skipped
+        software_id: The SoftwareId of the components the image applies to; if None, the components are found from
+                     the targets
+
+    Returns:
+        A dictionary of results keyed by host, as produced by run_on_hosts; the 'Result' of each host is a dictionary
+        containing the 'Method' used to give the image to the service, the time, in seconds, to push the image to the
+        service in 'UploadTime' (None for a SimpleUpdate, where the service pulls the image during its task), the time, in seconds, for the update task to complete in 'TaskTime', whether the
+        host was skipped because it's already at the version of the image in 'Skipped', and the measurements of the
+        image being pushed in 'UploadStats', as produced by record_upload (None if the image was not pushed)
+    """
+
+    local_image = os.path.isfile(image)
+    upload_slots = None
+    if max_uploads:
+        upload_slots = threading.Semaphore(max_uploads)
+    rate_limiter = None
+    if max_bandwidth:
+        rate_limiter = TransferRateLimiter(max_bandwidth)
+    server = {"ImageServer": image_server, "Owned": False}
+    server_lock = threading.Lock()
+
+    def get_image_uri(context):
+        # Start hosting the image the first time a service needs to pull it
+        with server_lock:
+            if server["ImageServer"] is None:
+                server["ImageServer"] = ImageServer()
+                server["Owned"] = True
+            server["ImageServer"].start()
+        return server["ImageServer"].get_image_uri(image, context.get_base_url())
+
+    def push_image(context):
+        sent = {"Bytes": 0}
+
+        def limit_rate(bytes_sent, total):
+            rate_limiter.consume(max(bytes_sent - sent["Bytes"], 0))
+            sent["Bytes"] = bytes_sent
+
+        if upload_slots is not None:
+            upload_slots.acquire()
+        try:
+            # Only time the upload itself; the wait for a free upload slot is not part of it
+            start = time.monotonic()
+            response = multipart_push_update(
+                context,
+                image,
+                targets=targets,
+                timeout=timeout,
+                apply_time=apply_time,
+                progress_callback=limit_rate if rate_limiter is not None else None,
+                throttled=rate_limiter is not None,
+            )
+            return response, time.monotonic() - start
+        finally:
+            if upload_slots is not None:
+                upload_slots.release()
+
+    with TaskScheduler() as scheduler:
+
+        def update_host(host, context):
+            result = {"Method": None, "UploadTime": None, "TaskTime": None, "Skipped": False, "UploadStats": None}
+            if version is not None and not is_update_needed(context, version, software_id, targets):
+                result["Skipped"] = True
+                return result
+            update_service = get_update_service(context)
+            if local_image and "MultipartHttpPushUri" in update_service.dict:
+                result["Method"] = "MultipartHttpPush"
+                response, result["UploadTime"] = push_image(context)
+                result["UploadStats"] = response.upload_stats
+            else:
+                result["Method"] = "SimpleUpdate"
+                image_uri = image
+                if local_image:
+                    image_uri = get_image_uri(context)
+                response = simple_update(context, image_uri, targets=targets, apply_time=apply_time)
+
+            # Wait for the task of the update to complete
+            start = time.monotonic()
+            response = scheduler.add(context, response).result()
+            verify_response(response)
+            task_state, task_percent = get_task_progress(response)
+            if task_state in ["Exception", "Killed", "Cancelled"]:
+                raise RedfishUpdateFailedError("Update task ended in the '{}' state".format(task_state))
+            result["TaskTime"] = time.monotonic() - start
+            return result
+
+        try:
+            return run_in_waves(
+                contexts,
+                update_host,
+                wave_size=wave_size,
+                wave_delay=wave_delay,
+                max_workers=max_workers,
+                max_failures=max_failures,
+                on_result=on_result,
+                canary_size=canary_size,
+            )
+        finally:
+            if server["Owned"]:
+                server["ImageServer"].stop()
+
+
 def get_firmware_inventory(context):
     """
     Finds the firmware inventory and returns its contents
@@ -246,6 +442,80 @@ def get_firmware_inventory(context):
     return get_collection_members(context, update_service.dict["FirmwareInventory"]["@odata.id"])
 
 
+def get_firmware_versions(context):
+    """
+    Finds the firmware inventory and returns the version of each member; the members are read with the collection if
+    the service supports the $expand query parameter, otherwise each member is read with only the properties needed
+    to identify it and its version if the service supports the $select query parameter
+
+    Args:
+        context: The Redfish client object with an open session
+
+    Returns:
+        An array of dictionaries of the firmware inventory members
+    """
+
+    # Get the update service
+    update_service = get_update_service(context)
+
+    # Check that there is a firmware inventory collection
+    if "FirmwareInventory" not in update_service.dict:
+        raise RedfishFirmwareInventoryNotFoundError("Service does not have a firmware inventory")
+
+    args = None
+    if get_protocol_features(context).get("SelectQuery", False):
+        args = {"$select": "Id,Name,Version,SoftwareId,RelatedItem"}
+    members = []
+    for member in walk_collection(
+        context, update_service.dict["FirmwareInventory"]["@odata.id"], get_expand_query(context)
+    ):
+        if not set(member) <= {"@odata.id"}:
+            # Already expanded
+            members.append(member)
+            continue
+        member_response = context.get(member["@odata.id"], args=args)
+        verify_response(member_response)
+        member_dict = member_response.dict
+        # Some services omit the identifier of the resource when $select is used
+        member_dict.setdefault("@odata.id", member["@odata.id"])
+        members.append(member_dict)
+    return members
+
+
+def is_update_needed(context, version, software_id=None, targets=None):
+    """
+    Checks if the firmware components an image applies to are already at the version of the image
+
+    Args:
+        context: The Redfish client object with an open session
+        version: The version of the image
+        software_id: The SoftwareId of the components the image applies to; if None, the components are found from
+                     the targets
+        targets: The targets receiving the update; these can be firmware inventory members or the resources they
+                 relate to
+
+    Returns:
+        True if any of the components is at a different version or no matching components are found, False otherwise
+    """
+
+    if software_id is None and not targets:
+        # Nothing to match the image against
+        return True
+
+    components = []
+    for member in get_firmware_versions(context):
+        if software_id is not None and member.get("SoftwareId") != software_id:
+            continue
+        if targets:
+            related = [item.get("@odata.id") for item in member.get("RelatedItem", [])]
+            if member["@odata.id"] not in targets and not any(uri in targets for uri in related):
+                continue
+        components.append(member)
+    if not components:
+        return True
+    return any(str(component.get("Version", "")).strip() != str(version).strip() for component in components)
+
+
 def print_software_inventory(software_list, details=False, use_id=False):
     """
     Prints the software inventory list into a table
@@ -277,6 +547,162 @@ def print_software_inventory(software_list, details=False, use_id=False):
     print("")
 
 
+def get_firmware_matrix(contexts, max_workers=DEFAULT_MAX_WORKERS, on_result=None):
+    """
+    Collects the firmware versions of a set of Redfish services concurrently and builds a matrix of the version of each
+    component on each host
+
+    Args:
+        contexts: A dictionary of Redfish client objects with open sessions, keyed by host
+        max_workers: The maximum number of hosts to read at the same time
+        on_result: A function called from the calling thread as each host completes; it's called with the host and
+                   its result dictionary
+
+    Returns:
+        A dictionary containing the sorted list of 'Components', the version of each component keyed by host and
+        component in 'Hosts', the number of hosts with each version keyed by component and version in 'Versions', and
+        the error of each host that could not be read in 'Errors'
+    """
+
+    def read_host(host, context):
+        return get_firmware_component_versions(get_firmware_versions(context))
+
+    results = run_on_hosts(contexts, read_host, max_workers=max_workers, on_result=on_result)
+
+    # Group the hosts by the version of each component
+    matrix = {"Components": [], "Hosts": {}, "Versions": {}, "Errors": {}}
+    for host, result in results.items():
+        if result["Error"] is not None:
+            matrix["Errors"][host] = str(result["Error"])
+            continue
+        matrix["Hosts"][host] = result["Result"]
+        for component, version in result["Result"].items():
+            versions = matrix["Versions"].setdefault(component, {})
+            versions[version] = versions.get(version, 0) + 1
+    matrix["Components"] = sorted(matrix["Versions"])
+    matrix["Versions"] = {
+        component: dict(sorted(matrix["Versions"][component].items(), key=lambda item: (-item[1], item[0])))
+        for component in matrix["Components"]
+    }
+    return matrix
+
+
+def get_firmware_component_versions(firmware_list):
+    """
+    Normalizes a firmware inventory into the version of each component; members are identified by 'SoftwareId', or
+    'Name' if not reported, so the same component can be compared across hosts
+
+    Args:
+        firmware_list: An array of dictionaries of the firmware inventory members
+
+    Returns:
+        A dictionary of the versions of each component; if members of the same component have different versions, the
+        versions are listed together
+    """
+
+    components = {}
+    for firmware in firmware_list:
+        component = firmware.get("SoftwareId") or firmware.get("Name") or firmware.get("Id")
+        components.setdefault(component, set()).add(str(firmware.get("Version", "")))
+    return {component: ", ".join(sorted(versions)) for component, versions in sorted(components.items())}
+
+
+def print_firmware_matrix(matrix):
+    """
+    Prints the number of hosts with each version of each component from a firmware matrix
+
+    Args:
+        matrix: The firmware matrix from get_firmware_matrix
+    """
+
+    matrix_line_format = "  {:40s} | {:30s} | {}"
+    print(matrix_line_format.format("Component", "Version", "Hosts"))
+    for component in matrix["Components"]:
+        name = component
+        for version, count in matrix["Versions"][component].items():
+            print(matrix_line_format.format(name, version, count))
+            name = ""
+        missing = len(matrix["Hosts"]) - sum(matrix["Versions"][component].values())
+        if missing:
+            print(matrix_line_format.format(name, "Not present", missing))
+    for host, error in matrix["Errors"].items():
+        print("  {}: {}".format(host, error))
+    print("")
+
+
+class FirmwareMatrixWriter:
+    """
+    Writes the firmware versions of each host to a CSV or JSON Lines file as each host is read, so the versions of a
+    large number of hosts are not held until all of them are read
+
+    The CSV file contains a row for each component of each host with the 'Host', 'Component', 'Version', and 'Error'
+    columns; the JSON Lines file contains a record for each host with the 'Host', the 'Versions' of its components
+    keyed by component, and the 'Error' if the host could not be read.
+
+    Args:
+        file_name: The name of the file to write
+        file_format: The format of the file ('csv' or 'json'); if None, it's determined from the file extension
+    """
+
+    def __init__(self, file_name, file_format=None):
+        if file_format is None:
+            file_format = "json" if os.path.splitext(file_name)[1].lower() in [".json", ".jsonl"] else "csv"
+        if file_format not in ["csv", "json"]:
+            raise ValueError("Unsupported format '{}'; must be 'csv' or 'json'".format(file_format))
+        self.file_format = file_format
+        self._file = open(file_name, "w", encoding="utf-8", newline="" if file_format == "csv" else "\n")
+        self._writer = None
+        if file_format == "csv":
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["Host", "Component", "Version", "Error"])
+
+    def write_host(self, host, versions=None, error=None):
+        """
+        Writes the firmware versions of a host
+
+        Args:
+            host: The host
+            versions: A dictionary of the version of each component of the host, keyed by component
+            error: The error reading the host; None if the host was read
+        """
+
+        if error is not None:
+            error = str(error)
+        if self._writer is None:
+            self._file.write(json.dumps({"Host": host, "Versions": versions, "Error": error}) + "\n")
+        elif error is not None or not versions:
+            self._writer.writerow([host, "", "", error or ""])
+        else:
+            for component, version in sorted(versions.items()):
+                self._writer.writerow([host, component, version, ""])
+        self._file.flush()
+
+    def write_result(self, host, result):
+        """
+        Writes the result of reading the firmware versions of a host; this can be given as the on_result function of
+        get_firmware_matrix
+
+        Args:
+            host: The host
+            result: The result dictionary of the host
+        """
+
+        self.write_host(host, result["Result"], result["Error"])
+
+    def close(self):
+        """
+        Closes the file
+        """
+
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 def get_update_service(context):
     """
     Locates and gets the UpdateService resource
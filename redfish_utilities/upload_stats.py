@@ -0,0 +1,246 @@
+#! /usr/bin/python
+# Copyright Notice:
+# Copyright 2019-2026 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tacklebox/blob/main/LICENSE.md
+
+"""
+Upload Stats Module
+
+File : upload_stats.py
+
+Brief : This file contains the definitions and functionalities for recording
+        the throughput of uploads to Redfish services and tuning the timeouts
+        of later uploads from what was observed
+"""
+
+import atexit
+import os
+import threading
+import time
+from .json_store import read_json_store
+from .json_store import update_json_store
+from . import config
+
+# Number of uploads to keep for each key
+MAX_UPLOADS_PER_KEY = 20
+
+# Minimum time, in seconds, between saves of the recorded uploads to config.__upload_stats_file__; uploads recorded
+# in between are saved with the next save, or when the program exits
+UPLOAD_STATS_SAVE_INTERVAL = 10
+
+# Upload measurements keyed by host or other key given by the caller, such as a model of BMC
+upload_stats = {}
+upload_stats_lock = threading.Lock()
+upload_stats_state = {"File": None, "Unsaved": False, "LastSave": None}
+
+
+def record_upload(key, size, connect_time, send_time, response_time, throttled=False):
+    """
+    Records the measurements of an upload; if config.__upload_stats_file__ is set, the recorded uploads are saved to
+    the file at most every UPLOAD_STATS_SAVE_INTERVAL seconds
+
+    Args:
+        key: The key to record the upload under, such as the host
+        size: The number of bytes sent
+        connect_time: The time, in seconds, from the start of the request until the first byte of the body was sent
+        send_time: The time, in seconds, to send the body
+        response_time: The time, in seconds, from the last byte of the body being sent until the response arrived
+        throttled: Indicates if the upload was held back by a rate limit; its throughput is not recorded since it does
+                   not reflect the throughput of the connection
+
+    Returns:
+        A dictionary of the measurements
+    """
+
+    upload = {
+        "Time": time.time(),
+        "Size": size,
+        "ConnectTime": connect_time,
+        "SendTime": send_time,
+        "ResponseTime": response_time,
+        "TotalTime": connect_time + send_time + response_time,
+        "Throughput": size / send_time if send_time > 0 and not throttled else None,
+    }
+    with upload_stats_lock:
+        load_upload_stats()
+        uploads = upload_stats.setdefault(key, [])
+        uploads.append(upload)
+        del uploads[:-MAX_UPLOADS_PER_KEY]
+        upload_stats_state["Unsaved"] = True
+        last_save = upload_stats_state["LastSave"]
+    if last_save is None or time.monotonic() - last_save >= UPLOAD_STATS_SAVE_INTERVAL:
+        save_upload_stats()
+    return upload
+
+
+def get_upload_stats(key=None):
+    """
+    Summarizes the recorded uploads
+
+    Args:
+        key: The key of the uploads to summarize; if None, the uploads of every key are summarized
+
+    Returns:
+        A dictionary containing the number of 'Uploads', the total 'Bytes' sent, the median 'Throughput' and the
+        lowest 'MinThroughput' in bytes per second, the longest 'MaxResponseTime' in seconds, and the measurements of
+        the 'Last' upload; None if there are no uploads for the key; if key is None, a dictionary of summaries keyed
+        by key
+    """
+
+    with upload_stats_lock:
+        load_upload_stats()
+        if key is None:
+            return {stats_key: summarize_uploads(uploads) for stats_key, uploads in upload_stats.items() if uploads}
+        uploads = list(upload_stats.get(key, []))
+    if not uploads:
+        return None
+    return summarize_uploads(uploads)
+
+
+def clear_upload_stats(key=None):
+    """
+    Clears the recorded uploads
+
+    Args:
+        key: The key of the uploads to clear; if None, all uploads are cleared
+    """
+
+    with upload_stats_lock:
+        load_upload_stats()
+        if key is None:
+            upload_stats.clear()
+            upload_stats_state["Unsaved"] = False
+            if upload_stats_state["File"] is not None:
+                try:
+                    os.remove(upload_stats_state["File"])
+                except FileNotFoundError:
+                    pass
+            return
+        upload_stats.pop(key, None)
+        stats_file = upload_stats_state["File"]
+        recorded = {recorded_key: list(uploads) for recorded_key, uploads in upload_stats.items()}
+    if stats_file is not None:
+        # Remove the key from the file as well, keeping the uploads of other keys saved by other processes
+        def merge(saved):
+            saved.pop(key, None)
+            return merge_upload_stats(saved, recorded)
+
+        update_json_store(stats_file, merge)
+
+
+def get_upload_timeouts(key, size):
+    """
+    Determines the timeouts for an upload from the uploads recorded for a key, or from all recorded uploads if there
+    are none for the key
+
+    Args:
+        key: The key of the uploads to use, such as the host
+        size: The number of bytes to send
+
+    Returns:
+        A dictionary containing the time, in seconds, a write to the connection can be blocked before the upload is
+        considered stalled in 'Stall', the time, in seconds, allowed to send the body in 'Send', and the time, in
+        seconds, allowed for the response after the body is sent in 'Response'; 'Send' and 'Response' are None if
+        there are no recorded uploads
+    """
+
+    with upload_stats_lock:
+        load_upload_stats()
+        uploads = list(upload_stats.get(key, []))
+        if not uploads:
+            uploads = [upload for key_uploads in upload_stats.values() for upload in key_uploads]
+
+    timeouts = {"Stall": config.__upload_stall_timeout__, "Send": None, "Response": None}
+    if not uploads:
+        return timeouts
+    summary = summarize_uploads(uploads)
+    margin = config.__upload_timeout_margin__
+    if summary["MinThroughput"]:
+        timeouts["Send"] = size / summary["MinThroughput"] * margin + config.__upload_stall_timeout__
+    timeouts["Response"] = max(summary["MaxResponseTime"] * margin, 120)
+    return timeouts
+
+
+def summarize_uploads(uploads):
+    """
+    Summarizes a list of upload measurements
+
+    Args:
+        uploads: A list of dictionaries of upload measurements
+
+    Returns:
+        A dictionary of the summary, as described by get_upload_stats
+    """
+
+    throughputs = sorted(upload["Throughput"] for upload in uploads if upload["Throughput"])
+    return {
+        "Uploads": len(uploads),
+        "Bytes": sum(upload["Size"] for upload in uploads),
+        "Throughput": throughputs[len(throughputs) // 2] if throughputs else None,
+        "MinThroughput": throughputs[0] if throughputs else None,
+        "MaxResponseTime": max(upload["ResponseTime"] for upload in uploads),
+        "Last": max(uploads, key=lambda upload: upload["Time"]),
+    }
+
+
+def load_upload_stats():
+    """
+    Loads the recorded uploads from config.__upload_stats_file__ if the file changed since the last load; the caller
+    is expected to hold the lock
+    """
+
+    stats_file = config.__upload_stats_file__
+    if stats_file == upload_stats_state["File"]:
+        return
+    upload_stats_state["File"] = stats_file
+    upload_stats_state["Unsaved"] = False
+    upload_stats.clear()
+    if stats_file is not None:
+        upload_stats.update(merge_upload_stats(read_json_store(stats_file), {}))
+
+
+def save_upload_stats():
+    """
+    Saves the recorded uploads to config.__upload_stats_file__ if any were recorded since the last save, merging in
+    uploads saved by other processes
+    """
+
+    with upload_stats_lock:
+        stats_file = upload_stats_state["File"]
+        if stats_file is None or not upload_stats_state["Unsaved"]:
+            return
+        upload_stats_state["Unsaved"] = False
+        upload_stats_state["LastSave"] = time.monotonic()
+        recorded = {key: list(uploads) for key, uploads in upload_stats.items()}
+
+    # The file is written without holding the lock so uploads can be recorded in the meantime
+    saved = update_json_store(stats_file, lambda saved: merge_upload_stats(saved, recorded))
+    with upload_stats_lock:
+        if upload_stats_state["File"] == stats_file:
+            upload_stats.update(merge_upload_stats(saved, upload_stats))
+
+
+def merge_upload_stats(saved, recorded):
+    """
+    Merges saved upload measurements with recorded uploads
+
+    Args:
+        saved: The dictionary read from the upload stats file
+        recorded: A dictionary of lists of recorded upload measurements keyed by key
+
+    Returns:
+        A dictionary of lists of upload measurements keyed by key, with the most recent uploads of each key
+    """
+
+    merged = {}
+    for key in set(recorded) | set(saved):
+        uploads = saved.get(key)
+        if not isinstance(uploads, list):
+            uploads = []
+        uploads = {upload["Time"]: upload for upload in uploads + recorded.get(key, [])}
+        merged[key] = sorted(uploads.values(), key=lambda upload: upload["Time"])[-MAX_UPLOADS_PER_KEY:]
+    return merged
+
+
+# Save any uploads recorded since the last save
+atexit.register(save_upload_stats)
@@ -25,21 +25,47 @@ argget = argparse.ArgumentParser(description="A tool to manage assemblies on a R
 argget.add_argument("--user", "-u", type=str, required=True, help="The user name for authentication")
 argget.add_argument("--password", "-p", type=str, required=True, help="The password for authentication")
 argget.add_argument("--rhost", "-r", type=str, required=True, help="The address of the Redfish service (with scheme)")
-argget.add_argument("--assembly", "-a", type=str, required=True, help="The URI of the target assembly")
+argget.add_argument(
+    "--assembly",
+    "-a",
+    type=str,
+    required=True,
+    action="append",
+    help="The URI of the target assembly; this argument can be repeated to download or upload multiple assemblies with a directory",
+)
 argget.add_argument("--index", "-i", type=int, help="The target assembly index")
+argget.add_argument(
+    "--workers",
+    "-w",
+    type=int,
+    default=redfish_utilities.assembly.DEFAULT_MAX_TRANSFER_WORKERS,
+    help="The maximum number of assemblies to download or upload at the same time with a directory; defaults to {}".format(
+        redfish_utilities.assembly.DEFAULT_MAX_TRANSFER_WORKERS
+    ),
+)
 argget.add_argument("--debug", action="store_true", help="Creates debug file showing HTTP traces and exceptions")
 subparsers = argget.add_subparsers(dest="command")
 info_argget = subparsers.add_parser("info", help="Displays information about the an assembly")
 download_argget = subparsers.add_parser("download", help="Downloads assembly data to a file")
-download_argget.add_argument(
-    "--file", "-f", type=str, required=True, help="The file, and optional path, to save the assembly data"
+download_target = download_argget.add_mutually_exclusive_group(required=True)
+download_target.add_argument("--file", "-f", type=str, help="The file, and optional path, to save the assembly data")
+download_target.add_argument(
+    "--directory", "-d", type=str, help="The directory to save the data of every assembly with binary data"
 )
 upload_argget = subparsers.add_parser("upload", help="Uploads assembly data from a file")
-upload_argget.add_argument(
-    "--file", "-f", type=str, required=True, help="The file, and optional path, containing the assembly data to upload"
+upload_target = upload_argget.add_mutually_exclusive_group(required=True)
+upload_target.add_argument(
+    "--file", "-f", type=str, help="The file, and optional path, containing the assembly data to upload"
+)
+upload_target.add_argument(
+    "--directory", "-d", type=str, help="The directory of assembly data previously saved with the download command"
 )
 args = argget.parse_args()
 
+if len(args.assembly) > 1 and getattr(args, "directory", None) is None:
+    print("rf_assembly.py: error: multiple assemblies can only be given when downloading or uploading with a directory")
+    sys.exit(1)
+
 if args.index and args.index < 0:
     print("rf_assembly.py: error: the assembly index cannot be negative")
     sys.exit(1)
@@ -65,15 +91,44 @@ except Exception:
 
 exit_code = 0
 try:
-    assembly_info = redfish_utilities.get_assembly(redfish_obj, args.assembly)
-    if args.command == "download":
-        print("Saving data to '{}'...".format(args.file))
-        redfish_utilities.download_assembly(redfish_obj, assembly_info, args.file, args.index)
-    elif args.command == "upload":
-        print("Writing data from '{}'...".format(args.file))
-        redfish_utilities.upload_assembly(redfish_obj, assembly_info, args.file, args.index)
+    if getattr(args, "directory", None) is not None:
+        # Transfer the data of every assembly with binary data
+        if args.command == "download":
+            print("Saving data to '{}'...".format(args.directory))
+            results = redfish_utilities.download_assemblies(
+                redfish_obj, args.assembly, args.directory, max_workers=args.workers
+            )
+        else:
+            print("Writing data from '{}'...".format(args.directory))
+            results = redfish_utilities.upload_assemblies(
+                redfish_obj, args.directory, args.assembly, max_workers=args.workers
+            )
+        for uri, uri_results in results.items():
+            if not uri_results:
+                print("{}: No binary data".format(uri))
+            for result in uri_results:
+                if result["Error"] is not None:
+                    exit_code = 1
+                    if result["Index"] is None:
+                        print("{}: Failed: {}".format(uri, result["Error"]))
+                    else:
+                        print("{} index {}: Failed: {}".format(uri, result["Index"], result["Error"]))
+                else:
+                    print(
+                        "{} index {}: {} ({} bytes, SHA-256 {})".format(
+                            uri, result["Index"], result["Path"], result["Size"], result["SHA256"]
+                        )
+                    )
     else:
-        redfish_utilities.print_assembly(assembly_info, args.index)
+        assembly_info = redfish_utilities.get_assembly(redfish_obj, args.assembly[0])
+        if args.command == "download":
+            print("Saving data to '{}'...".format(args.file))
+            redfish_utilities.download_assembly(redfish_obj, assembly_info, args.file, args.index)
+        elif args.command == "upload":
+            print("Writing data from '{}'...".format(args.file))
+            redfish_utilities.upload_assembly(redfish_obj, assembly_info, args.file, args.index)
+        else:
+            redfish_utilities.print_assembly(assembly_info, args.index)
 except Exception as e:
     if args.debug:
         logger.error("Caught exception:\n\n{}\n".format(traceback.format_exc()))
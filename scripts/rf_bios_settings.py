@@ -13,6 +13,7 @@ Brief : This script uses the redfish_utilities module to manager BIOS settings o
 
 import argparse
 import datetime
+import json
 import logging
 import redfish
 import redfish_utilities
@@ -24,7 +25,14 @@ from redfish.messages import RedfishPasswordChangeRequiredError
 argget = argparse.ArgumentParser(description="A tool to manager BIOS settings for a system")
 argget.add_argument("--user", "-u", type=str, required=True, help="The user name for authentication")
 argget.add_argument("--password", "-p", type=str, required=True, help="The password for authentication")
-argget.add_argument("--rhost", "-r", type=str, required=True, help="The address of the Redfish service (with scheme)")
+argget.add_argument(
+    "--rhost",
+    "-r",
+    type=str,
+    required=True,
+    nargs="+",
+    help="The address of the Redfish service (with scheme); multiple services can be given with '--baseline' to check them concurrently",
+)
 argget.add_argument("--system", "-s", type=str, help="The ID of the system to manage")
 argget.add_argument(
     "--attribute",
@@ -35,7 +43,37 @@ argget.add_argument(
     action="append",
     help="Sets a BIOS attribute to a new value; can be supplied multiple times to set multiple attributes",
 )
+argget.add_argument(
+    "--file",
+    "-f",
+    type=str,
+    help="The filepath of a JSON document containing the desired BIOS attributes; only attributes that differ from the settings of the system are set",
+)
 argget.add_argument("--reset", "-reset", action="store_true", help="Resets BIOS to the default settings")
+argget.add_argument(
+    "--restart",
+    "-restart",
+    action="store_true",
+    help="Resets the system after setting attributes if needed for the attributes to take effect",
+)
+argget.add_argument(
+    "--baseline",
+    "-b",
+    type=str,
+    help="The filepath of a JSON document containing the desired BIOS attributes keyed by system model ('*' for any other model); the BIOS settings are checked against the baseline and a report of deviations is produced",
+)
+argget.add_argument(
+    "--output", "-o", type=str, help="The filepath to save the compliance report; if omitted, the report is printed"
+)
+argget.add_argument(
+    "--workers",
+    "-w",
+    type=int,
+    default=redfish_utilities.fleet.DEFAULT_MAX_WORKERS,
+    help="The maximum number of services to check at the same time; defaults to {}".format(
+        redfish_utilities.fleet.DEFAULT_MAX_WORKERS
+    ),
+)
 argget.add_argument(
     "--workaround",
     "-workaround",
@@ -46,6 +84,13 @@ argget.add_argument(
 argget.add_argument("--debug", action="store_true", help="Creates debug file showing HTTP traces and exceptions")
 args = argget.parse_args()
 
+# Verify the combination of arguments is correct
+if args.baseline is not None:
+    if args.attribute or args.file or args.reset or args.restart:
+        argget.error("Cannot use '--attribute', '--file', '--reset', or '--restart' with '--baseline'")
+elif len(args.rhost) > 1:
+    argget.error("Multiple services can only be given with '--baseline'")
+
 if args.workaround:
     redfish_utilities.config.__workarounds__ = True
 
@@ -55,6 +100,42 @@ if args.debug:
     logger = redfish.redfish_logger(log_file, log_format, logging.DEBUG)
     logger.info("rf_bios_settings Trace")
 
+if args.baseline is not None:
+    # Check the BIOS settings of the systems of each service concurrently
+    with open(args.baseline) as baseline_file:
+        baselines = json.load(baseline_file)
+    contexts, errors = redfish_utilities.login_hosts(args.rhost, args.user, args.password, timeout=15)
+
+    def print_result(host, result):
+        if result["Error"] is not None:
+            print("{}: Failed: {}".format(host, result["Error"]), file=sys.stderr)
+
+    try:
+        results = redfish_utilities.get_systems_bios_compliance(
+            contexts,
+            baselines,
+            [args.system] if args.system else None,
+            max_workers=args.workers,
+            on_result=print_result,
+        )
+    finally:
+        # Log out
+        redfish_utilities.logout_hosts(contexts)
+
+    # Hosts that could not be logged into are reported as failures
+    for host, error in errors.items():
+        print("{}: Login failed: {}".format(host, error), file=sys.stderr)
+        results[host] = {"Result": None, "Error": error, "Duration": None}
+    report = redfish_utilities.get_bios_compliance_report({host: results[host] for host in args.rhost})
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+    summary = report["Summary"]
+    sys.exit(1 if summary["FailedHosts"] or summary["NonCompliantSystems"] else 0)
+args.rhost = args.rhost[0]
+
 # Set up the Redfish object
 redfish_obj = None
 try:
@@ -78,8 +159,15 @@ try:
         # Get the BIOS settings
         current_settings, future_settings = redfish_utilities.get_system_bios(redfish_obj, args.system)
 
+        new_settings = {}
+        if args.file is not None:
+            # Read the desired attributes; the document can be a BIOS resource or an object of attributes
+            with open(args.file) as desired_file:
+                new_settings = json.load(desired_file)
+            if isinstance(new_settings.get("Attributes"), dict):
+                new_settings = new_settings["Attributes"]
+
         if args.attribute is not None:
-            new_settings = {}
             for attribute in args.attribute:
                 # Based on the current settings, determine the appropriate data type for the new setting
                 new_value = attribute[1]
@@ -99,8 +187,24 @@ try:
 
                 # Set the specified attribute to the new value
                 new_settings[attribute[0]] = new_value
-                print("Setting {} to {}...".format(attribute[0], attribute[1]))
-            redfish_utilities.set_system_bios(redfish_obj, new_settings, args.system)
+
+        if args.file is not None or args.attribute is not None:
+            # Only set the attributes that differ from the settings of the system
+            result = redfish_utilities.apply_system_bios(
+                redfish_obj, new_settings, args.system, current_settings, future_settings
+            )
+            if result["Changes"]:
+                for name, value in result["Changes"].items():
+                    print("Setting {} to {}...".format(name, value))
+            else:
+                print("No changes needed; the BIOS settings already match")
+
+            # Reset the system if requested and needed
+            if args.restart and result["ResetRequired"]:
+                print("Resetting the system...")
+                response = redfish_utilities.system_reset(redfish_obj, args.system)
+                response = redfish_utilities.poll_task_monitor(redfish_obj, response)
+                redfish_utilities.verify_response(response)
         else:
             # Print the BIOS settings
             redfish_utilities.print_system_bios(current_settings, future_settings)
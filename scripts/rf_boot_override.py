@@ -25,7 +25,14 @@ from redfish.messages import RedfishPasswordChangeRequiredError
 argget = argparse.ArgumentParser(description="A tool to perform a one time boot override of a system")
 argget.add_argument("--user", "-u", type=str, required=True, help="The user name for authentication")
 argget.add_argument("--password", "-p", type=str, required=True, help="The password for authentication")
-argget.add_argument("--rhost", "-r", type=str, required=True, help="The address of the Redfish service (with scheme)")
+argget.add_argument(
+    "--rhost",
+    "-r",
+    type=str,
+    required=True,
+    nargs="+",
+    help="The address of the Redfish service (with scheme); multiple services can be given to set them concurrently",
+)
 argget.add_argument("--system", "-s", type=str, help="The ID of the system to set")
 argget.add_argument("--info", "-info", action="store_true", help="Indicates if boot information should be reported")
 argget.add_argument(
@@ -51,6 +58,21 @@ argget.add_argument(
     help="Indicates if workarounds should be attempted for non-conformant services",
     default=False,
 )
+argget.add_argument(
+    "--wavesize", "-ws", type=int, help="The number of services to set in each wave when multiple services are given"
+)
+argget.add_argument(
+    "--wavedelay", "-wd", type=int, default=0, help="The time, in seconds, to wait between waves; defaults to 0"
+)
+argget.add_argument(
+    "--workers",
+    "-w",
+    type=int,
+    default=redfish_utilities.fleet.DEFAULT_MAX_WORKERS,
+    help="The maximum number of services to set at the same time; defaults to {}".format(
+        redfish_utilities.fleet.DEFAULT_MAX_WORKERS
+    ),
+)
 argget.add_argument("--debug", action="store_true", help="Creates debug file showing HTTP traces and exceptions")
 args = argget.parse_args()
 
@@ -59,6 +81,8 @@ if args.target is None:
     args.info = True
     if args.uefi or args.mode or args.reset:
         argget.error("Cannot use '--uefi', '--mode', or '--reset' without '--target'")
+if len(args.rhost) > 1 and args.info:
+    argget.error("Boot information can only be reported for a single service; '--target' is required")
 
 if args.workaround:
     redfish_utilities.config.__workarounds__ = True
@@ -69,6 +93,56 @@ if args.debug:
     logger = redfish.redfish_logger(log_file, log_format, logging.DEBUG)
     logger.info("rf_boot_override Trace")
 
+# Build the boot request based on the arguments given
+uefi_target = None
+boot_next = None
+boot_enable = "Once"
+if args.target == "UefiTarget":
+    uefi_target = args.uefi
+if args.target == "UefiBootNext":
+    boot_next = args.uefi
+if args.target == "None":
+    boot_enable = "Disabled"
+
+if len(args.rhost) > 1:
+    # Set the boot override of the systems of each service concurrently
+    contexts, errors = redfish_utilities.login_hosts(args.rhost, args.user, args.password, timeout=15)
+    for host, error in errors.items():
+        print("{}: Login failed: {}".format(host, error))
+
+    def print_result(host, result):
+        if result["Error"] is not None:
+            print("{}: Failed: {}".format(host, result["Error"]))
+        else:
+            print("{}: Boot override set ({})".format(host, ", ".join(result["Result"])))
+
+    try:
+        if args.target == "None":
+            print("Disabling one time boot for {} services...".format(len(contexts)))
+        else:
+            print("Setting a one time boot for {} for {} services...".format(args.target, len(contexts)))
+        results = redfish_utilities.set_systems_boot(
+            contexts,
+            args.target,
+            boot_enable,
+            args.mode,
+            uefi_target,
+            boot_next,
+            [args.system] if args.system else None,
+            reset=args.reset,
+            wave_size=args.wavesize,
+            wave_delay=args.wavedelay,
+            max_workers=args.workers,
+            on_result=print_result,
+        )
+    finally:
+        # Log out
+        redfish_utilities.logout_hosts(contexts)
+    if errors or any(result["Error"] is not None for result in results.values()):
+        sys.exit(1)
+    sys.exit(0)
+args.rhost = args.rhost[0]
+
 # Set up the Redfish object
 redfish_obj = None
 try:
@@ -88,17 +162,9 @@ try:
         boot = redfish_utilities.get_system_boot(redfish_obj, args.system)
         redfish_utilities.print_system_boot(boot)
     else:
-        # Build and send the boot request based on the arguments given
-        uefi_target = None
-        boot_next = None
-        boot_enable = "Once"
-        if args.target == "UefiTarget":
-            uefi_target = args.uefi
-        if args.target == "UefiBootNext":
-            boot_next = args.uefi
+        # Send the boot request
         if args.target == "None":
             print("Disabling one time boot...")
-            boot_enable = "Disabled"
         else:
             print("Setting a one time boot for {}...".format(args.target))
         redfish_utilities.set_system_boot(
@@ -14,7 +14,6 @@ Brief : This script uses the redfish_utilities module to collect diagnostic data
 import argparse
 import datetime
 import logging
-import os
 import redfish
 import redfish_utilities
 import traceback
@@ -102,24 +101,8 @@ try:
         redfish_obj, container_type, container_id, args.log, args.type, args.oemtype
     )
     response = redfish_utilities.poll_task_monitor(redfish_obj, response)
-    filename, data = redfish_utilities.download_diagnostic_data(redfish_obj, response)
-
-    # Save the file
-    if not os.path.isdir(args.directory):
-        os.makedirs(args.directory)
-    path = os.path.join(args.directory, filename)
-    name_parts = filename.split(".", 1)
-    file_check = 0
-    if len(name_parts) == 1:
-        name_parts.append("")
-    while os.path.isfile(path):
-        # If the file already exists, build a new file name with a counter
-        file_check = file_check + 1
-        filename = "{}({}).{}".format(name_parts[0], file_check, name_parts[1])
-        path = os.path.join(args.directory, filename)
-    with open(path, "wb") as file:
-        file.write(data)
-    print("Saved diagnostic data to '{}'".format(path))
+    path, checksum = redfish_utilities.save_diagnostic_data(redfish_obj, response, args.directory)
+    print("Saved diagnostic data to '{}' (SHA-256: {})".format(path, checksum))
 except Exception as e:
     if args.debug:
         logger.error("Caught exception:\n\n{}\n".format(traceback.format_exc()))
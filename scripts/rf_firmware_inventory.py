@@ -24,11 +24,33 @@ from redfish.messages import RedfishPasswordChangeRequiredError
 argget = argparse.ArgumentParser(description="A tool to collect firmware inventory from a Redfish service")
 argget.add_argument("--user", "-u", type=str, required=True, help="The user name for authentication")
 argget.add_argument("--password", "-p", type=str, required=True, help="The password for authentication")
-argget.add_argument("--rhost", "-r", type=str, required=True, help="The address of the Redfish service (with scheme)")
+argget.add_argument(
+    "--rhost",
+    "-r",
+    type=str,
+    required=True,
+    nargs="+",
+    help="The address of the Redfish service (with scheme); multiple services can be given to build a matrix of the firmware versions of each service",
+)
 argget.add_argument(
     "--details", "-details", action="store_true", help="Indicates details to be shown for each firmware entry"
 )
 argget.add_argument("--id", "-i", action="store_true", help="Construct inventory names using 'Id' values")
+argget.add_argument(
+    "--output",
+    "-o",
+    type=str,
+    help="The filepath to save the firmware versions of the services as a CSV file, or a JSON Lines file if the filepath ends with '.json' or '.jsonl'; each service is saved as soon as it's read",
+)
+argget.add_argument(
+    "--workers",
+    "-w",
+    type=int,
+    default=redfish_utilities.fleet.DEFAULT_MAX_WORKERS,
+    help="The maximum number of services to read at the same time; defaults to {}".format(
+        redfish_utilities.fleet.DEFAULT_MAX_WORKERS
+    ),
+)
 argget.add_argument("--debug", action="store_true", help="Creates debug file showing HTTP traces and exceptions")
 args = argget.parse_args()
 
@@ -38,6 +60,30 @@ if args.debug:
     logger = redfish.redfish_logger(log_file, log_format, logging.DEBUG)
     logger.info("rf_firmware_inventory Trace")
 
+if len(args.rhost) > 1 or args.output is not None:
+    # Build a matrix of the firmware versions of each service
+    contexts, errors = redfish_utilities.login_hosts(args.rhost, args.user, args.password, timeout=15)
+    writer = None
+    try:
+        # Save the versions of each service as each service is read
+        on_result = None
+        if args.output is not None:
+            writer = redfish_utilities.FirmwareMatrixWriter(args.output)
+            on_result = writer.write_result
+        matrix = redfish_utilities.get_firmware_matrix(contexts, max_workers=args.workers, on_result=on_result)
+        for host, error in errors.items():
+            matrix["Errors"][host] = "Login failed: {}".format(error)
+            if writer is not None:
+                writer.write_host(host, error=matrix["Errors"][host])
+    finally:
+        # Log out
+        redfish_utilities.logout_hosts(contexts)
+        if writer is not None:
+            writer.close()
+    redfish_utilities.print_firmware_matrix(matrix)
+    sys.exit(1 if matrix["Errors"] else 0)
+args.rhost = args.rhost[0]
+
 # Set up the Redfish object
 redfish_obj = None
 try:
@@ -0,0 +1,61 @@
+#! /usr/bin/python
+# Copyright Notice:
+# Copyright 2019-2026 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tacklebox/blob/main/LICENSE.md
+
+"""
+Redfish Image Server
+
+File : rf_image_server.py
+
+Brief : This script uses the redfish_utilities module to host a folder of
+        staged images for Redfish services to pull
+"""
+
+import argparse
+import redfish_utilities
+import threading
+
+# Get the input arguments
+argget = argparse.ArgumentParser(description="A tool to host a folder of staged images for Redfish services to pull")
+argget.add_argument("--directory", "-d", type=str, required=True, help="The folder to stage images in")
+argget.add_argument(
+    "--size",
+    "-s",
+    type=float,
+    default=10,
+    help="The disk budget, in GB, of the folder to stage images in; defaults to 10",
+)
+argget.add_argument(
+    "--address", "-a", type=str, default="", help="The local address to listen on; defaults to all addresses"
+)
+argget.add_argument(
+    "--port",
+    "-port",
+    type=int,
+    default=redfish_utilities.image_server.DEFAULT_IMAGE_SERVER_PORT,
+    help="The port to listen on; defaults to {}".format(redfish_utilities.image_server.DEFAULT_IMAGE_SERVER_PORT),
+)
+argget.add_argument("--image", "-i", type=str, nargs="+", help="The filepaths of images to stage before hosting them")
+args = argget.parse_args()
+
+image_cache = redfish_utilities.ImageCache(args.directory, max_size=int(args.size * 1024 * 1024 * 1024))
+image_server = redfish_utilities.ImageServer(address=args.address, port=args.port, cache=image_cache)
+
+# Stage the images requested
+if args.image:
+    for image in args.image:
+        print("Staged {} as {}".format(image, image_server.add_image(image)))
+
+# Host the folder until interrupted
+image_server.start()
+if image_server.shared:
+    print("Images in {} are already hosted on port {}".format(image_cache.directory, image_server.port))
+else:
+    print("Hosting images in {} on port {}; press Ctrl+C to stop".format(image_cache.directory, image_server.port))
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        image_server.stop()
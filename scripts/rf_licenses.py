@@ -12,7 +12,9 @@ Brief : This script uses the redfish_utilities module to manage licenses
 """
 
 import argparse
+import csv
 import datetime
+import json
 import logging
 import redfish
 import redfish_utilities
@@ -20,20 +22,70 @@ import traceback
 import sys
 from redfish.messages import RedfishPasswordChangeRequiredError
 
+
+def read_license_map(file_name):
+    """
+    Reads the licenses to install on each service from a file
+
+    Args:
+        file_name: The filepath of a JSON file with an object mapping each service to a license or list of licenses,
+                   or a CSV file with a service and license on each line
+
+    Returns:
+        A dictionary keyed by service containing a license or list of licenses
+    """
+
+    license_map = {}
+    with open(file_name, newline="") as map_file:
+        if file_name.lower().endswith(".json"):
+            license_map.update(json.load(map_file))
+        else:
+            for row in csv.reader(map_file):
+                if len(row) >= 2 and not row[0].startswith("#"):
+                    license_map.setdefault(row[0].strip(), []).append(row[1].strip())
+    return license_map
+
+
 # Get the input arguments
 argget = argparse.ArgumentParser(description="A tool to manage licenses on a Redfish service")
 argget.add_argument("--user", "-u", type=str, required=True, help="The user name for authentication")
 argget.add_argument("--password", "-p", type=str, required=True, help="The password for authentication")
-argget.add_argument("--rhost", "-r", type=str, required=True, help="The address of the Redfish service (with scheme)")
+argget.add_argument(
+    "--rhost",
+    "-r",
+    type=str,
+    action="append",
+    help="The address of the Redfish service (with scheme); this argument can be repeated to install licenses on multiple services, and can be omitted if the services are given by a license map",
+)
+argget.add_argument(
+    "--workers",
+    "-w",
+    type=int,
+    default=redfish_utilities.fleet.DEFAULT_MAX_WORKERS,
+    help="The maximum number of services to install licenses on at the same time; defaults to {}".format(
+        redfish_utilities.fleet.DEFAULT_MAX_WORKERS
+    ),
+)
 argget.add_argument("--debug", action="store_true", help="Creates debug file showing HTTP traces and exceptions")
 subparsers = argget.add_subparsers(dest="command")
 info_argget = subparsers.add_parser("info", help="Displays information about the licenses installed on the service")
 info_argget.add_argument(
     "--details", "-details", action="store_true", help="Indicates if the full details of each license should be shown"
 )
+info_argget.add_argument(
+    "--expand",
+    "-expand",
+    action="store_true",
+    help="Indicates if the licenses should be read with the license collection, if supported by the service",
+)
 install_argget = subparsers.add_parser("install", help="Installs a new license")
-install_argget.add_argument(
-    "--license", "-l", type=str, required=True, help="The filepath or URI to the license to install"
+install_target = install_argget.add_mutually_exclusive_group(required=True)
+install_target.add_argument("--license", "-l", type=str, help="The filepath or URI to the license to install")
+install_target.add_argument(
+    "--licensemap",
+    "-lm",
+    type=str,
+    help="The filepath of a JSON or CSV file that maps each service to the filepath or URI of the license to install",
 )
 delete_argget = subparsers.add_parser("delete", help="Deletes a license")
 delete_argget.add_argument("--license", "-l", type=str, required=True, help="The identifier of the license to delete")
@@ -45,6 +97,60 @@ if args.debug:
     logger = redfish.redfish_logger(log_file, log_format, logging.DEBUG)
     logger.info("rf_licenses Trace")
 
+if args.command == "install" and (args.licensemap is not None or (args.rhost is not None and len(args.rhost) > 1)):
+    # Install the licenses on each service
+    if args.licensemap is not None:
+        license_map = read_license_map(args.licensemap)
+        if args.rhost is None:
+            args.rhost = list(license_map)
+    else:
+        license_map = {host: args.license for host in args.rhost}
+    contexts, errors = redfish_utilities.login_hosts(args.rhost, args.user, args.password, timeout=15)
+    for host, error in errors.items():
+        print("{}: Login failed: {}".format(host, error))
+    for host in contexts:
+        if host not in license_map:
+            errors[host] = "No license given for the service"
+            print("{}: Failed: {}".format(host, errors[host]))
+
+    def print_result(host, result):
+        if result["Error"] is not None:
+            print("{}: Failed: {}".format(host, result["Error"]))
+            return
+        for license_result in result["Result"]:
+            if license_result["Error"] is not None:
+                print("{}: Failed to install '{}': {}".format(host, license_result["License"], license_result["Error"]))
+            elif license_result["Installed"] is not None:
+                print(
+                    "{}: Installed '{}' as {}".format(
+                        host, license_result["License"], license_result["Installed"].get("Id")
+                    )
+                )
+            else:
+                print(
+                    "{}: Installed '{}'; the service did not report the new license".format(
+                        host, license_result["License"]
+                    )
+                )
+
+    try:
+        print("Installing licenses on {} services...".format(len(contexts)))
+        results = redfish_utilities.install_licenses(
+            contexts, license_map, max_workers=args.workers, on_result=print_result
+        )
+    finally:
+        redfish_utilities.logout_hosts(contexts)
+    failed = errors or any(
+        result["Error"] is not None or any(license_result["Error"] is not None for license_result in result["Result"])
+        for result in results.values()
+    )
+    sys.exit(1 if failed else 0)
+if args.rhost is None:
+    argget.error("the following arguments are required: --rhost/-r")
+if len(args.rhost) > 1:
+    argget.error("multiple services can only be given when installing licenses")
+args.rhost = args.rhost[0]
+
 # Set up the Redfish object
 redfish_obj = None
 try:
@@ -71,7 +177,7 @@ try:
         response = redfish_utilities.poll_task_monitor(redfish_obj, response)
         redfish_utilities.verify_response(response)
     else:
-        licenses = redfish_utilities.get_licenses(redfish_obj)
+        licenses = redfish_utilities.get_licenses(redfish_obj, expand=getattr(args, "expand", False))
         if args.command == "info":
             redfish_utilities.print_licenses(licenses, details=args.details)
         else:
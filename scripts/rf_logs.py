@@ -47,7 +47,16 @@ argget.add_argument(
     "--endtime", "-end", type=str, help="The timestamp of the newest log entry to collect in ISO8601 date-time format"
 )
 argget.add_argument(
-    "--details", "-details", action="store_true", help="Indicates details to be shown for each log entry"
+    "--details",
+    "-details",
+    action="store_true",
+    help="Indicates details to be shown for each log entry; when writing to a file, all properties of each entry are kept",
+)
+argget.add_argument(
+    "--output",
+    "-o",
+    type=str,
+    help="The file to write the log entries in JSON Lines format; a '.gz' or '.zst' extension compresses the file",
 )
 argget.add_argument("--clear", "-clear", action="store_true", help="Indicates if the log should be cleared")
 argget.add_argument("--debug", action="store_true", help="Creates debug file showing HTTP traces and exceptions")
@@ -88,13 +97,31 @@ except Exception:
 
 exit_code = 0
 try:
-    # Either clear the logs or get/print the logs
+    # Either clear the logs, export the logs, or get/print the logs
     if args.clear:
         # Clear log was requested
         print("Clearing the log...")
         response = redfish_utilities.clear_log_entries(redfish_obj, container_type, container_id, args.log)
         response = redfish_utilities.poll_task_monitor(redfish_obj, response)
         redfish_utilities.verify_response(response)
+    elif args.output:
+        # Export log was requested; entries are written as they're read from the service
+        log_entries = redfish_utilities.iter_log_entries(
+            redfish_obj,
+            container_type=container_type,
+            container_id=container_id,
+            log_service_id=args.log,
+            first=args.first,
+            max_entries=args.max,
+            start_time=args.starttime,
+            end_time=args.endtime,
+        )
+        # Without details, only keep the properties shown in the table when printing the log
+        properties = None
+        if not args.details:
+            properties = ["Id", "Created", "EventTimestamp", "Message"]
+        entry_count = redfish_utilities.write_log_entries(log_entries, args.output, properties)
+        print("Wrote {} log entries to '{}'".format(entry_count, args.output))
     else:
         # Print log was requested
         log_entries = redfish_utilities.get_log_entries(
@@ -24,7 +24,14 @@ from redfish.messages import RedfishPasswordChangeRequiredError
 argget = argparse.ArgumentParser(description="A tool to perform a power/reset operation of a system")
 argget.add_argument("--user", "-u", type=str, required=True, help="The user name for authentication")
 argget.add_argument("--password", "-p", type=str, required=True, help="The password for authentication")
-argget.add_argument("--rhost", "-r", type=str, required=True, help="The address of the Redfish service (with scheme)")
+argget.add_argument(
+    "--rhost",
+    "-r",
+    type=str,
+    required=True,
+    nargs="+",
+    help="The address of the Redfish service (with scheme); multiple services can be given to reset them in waves",
+)
 argget.add_argument("--system", "-s", type=str, help="The ID of the system to reset")
 argget.add_argument(
     "--type", "-t", type=str, help="The type of power/reset operation to perform", choices=redfish_utilities.reset_types
@@ -32,6 +39,24 @@ argget.add_argument(
 argget.add_argument(
     "--info", "-info", action="store_true", help="Indicates if reset and power information should be reported"
 )
+argget.add_argument(
+    "--verify", "-verify", action="store_true", help="Indicates if the power state is to be verified after the reset"
+)
+argget.add_argument(
+    "--wavesize", "-ws", type=int, help="The number of services to reset in each wave when multiple services are given"
+)
+argget.add_argument(
+    "--wavedelay", "-wd", type=int, default=0, help="The time, in seconds, to wait between waves; defaults to 0"
+)
+argget.add_argument(
+    "--workers",
+    "-w",
+    type=int,
+    default=redfish_utilities.fleet.DEFAULT_MAX_WORKERS,
+    help="The maximum number of services to reset at the same time; defaults to {}".format(
+        redfish_utilities.fleet.DEFAULT_MAX_WORKERS
+    ),
+)
 argget.add_argument("--debug", action="store_true", help="Creates debug file showing HTTP traces and exceptions")
 args = argget.parse_args()
 
@@ -41,6 +66,48 @@ if args.debug:
     logger = redfish.redfish_logger(log_file, log_format, logging.DEBUG)
     logger.info("rf_power_reset Trace")
 
+if len(args.rhost) > 1:
+    # Reset the systems of each service in waves
+    if args.info:
+        print("Reset and power information can only be reported for a single service")
+        sys.exit(1)
+    if args.type is None:
+        print("A reset type is required when multiple services are given")
+        sys.exit(1)
+    contexts, errors = redfish_utilities.login_hosts(args.rhost, args.user, args.password, timeout=15)
+    for host, error in errors.items():
+        print("{}: Login failed: {}".format(host, error))
+
+    def print_result(host, result):
+        if result["Error"] is not None:
+            print("{}: Failed: {}".format(host, result["Error"]))
+        else:
+            power_states = ", ".join(
+                "{} is {}".format(system_id, power_state) if power_state else system_id
+                for system_id, power_state in result["Result"].items()
+            )
+            print("{}: Reset complete ({})".format(host, power_states))
+
+    try:
+        print("Resetting the systems of {} services...".format(len(contexts)))
+        results = redfish_utilities.reset_systems(
+            contexts,
+            args.type,
+            [args.system] if args.system else None,
+            wave_size=args.wavesize,
+            wave_delay=args.wavedelay,
+            max_workers=args.workers,
+            verify=args.verify,
+            on_result=print_result,
+        )
+    finally:
+        # Log out
+        redfish_utilities.logout_hosts(contexts)
+    if errors or any(result["Error"] is not None for result in results.values()):
+        sys.exit(1)
+    sys.exit(0)
+args.rhost = args.rhost[0]
+
 # Set up the Redfish object
 redfish_obj = None
 try:
@@ -71,10 +138,32 @@ try:
         else:
             print("No power state information found")
     else:
+        verify = args.verify and args.type in redfish_utilities.reset_power_states
+        last_reset_time = None
+        if verify and args.type in redfish_utilities.reset_restart_types:
+            # The system ends in the power state it's already in; only a new reset time shows it restarted
+            last_reset_time = redfish_utilities.get_system(redfish_obj, args.system).dict.get("LastResetTime")
+            if last_reset_time is None:
+                print(
+                    "The system does not report its last reset time; the {} reset cannot be verified".format(args.type)
+                )
+                verify = False
         print("Resetting the system...")
         response = redfish_utilities.system_reset(redfish_obj, args.system, args.type)
         response = redfish_utilities.poll_task_monitor(redfish_obj, response)
         redfish_utilities.verify_response(response)
+        if verify:
+            print(
+                "Waiting for the system to reach the {} power state...".format(
+                    redfish_utilities.reset_power_states[args.type]
+                )
+            )
+            redfish_utilities.wait_for_system_power_state(
+                redfish_obj,
+                redfish_utilities.reset_power_states[args.type],
+                args.system,
+                last_reset_time=last_reset_time,
+            )
 except Exception as e:
     if args.debug:
         logger.error("Caught exception:\n\n{}\n".format(traceback.format_exc()))
@@ -15,54 +15,13 @@ import argparse
 import datetime
 import logging
 import os
-import re
 import redfish
 import redfish_utilities
-import shutil
-import socket
 import sys
-import threading
-import time
 import traceback
 from redfish.messages import RedfishPasswordChangeRequiredError
 
-if sys.version_info > (3,):
-    import http.server
-else:
-    import SimpleHTTPServer
-    import SocketServer
-
 WEB_SERVER_PORT = 8888
-WEB_SERVER_FOLDER = "rf_update_server"
-
-
-def local_web_server(filepath):
-    """
-    Creates a web server to host the image file
-
-    Args:
-        filepath: The filepath for the image
-    """
-
-    # Create a temporary folder and move the file to the folder
-    try:
-        shutil.rmtree(WEB_SERVER_FOLDER)
-    except Exception:
-        pass
-    os.mkdir(WEB_SERVER_FOLDER)
-    shutil.copy(filepath, WEB_SERVER_FOLDER)
-    os.chdir(WEB_SERVER_FOLDER)
-
-    # Create a web server and host it out of the temporary folder
-    if sys.version_info > (3,):
-        handler = http.server.SimpleHTTPRequestHandler
-        httpd = http.server.HTTPServer(("", WEB_SERVER_PORT), handler)
-    else:
-        handler = SimpleHTTPServer.SimpleHTTPRequestHandler
-        httpd = SocketServer.TCPServer(("", WEB_SERVER_PORT), handler)
-    httpd.serve_forever()
-
-    return
 
 
 def print_error_payload(response):
@@ -83,11 +42,57 @@ def print_error_payload(response):
             print("Success")
 
 
+def print_upload_progress(sent, total):
+    """
+    Prints the progress of pushing an image to the service
+
+    Args:
+        sent: The number of bytes sent
+        total: The total number of bytes to send
+    """
+
+    percent = sent * 100 // total
+    if percent != print_upload_progress.percent:
+        print_upload_progress.percent = percent
+        print("\r{}% sent".format(percent), end="", flush=True)
+        if sent == total:
+            print("")
+
+
+print_upload_progress.percent = None
+
+
+def format_upload_stats(upload):
+    """
+    Formats the measurements of an upload
+
+    Args:
+        upload: The measurements of the upload
+
+    Returns:
+        A string describing the upload
+    """
+
+    throughput = "unknown"
+    if upload["Throughput"]:
+        throughput = "{:.1f} MB/s".format(upload["Throughput"] / (1024 * 1024))
+    return "{:.1f} MB in {:.1f}s ({}); {:.1f}s to start sending, {:.1f}s for the response".format(
+        upload["Size"] / (1024 * 1024), upload["TotalTime"], throughput, upload["ConnectTime"], upload["ResponseTime"]
+    )
+
+
 # Get the input arguments
 argget = argparse.ArgumentParser(description="A tool to perform an update with a Redfish service")
 argget.add_argument("--user", "-u", type=str, required=True, help="The user name for authentication")
 argget.add_argument("--password", "-p", type=str, required=True, help="The password for authentication")
-argget.add_argument("--rhost", "-r", type=str, required=True, help="The address of the Redfish service (with scheme)")
+argget.add_argument(
+    "--rhost",
+    "-r",
+    type=str,
+    required=True,
+    nargs="+",
+    help="The address of the Redfish service (with scheme); multiple services can be given to update them in waves",
+)
 argget.add_argument("--image", "-i", type=str, required=True, help="The URI or filepath of the image")
 argget.add_argument("--target", "-t", type=str, help="The target resource to apply the image")
 argget.add_argument(
@@ -101,7 +106,75 @@ argget.add_argument(
     "--timeout",
     "-timeout",
     type=int,
-    help="The timeout, in seconds, to transfer the image; by default this is 2 seconds per MB",
+    help="The timeout, in seconds, to transfer the image; by default this is tuned from earlier pushes to the service, or 2 seconds per MB if there are none",
+)
+argget.add_argument(
+    "--imageversion",
+    "-iv",
+    type=str,
+    help="The version of the image; if given, the update is skipped for services where the components the image applies to are already at this version",
+)
+argget.add_argument(
+    "--softwareid",
+    "-sid",
+    type=str,
+    help="The SoftwareId of the components the image applies to; if omitted, the components are found from the target",
+)
+argget.add_argument(
+    "--stats", "-stats", action="store_true", help="Indicates if the throughput of pushing the image is to be reported"
+)
+argget.add_argument(
+    "--statsfile",
+    "-sf",
+    type=str,
+    help="The filepath to save the throughput of pushing images so the timeouts of later updates are tuned from it",
+)
+argget.add_argument(
+    "--imagecache",
+    "-ic",
+    type=str,
+    help="The folder to stage local images in for services that pull them; the folder can be shared with other runs of the tool and with rf_image_server.py",
+)
+argget.add_argument(
+    "--imagecachesize",
+    "-ics",
+    type=float,
+    default=10,
+    help="The disk budget, in GB, of the folder to stage local images in; defaults to 10",
+)
+argget.add_argument(
+    "--canary",
+    "-c",
+    type=int,
+    help="The number of services to update in the first wave when multiple services are given",
+)
+argget.add_argument(
+    "--wavesize", "-ws", type=int, help="The number of services to update in each wave when multiple services are given"
+)
+argget.add_argument(
+    "--wavedelay", "-wd", type=int, default=0, help="The time, in seconds, to wait between waves; defaults to 0"
+)
+argget.add_argument(
+    "--maxfailures",
+    "-mf",
+    type=int,
+    help="The number of services allowed to fail before the remaining waves are skipped; defaults to 0 when a canary "
+    "wave is given, otherwise all waves are performed",
+)
+argget.add_argument(
+    "--uploads", "-ul", type=int, help="The maximum number of services to push the image to at the same time"
+)
+argget.add_argument(
+    "--bandwidth", "-bw", type=float, help="The maximum combined rate, in MB per second, to push the image to services"
+)
+argget.add_argument(
+    "--workers",
+    "-w",
+    type=int,
+    default=redfish_utilities.fleet.DEFAULT_MAX_WORKERS,
+    help="The maximum number of services to update at the same time; defaults to {}".format(
+        redfish_utilities.fleet.DEFAULT_MAX_WORKERS
+    ),
 )
 argget.add_argument("--debug", action="store_true", help="Creates debug file showing HTTP traces and exceptions")
 args = argget.parse_args()
@@ -112,6 +185,66 @@ if args.debug:
     logger = redfish.redfish_logger(log_file, log_format, logging.DEBUG)
     logger.info("rf_update Trace")
 
+if args.statsfile is not None:
+    redfish_utilities.config.__upload_stats_file__ = args.statsfile
+
+targets = None
+if args.target is not None:
+    targets = [args.target]
+
+image_cache = None
+if args.imagecache is not None:
+    image_cache = redfish_utilities.ImageCache(args.imagecache, max_size=int(args.imagecachesize * 1024 * 1024 * 1024))
+
+if len(args.rhost) > 1:
+    # Update each service in waves
+    contexts, errors = redfish_utilities.login_hosts(args.rhost, args.user, args.password, timeout=15)
+    for host, error in errors.items():
+        print("{}: Login failed: {}".format(host, error))
+
+    def print_result(host, result):
+        if result["Error"] is not None:
+            print("{}: Failed: {}".format(host, result["Error"]))
+        elif result["Result"]["Skipped"]:
+            print("{}: Skipped; already at version {}".format(host, args.imageversion))
+        else:
+            timings = "{:.1f}s task".format(result["Result"]["TaskTime"])
+            if result["Result"]["UploadTime"] is not None:
+                timings = "{:.1f}s transfer, {}".format(result["Result"]["UploadTime"], timings)
+            print("{}: Update complete ({}; {})".format(host, result["Result"]["Method"], timings))
+            if args.stats and result["Result"]["UploadStats"] is not None:
+                print("{}: Pushed {}".format(host, format_upload_stats(result["Result"]["UploadStats"])))
+
+    image_server = redfish_utilities.ImageServer(port=WEB_SERVER_PORT, cache=image_cache)
+    try:
+        print("Updating {} services...".format(len(contexts)))
+        results = redfish_utilities.update_hosts(
+            contexts,
+            args.image,
+            targets=targets,
+            apply_time=args.applytime,
+            timeout=args.timeout,
+            canary_size=args.canary,
+            wave_size=args.wavesize,
+            wave_delay=args.wavedelay,
+            max_workers=args.workers,
+            max_failures=args.maxfailures,
+            max_uploads=args.uploads,
+            max_bandwidth=args.bandwidth * 1024 * 1024 if args.bandwidth else None,
+            image_server=image_server,
+            on_result=print_result,
+            version=args.imageversion,
+            software_id=args.softwareid,
+        )
+    finally:
+        # Stop hosting the image and log out
+        image_server.stop()
+        redfish_utilities.logout_hosts(contexts)
+    if errors or any(result["Error"] is not None for result in results.values()):
+        sys.exit(1)
+    sys.exit(0)
+args.rhost = args.rhost[0]
+
 # Set up the Redfish object
 redfish_obj = None
 try:
@@ -125,12 +258,16 @@ except RedfishPasswordChangeRequiredError:
 except Exception:
     raise
 
-start_path = os.getcwd()
-targets = None
-if args.target is not None:
-    targets = [args.target]
+image_server = None
 exit_code = 0
 try:
+    # Skip the update if the components are already at the version of the image
+    if args.imageversion is not None and not redfish_utilities.is_update_needed(
+        redfish_obj, args.imageversion, args.softwareid, targets
+    ):
+        print("Skipping the update; the components are already at version {}".format(args.imageversion))
+        sys.exit(0)
+
     # Determine what path to use to perform the update
     update_service = redfish_utilities.get_update_service(redfish_obj)
     if os.path.isfile(args.image):
@@ -141,32 +278,20 @@ try:
                 "Pushing the image to the service directly; depending on the size of the image, this can take a few minutes..."
             )
             response = redfish_utilities.multipart_push_update(
-                redfish_obj, args.image, targets=targets, timeout=args.timeout, apply_time=args.applytime
+                redfish_obj,
+                args.image,
+                targets=targets,
+                timeout=args.timeout,
+                apply_time=args.applytime,
+                progress_callback=print_upload_progress,
             )
+            if args.stats and response.upload_stats is not None:
+                print("Pushed {}".format(format_upload_stats(response.upload_stats)))
         else:
-            # Host a local web server and perform a SimpleUpdate for the local image
-            web_server_thread = threading.Thread(target=local_web_server, args=(args.image,))
-            web_server_thread.setDaemon(True)
-            web_server_thread.start()
-            # Wait for the server to start up
-            time.sleep(3)
-
-            # Build the proper image URI for the call based on how the web server will be hosting it
-            # TODO: Find a better way of getting your own IP address
-            # socket.gethostbyname( socket.gethostname() ) returns 127.0.0.1 on many systems
-            # This will open a socket with the target, and pulls the address of the socket
-            groups = re.search("^(https?)://([^:]+)(:(\\d+))?$", args.rhost)
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            remote_port = groups.group(4)
-            if remote_port is None:
-                remote_port = "80"
-                if groups.group(1) == "https":
-                    remote_port = "443"
-            s.connect((groups.group(2), int(remote_port)))
-            image_uri = "http://{}:{}/{}".format(
-                s.getsockname()[0], WEB_SERVER_PORT, args.image.rsplit(os.path.sep, 1)[-1]
-            )
-            s.close()
+            # Host the local image with a web server and perform a SimpleUpdate for the local image
+            image_server = redfish_utilities.ImageServer(port=WEB_SERVER_PORT, cache=image_cache)
+            image_server.start()
+            image_uri = image_server.get_image_uri(args.image, args.rhost)
             response = redfish_utilities.simple_update(
                 redfish_obj, image_uri, targets=targets, apply_time=args.applytime
             )
@@ -187,12 +312,9 @@ except Exception as e:
     exit_code = 1
     print(e)
 finally:
-    # Log out and cleanup
-    os.chdir(start_path)
-    try:
-        shutil.rmtree(WEB_SERVER_FOLDER)
-    except Exception:
-        pass
+    # Stop hosting the image
+    if image_server is not None:
+        image_server.stop()
     # Log out
     redfish_utilities.logout(redfish_obj)
 sys.exit(exit_code)